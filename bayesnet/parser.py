@@ -1,10 +1,25 @@
 import os
+from functools import lru_cache
 from lark import Lark
 from .transformer import NetworkTransformer
 
 GRAMMAR_FILE_PATH = os.path.dirname(os.path.abspath(__file__)) + "/bif-syntax.lark"
 
 
+@lru_cache(maxsize=None)
+def get_lark_parser(cpt_tolerance: float) -> Lark:
+    """
+    Builds the LALR parser for the grammar once per process and CPT tolerance.
+    """
+    with open(GRAMMAR_FILE_PATH) as grammar_file:
+        return Lark(
+            grammar_file,
+            transformer=NetworkTransformer(cpt_tolerance),
+            parser="lalr",
+            cache=True,
+        )
+
+
 class BifParser:
     """
     Parsers which takes a .bif source file and returns the program into internal representation."
@@ -21,11 +36,5 @@ class BifParser:
 
     def parse_file(self, filepath: str):
         with open(filepath) as file:
-            with open(GRAMMAR_FILE_PATH) as grammar_file:
-                parser = Lark(
-                    grammar_file,
-                    transformer=NetworkTransformer(self.cpt_tolerance),
-                    parser="lalr",
-                )
-                network = parser.parse(file.read())
+            network = get_lark_parser(self.cpt_tolerance).parse(file.read())
         return network
@@ -5,11 +5,11 @@ from symengine.lib.symengine_wrapper import sympify
 from sympy import Symbol
 from sympy.plotting import plot as symplot
 from cli.common import (
+    load_normalized_program,
     get_all_cumulants,
     get_all_cumulants_after_loop,
+    get_iterations,
 )
-from program import normalize_program
-from inputparser import parse_program
 
 
 class CornishFisherAction(Action):
@@ -21,8 +21,7 @@ class CornishFisherAction(Action):
     def __call__(self, *args, **kwargs):
         benchmark = args[0]
         monom = sympify(self.cli_args.cornish_fisher)
-        program = parse_program(benchmark)
-        program = normalize_program(program)
+        program = load_normalized_program(benchmark, self.cli_args)
         if self.cli_args.after_loop:
             cumulants = get_all_cumulants_after_loop(
                 program, monom, self.cli_args.cornish_fisher_order, self.cli_args
@@ -34,5 +33,5 @@ class CornishFisherAction(Action):
         expansion = CornishFisherExpansion(cumulants)
         quantile_function = expansion()
         print(quantile_function)
-        if self.cli_args.at_n >= 0 or self.cli_args.after_loop:
+        if get_iterations(self.cli_args.at_n) or self.cli_args.after_loop:
             symplot(quantile_function, (Symbol("p"), 0.01, 0.99))
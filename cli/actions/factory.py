@@ -10,11 +10,14 @@ from .synth_unsolv_inv_action import SynthUnsolvInvAction
 from .print_benchmark_action import PrintBenchmarkAction
 from .synth_solv_loop_action import SynthSolvLoopAction
 from .goals_action import GoalsAction
+from .serve_action import ServeAction
 
 
 class ActionFactory:
     @classmethod
     def create_action(cls, cli_args: Namespace) -> Action:
+        if cli_args.serve:
+            return ServeAction(cli_args)
         if (
             cli_args.sample_time_until
             or cli_args.exact_inference
@@ -11,28 +11,33 @@ from inputparser import (
     TAIL_BOUND_LOWER,
     TAIL_BOUND_UPPER,
 )
-from recurrences import RecBuilder
+from recurrences import RecBuilder, IterationEvaluator, NumericIterationEvaluator
 from recurrences.solver import RecurrenceSolver
-from sympy import N, Symbol
+from sympy import Dummy, N, Symbol, sympify as sympy_sympify
 from utils import (
     indent_string,
     raw_moments_to_cumulants,
     raw_moments_to_centrals,
     eval_re,
     unpack_piecewise,
+    is_solvable,
 )
 from termcolor import colored
 from cli.common import (
+    load_normalized_program,
     get_all_moments_given_termination,
     get_moment_given_termination,
     get_moment,
     get_all_moments,
+    get_monomials_given_termination,
+    get_iterations,
+    get_parameter_values,
+    flush_closed_form_cache,
+    solve_moments,
     print_is_exact,
     prettify_piecewise,
     transform_to_after_loop,
 )
-from program import normalize_program
-from inputparser import parse_program
 from invariants import InvariantIdeal
 
 
@@ -47,8 +52,7 @@ class GoalsAction(Action):
 
     def __call__(self, *args, **kwargs):
         benchmark = args[0]
-        program = parse_program(benchmark)
-        program = normalize_program(program)
+        program = load_normalized_program(benchmark, self.cli_args)
         rec_builder = RecBuilder(program)
         self.initialize_program(program, rec_builder)
         self.handle_all_goals()
@@ -68,14 +72,53 @@ class GoalsAction(Action):
 
         return goals
 
+    def plan_goals(self, goals):
+        """
+        Collects the monomials required by all goals and solves their recurrences as a single system,
+        such that the goals afterwards only read their moments from the solvers.
+        """
+        monoms = []
+        for goal_type, goal_data in goals:
+            monoms += self.get_goal_monomials(goal_type, goal_data)
+        if self.cli_args.after_loop:
+            monoms = [
+                m
+                for monom in monoms
+                for m in get_monomials_given_termination(monom, self.program)
+            ]
+        solve_moments(
+            monoms, self.solvers, self.rec_builder, self.cli_args, self.program
+        )
+
+    def get_goal_monomials(self, goal_type, goal_data):
+        """
+        Returns the monomials whose moments are needed for the given goal.
+        """
+        if goal_type == MOMENT:
+            return [goal_data[0]]
+        if goal_type in (CUMULANT, CENTRAL):
+            number, monom = goal_data[0], goal_data[1]
+        elif goal_type == TAIL_BOUND_UPPER:
+            number, monom = self.cli_args.tail_bound_moments, goal_data[0]
+        elif goal_type == TAIL_BOUND_LOWER:
+            number, monom = 2, goal_data[0]
+        else:
+            raise RuntimeError(f"Goal type {goal_type} does not exist.")
+        return [monom**i for i in reversed(range(1, number + 1))]
+
     def handle_all_goals(self):
         print(colored("-------------------", "cyan"))
         print(colored("- Analysis Result -", "cyan"))
         print(colored("-------------------", "cyan"))
         print()
 
+        goals = self.parse_goals()
+        if self.cli_args.at_n_only or self.cli_args.numeric_engine:
+            self.handle_all_goals_at_n(goals)
+            return
+        self.plan_goals(goals)
         closed_forms = {}
-        for goal_type, goal_data in self.parse_goals():
+        for goal_type, goal_data in goals:
             if goal_type == MOMENT:
                 moment, is_exact = self.handle_moment_goal(goal_data)
                 self.print_moment_goal(
@@ -106,6 +149,7 @@ class GoalsAction(Action):
                 self.handle_tail_bound_lower_goal(goal_data)
             else:
                 raise RuntimeError(f"Goal type {goal_type} does not exist.")
+        flush_closed_form_cache(self.cli_args)
 
         if self.cli_args.invariants:
             self.handle_invariants(closed_forms)
@@ -129,16 +173,27 @@ class GoalsAction(Action):
         id = f"E({monom})" if is_probabilistic else str(monom)
         print(f"{prefix}{id} = {prettify_piecewise(moment)}")
         print_is_exact(is_exact)
-        if self.cli_args.at_n >= 0:
-            moment_at_n = eval_re(self.cli_args.at_n, moment).expand()
-            id = (
-                f"E({monom} | n={self.cli_args.at_n})"
-                if is_probabilistic
-                else f"{monom} | n={self.cli_args.at_n}"
-            )
-            print(f"{prefix}{id} = {moment_at_n} ≅ {N(moment_at_n)}")
+        for n in get_iterations(self.cli_args.at_n):
+            moment_at_n = eval_re(n, moment).expand()
+            self.print_moment_at_n(monom, n, moment_at_n, prefix, is_probabilistic)
         print()
 
+    def print_moment_at_n(
+        self, monom, n, moment_at_n, prefix="", is_probabilistic=True, error=None
+    ):
+        id = f"E({monom} | n={n})" if is_probabilistic else f"{monom} | n={n}"
+        print(f"{prefix}{id} {self.format_at_n('=', moment_at_n, error)}")
+
+    @staticmethod
+    def format_at_n(relation, value_at_n, error=None):
+        """
+        Formats the value of a goal at some iteration. Exact values are followed by their numeric approximation
+        and values computed by a numeric engine by the bound on their error.
+        """
+        if error is None:
+            return f"{relation} {value_at_n} ≅ {N(value_at_n)}"
+        return f"{relation} {value_at_n} ± {error:.2e}"
+
     def handle_cumulant_goal(self, goal_data):
         number = goal_data[0]
         monom = goal_data[1]
@@ -169,13 +224,17 @@ class GoalsAction(Action):
     def print_cumulant_goal(self, number, monom, cumulant, is_exact, prefix=""):
         print(f"{prefix}k{number}({monom}) = {prettify_piecewise(cumulant)}")
         print_is_exact(is_exact)
-        if self.cli_args.at_n >= 0:
-            cumulant_at_n = eval_re(self.cli_args.at_n, cumulant).expand()
-            print(
-                f"{prefix}k{number}({monom} | n={self.cli_args.at_n}) = {cumulant_at_n} ≅ {N(cumulant_at_n)}"
-            )
+        for n in get_iterations(self.cli_args.at_n):
+            cumulant_at_n = eval_re(n, cumulant).expand()
+            self.print_cumulant_at_n(number, monom, n, cumulant_at_n, prefix)
         print()
 
+    def print_cumulant_at_n(
+        self, number, monom, n, cumulant_at_n, prefix="", error=None
+    ):
+        value = self.format_at_n("=", cumulant_at_n, error)
+        print(f"{prefix}k{number}({monom} | n={n}) {value}")
+
     def handle_central_moment_goal(self, goal_data):
         number = goal_data[0]
         monom = goal_data[1]
@@ -208,14 +267,21 @@ class GoalsAction(Action):
     ):
         print(f"{prefix}c{number}({monom}) = {prettify_piecewise(central_moment)}")
         print_is_exact(is_exact)
-        if self.cli_args.at_n >= 0:
-            central_at_n = eval_re(self.cli_args.at_n, central_moment).expand()
-            print(
-                f"{prefix}c{number}({monom} | n={self.cli_args.at_n}) = {central_at_n} ≅ {N(central_at_n)}"
-            )
+        for n in get_iterations(self.cli_args.at_n):
+            central_at_n = eval_re(n, central_moment).expand()
+            self.print_central_moment_at_n(number, monom, n, central_at_n, prefix)
         print()
 
-    def handle_tail_bound_upper_goal(self, goal_data):
+    def print_central_moment_at_n(
+        self, number, monom, n, central_at_n, prefix="", error=None
+    ):
+        value = self.format_at_n("=", central_at_n, error)
+        print(f"{prefix}c{number}({monom} | n={n}) {value}")
+
+    def compute_tail_bound_upper(self, goal_data):
+        """
+        Computes upper bounds for P(monom >= a) using Markov's inequality for multiple moments.
+        """
         monom, a = goal_data[0], goal_data[1]
         if self.cli_args.after_loop:
             moments, is_exact = get_all_moments_given_termination(
@@ -235,10 +301,14 @@ class GoalsAction(Action):
                 self.cli_args,
                 self.program,
             )
-        bounds = [m / (a**k) for k, m in moments.items()]
-        bounds.reverse()
+        bounds = self.get_upper_bounds(moments, a)
         if self.cli_args.after_loop:
             bounds = transform_to_after_loop(bounds)
+        return bounds, is_exact
+
+    def handle_tail_bound_upper_goal(self, goal_data):
+        monom, a = goal_data[0], goal_data[1]
+        bounds, is_exact = self.compute_tail_bound_upper(goal_data)
         print(f"Assuming {monom} is non-negative.")
         print(f"P({monom} >= {a}) <= minimum of")
         count = 1
@@ -247,23 +317,31 @@ class GoalsAction(Action):
             count += 1
         print_is_exact(is_exact)
 
-        if self.cli_args.at_n >= 0:
-            bounds_at_n = [eval_re(self.cli_args.at_n, b).expand() for b in bounds]
-            can_take_min = all([not b.free_symbols for b in bounds_at_n])
-            if can_take_min:
-                bound_at_n = min(bounds_at_n)
-                print(
-                    f"P({monom} >= {a} | n={self.cli_args.at_n}) <= {bound_at_n} ≅ {N(bound_at_n)}"
-                )
-            else:
-                print(f"P({monom} >= {a} | n={self.cli_args.at_n}) <= minimum of")
-                count = 1
-                for bound_at_n in bounds_at_n:
-                    print(indent_string(f"({count}) {bound_at_n} ≅ {N(bound_at_n)}", 4))
-                    count += 1
+        for n in get_iterations(self.cli_args.at_n):
+            bounds_at_n = [eval_re(n, b).expand() for b in bounds]
+            self.print_tail_bound_upper_at_n(monom, a, n, bounds_at_n)
         print()
 
-    def handle_tail_bound_lower_goal(self, goal_data):
+    def print_tail_bound_upper_at_n(self, monom, a, n, bounds_at_n, errors=None):
+        if errors is None:
+            errors = [None] * len(bounds_at_n)
+        can_take_min = all([not b.free_symbols for b in bounds_at_n])
+        if can_take_min:
+            i = min(range(len(bounds_at_n)), key=lambda j: bounds_at_n[j])
+            value = self.format_at_n("<=", bounds_at_n[i], errors[i])
+            print(f"P({monom} >= {a} | n={n}) {value}")
+        else:
+            print(f"P({monom} >= {a} | n={n}) <= minimum of")
+            count = 1
+            for bound_at_n, error in zip(bounds_at_n, errors):
+                value = self.format_at_n("", bound_at_n, error).strip()
+                print(indent_string(f"({count}) {value}", 4))
+                count += 1
+
+    def compute_tail_bound_lower(self, goal_data):
+        """
+        Computes a lower bound for P(monom > a) using the second moment method.
+        """
         monom, a = goal_data[0], goal_data[1]
         if self.cli_args.after_loop:
             moments, is_exact = get_all_moments_given_termination(
@@ -273,20 +351,181 @@ class GoalsAction(Action):
             moments, is_exact = get_all_moments(
                 monom, 2, self.solvers, self.rec_builder, self.cli_args, self.program
             )
-        bound = ((moments[1] - a) ** 2) / (moments[2] - 2 * a * moments[1] + a**2)
-        bound = bound.simplify()
+        bound = self.get_lower_bound(moments, a)
         if self.cli_args.after_loop:
             bound = transform_to_after_loop(bound)
+        return bound, is_exact
+
+    def handle_tail_bound_lower_goal(self, goal_data):
+        monom, a = goal_data[0], goal_data[1]
+        bound, is_exact = self.compute_tail_bound_lower(goal_data)
         print(f"Assuming {monom - a} is non-negative.")
         print(f"P({monom} > {a}) >= {prettify_piecewise(bound)}")
         print_is_exact(is_exact)
-        if self.cli_args.at_n >= 0:
-            bound_at_n = eval_re(self.cli_args.at_n, bound)
-            print(
-                f"P({monom} > {a} | n={self.cli_args.at_n}) >= {bound_at_n} ≅ {N(bound_at_n)}"
-            )
+        for n in get_iterations(self.cli_args.at_n):
+            bound_at_n = eval_re(n, bound)
+            self.print_tail_bound_lower_at_n(monom, a, n, bound_at_n)
         print()
 
+    def print_tail_bound_lower_at_n(self, monom, a, n, bound_at_n, error=None):
+        value = self.format_at_n(">=", bound_at_n, error)
+        print(f"P({monom} > {a} | n={n}) {value}")
+
+    @staticmethod
+    def get_upper_bounds(moments, a):
+        """
+        Returns the bounds of Markov's inequality for the given moments in ascending order of the moments.
+        """
+        bounds = [m / (a**k) for k, m in moments.items()]
+        bounds.reverse()
+        return bounds
+
+    @staticmethod
+    def get_lower_bound(moments, a):
+        """
+        Returns the bound of the second moment method given the first two moments.
+        """
+        bound = ((moments[1] - a) ** 2) / (moments[2] - 2 * a * moments[1] + a**2)
+        return bound.simplify()
+
+    def handle_all_goals_at_n(self, goals):
+        """
+        Prints the values of the goals at the iterations goal by goal, in the same order as for closed forms.
+        """
+        results = list(self.evaluate_goals_at_n(goals))
+        for i, (goal_type, goal_data) in enumerate(goals):
+            for n, values, errors in results:
+                value = values[i]
+                error = None if errors is None else errors[i]
+                if goal_type == MOMENT:
+                    self.print_moment_at_n(
+                        goal_data[0],
+                        n,
+                        value,
+                        is_probabilistic=self.program.is_probabilistic,
+                        error=error,
+                    )
+                elif goal_type == CUMULANT:
+                    self.print_cumulant_at_n(
+                        goal_data[0], goal_data[1], n, value, error=error
+                    )
+                elif goal_type == CENTRAL:
+                    self.print_central_moment_at_n(
+                        goal_data[0], goal_data[1], n, value, error=error
+                    )
+                elif goal_type == TAIL_BOUND_UPPER:
+                    self.print_tail_bound_upper_at_n(
+                        goal_data[0], goal_data[1], n, value, error
+                    )
+                elif goal_type == TAIL_BOUND_LOWER:
+                    self.print_tail_bound_lower_at_n(
+                        goal_data[0], goal_data[1], n, value, error
+                    )
+            print()
+
+    def evaluate_goals_at_n(self, goals):
+        """
+        Evaluates the goals at the iterations given by --at_n without computing closed forms.
+        The moments of all monomials required by the goals are computed by powering the recurrence matrix
+        of their joint system, exactly or with the engine given by --numeric_engine. Yields the iteration
+        together with the values of all goals and, for numeric engines, bounds on their errors (otherwise None).
+        """
+        iterations = get_iterations(self.cli_args.at_n)
+        if not iterations:
+            raise Exception("Evaluating goals at iterations requires --at_n.")
+        if self.cli_args.after_loop or self.cli_args.invariants:
+            raise Exception(
+                "Goals after the loop and invariants require closed forms and cannot be evaluated at iterations."
+            )
+        monoms = []
+        for goal_type, goal_data in goals:
+            monoms += self.get_goal_monomials(goal_type, goal_data)
+        for monom in monoms:
+            if self.cli_args.solvability_check and not is_solvable(monom, self.program):
+                raise Exception(f"{monom} is not effective/solvable.")
+
+        recurrences = self.rec_builder.get_recurrences_batch(monoms)
+        parameter_values = get_parameter_values(self.cli_args)
+        if not self.cli_args.numeric_engine:
+            evaluator = IterationEvaluator(recurrences, parameter_values)
+            for n, moments in evaluator.evaluate(iterations):
+                values = [
+                    self.evaluate_goal(goal_type, goal_data, moments)
+                    for goal_type, goal_data in goals
+                ]
+                yield n, values, None
+            return
+
+        evaluator = NumericIterationEvaluator(
+            recurrences, self.cli_args.numeric_engine, parameter_values
+        )
+        # The goals are built once over placeholders for the moments, such that their errors can be
+        # propagated from the errors of the moments using the derivatives.
+        symbols = {m: Dummy() for m in recurrences.monomials}
+        goal_forms = [
+            self.evaluate_goal(goal_type, goal_data, symbols)
+            for goal_type, goal_data in goals
+        ]
+        for n, moments, moment_errors in evaluator.evaluate_with_errors(iterations):
+            values, errors = [], []
+            for goal_form in goal_forms:
+                if isinstance(goal_form, list):
+                    propagated = [
+                        self.propagate_errors(f, symbols, moments, moment_errors)
+                        for f in goal_form
+                    ]
+                    values.append([value for value, _ in propagated])
+                    errors.append([error for _, error in propagated])
+                else:
+                    value, error = self.propagate_errors(
+                        goal_form, symbols, moments, moment_errors
+                    )
+                    values.append(value)
+                    errors.append(error)
+            yield n, values, errors
+
+    @staticmethod
+    def propagate_errors(goal_form, symbols, moments, moment_errors):
+        """
+        Returns the value of a goal given as expression over placeholders for the moments, together with
+        the first-order bound sum_i |d goal / d m_i| * error(m_i) on its error.
+        """
+        replacements = {s: moments[m] for m, s in symbols.items()}
+        value = goal_form.xreplace(replacements)
+        error = 0.0
+        for m, s in symbols.items():
+            if s in goal_form.free_symbols:
+                derivative = goal_form.diff(s).xreplace(replacements)
+                error += abs(float(derivative)) * moment_errors[m]
+        return value, error
+
+    def evaluate_goal(self, goal_type, goal_data, moments):
+        """
+        Computes the value of a goal from the moments of the monomials at some iteration.
+        """
+        if goal_type == MOMENT:
+            return moments[sympy_sympify(goal_data[0])].expand()
+        if goal_type in (CUMULANT, CENTRAL):
+            number, monom = goal_data[0], goal_data[1]
+        elif goal_type == TAIL_BOUND_UPPER:
+            number, monom = self.cli_args.tail_bound_moments, goal_data[0]
+        elif goal_type == TAIL_BOUND_LOWER:
+            number, monom = 2, goal_data[0]
+        else:
+            raise RuntimeError(f"Goal type {goal_type} does not exist.")
+
+        monom_moments = {
+            i: moments[sympy_sympify(monom**i)] for i in reversed(range(1, number + 1))
+        }
+        if goal_type == CUMULANT:
+            return raw_moments_to_cumulants(monom_moments)[number].expand()
+        if goal_type == CENTRAL:
+            return raw_moments_to_centrals(monom_moments)[number].expand()
+        a = sympy_sympify(goal_data[1])
+        if goal_type == TAIL_BOUND_UPPER:
+            return [b.expand() for b in self.get_upper_bounds(monom_moments, a)]
+        return self.get_lower_bound(monom_moments, a)
+
     def handle_invariants(self, closed_forms):
         print()
         print(colored("-------------------", "cyan"))
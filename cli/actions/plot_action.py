@@ -3,11 +3,9 @@ from .action import Action
 from inputparser import Parser
 from recurrences import RecBuilder
 from symengine.lib.symengine_wrapper import sympify
-from simulation import Simulator
+from simulation import VectorizedSimulator
 from plots import StatesPlot, RunsPlot
-from cli.common import get_moment
-from program import normalize_program
-from inputparser import parse_program
+from cli.common import get_moment, load_normalized_program
 import settings
 
 
@@ -22,8 +20,7 @@ class PlotAction(Action):
         monom = sympify(self.cli_args.plot)
         first_moment = second_moment = None
         if self.cli_args.plot_expectation or self.cli_args.plot_std:
-            program = parse_program(benchmark)
-            program = normalize_program(program)
+            program = load_normalized_program(benchmark, self.cli_args)
             rec_builder = RecBuilder(program)
             solvers = {}
             settings.numeric_croots = True
@@ -37,7 +34,11 @@ class PlotAction(Action):
             )
 
         program = Parser().parse_file(benchmark)
-        simulator = Simulator(self.cli_args.simulation_iter)
+        simulator = VectorizedSimulator(
+            self.cli_args.simulation_iter,
+            self.cli_args.simulation_workers,
+            self.cli_args.simulation_seed,
+        )
         result = simulator.simulate(program, [monom], self.cli_args.number_samples)
         if self.cli_args.states_plot:
             p = StatesPlot(
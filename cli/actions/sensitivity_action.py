@@ -2,11 +2,10 @@ from argparse import Namespace
 from typing import Tuple
 
 from cli.actions.goals_action import GoalsAction
-from program import normalize_program
-from inputparser import parse_program
 from inputparser.exceptions import ParseException
 from inputparser.goal_parser import CENTRAL, CUMULANT, MOMENT
 from recurrences import RecBuilder, DiffRecBuilder
+from cli.common import load_normalized_program
 from .action import Action
 from termcolor import colored
 from symengine.lib.symengine_wrapper import sympify
@@ -21,8 +20,7 @@ class SensitivityAction(Action):
 
     def __call__(self, *args, **kwargs):
         benchmark = args[0]
-        program = parse_program(benchmark)
-        self.program = normalize_program(program)
+        self.program = load_normalized_program(benchmark, self.cli_args)
 
         if self.cli_args.sensitivity_analysis:
             self._analyze_sensitivity()
@@ -60,7 +58,9 @@ class SensitivityAction(Action):
 
         goals_action = GoalsAction(self.cli_args)
         goals_action.initialize_program(self.program, RecBuilder(self.program))
-        for goal_type, goal_data in goals_action.parse_goals():
+        goals = goals_action.parse_goals()
+        goals_action.plan_goals(goals)
+        for goal_type, goal_data in goals:
             if goal_type == MOMENT:
                 result, is_exact = goals_action.handle_moment_goal(goal_data)
                 goals_action.print_moment_goal(
@@ -0,0 +1,212 @@
+import io
+import json
+import os
+import socketserver
+import sys
+import time
+from argparse import Namespace
+from copy import copy
+from typing import Dict, Tuple
+from inputparser import (
+    GoalParser,
+    MOMENT,
+    CUMULANT,
+    CENTRAL,
+    TAIL_BOUND_LOWER,
+    TAIL_BOUND_UPPER,
+)
+from recurrences import RecBuilder
+from utils import eval_re
+from cli.argument_parser import parse_iterations
+from cli.common import (
+    load_normalized_program,
+    get_iterations,
+    flush_closed_form_cache,
+)
+from .action import Action
+from .goals_action import GoalsAction
+
+
+class ServeAction(Action):
+    """
+    Long-running batch mode answering goal queries given as JSON lines, either over stdin/stdout or over a
+    local Unix socket. Parsed programs, recurrence builders and solvers are kept warm per benchmark.
+
+    A request looks like {"id": 1, "benchmark": "loop.prob", "goals": ["E(x)", "c2(x)"], "at_n": 10}
+    where "id", "at_n", "at_n_only", "after_loop", "tail_bound_moments", "numeric_engine" and "param_values" are
+    optional. The iterations "at_n" can also be a range "a:b:c". Every request is answered by a single line {"id": 1, "results": [...], "time": seconds}
+    or {"id": 1, "error": message, "time": seconds}.
+    """
+
+    cli_args: Namespace
+    benchmarks: Dict[str, Tuple[float, GoalsAction]]
+
+    def __init__(self, cli_args: Namespace):
+        self.cli_args = cli_args
+        self.benchmarks = {}
+
+    def __call__(self, *args, **kwargs):
+        for benchmark in args:
+            self.get_goals_action(benchmark)
+        if self.cli_args.serve_socket:
+            self.serve_socket(self.cli_args.serve_socket)
+        else:
+            self.serve_stream(sys.stdin)
+
+    def serve_stream(self, requests, responses=None):
+        for line in requests:
+            if not line.strip():
+                continue
+            response = self.handle_request(line)
+            if responses is None:
+                print(json.dumps(response), flush=True)
+            else:
+                responses.write(json.dumps(response) + "\n")
+                responses.flush()
+
+    def serve_socket(self, path: str):
+        action = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                requests = io.TextIOWrapper(self.rfile)
+                responses = io.TextIOWrapper(self.wfile, write_through=True)
+                action.serve_stream(requests, responses)
+
+        if os.path.exists(path):
+            os.remove(path)
+        with socketserver.UnixStreamServer(path, Handler) as server:
+            server.serve_forever()
+
+    def get_goals_action(self, benchmark: str) -> GoalsAction:
+        """
+        Returns the goals action for the benchmark holding the program and solvers.
+        The benchmark is only parsed again if its file changed.
+        """
+        modified = os.path.getmtime(benchmark)
+        if benchmark in self.benchmarks:
+            last_modified, goals_action = self.benchmarks[benchmark]
+            if last_modified == modified:
+                return goals_action
+
+        program = load_normalized_program(benchmark, self.cli_args)
+        goals_action = GoalsAction(self.cli_args)
+        goals_action.initialize_program(program, RecBuilder(program))
+        self.benchmarks[benchmark] = (modified, goals_action)
+        return goals_action
+
+    def handle_request(self, line: str):
+        start = time.time()
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            results = self.handle_goals(request)
+            response = {"id": request_id, "results": results}
+        except Exception as e:
+            response = {"id": request_id, "error": str(e)}
+        flush_closed_form_cache(self.cli_args)
+        response["time"] = time.time() - start
+        return response
+
+    def handle_goals(self, request):
+        cli_args = copy(self.cli_args)
+        options = [
+            "at_n",
+            "at_n_only",
+            "after_loop",
+            "tail_bound_moments",
+            "numeric_engine",
+            "param_values",
+        ]
+        for option in options:
+            if option in request:
+                setattr(cli_args, option, request[option])
+        if isinstance(cli_args.at_n, str):
+            cli_args.at_n = parse_iterations(cli_args.at_n)
+
+        goals_action = self.get_goals_action(request["benchmark"])
+        goals_action.cli_args = cli_args
+        goals = [GoalParser.parse(goal) for goal in request["goals"]]
+        if cli_args.at_n_only or cli_args.numeric_engine:
+            return self.handle_goals_at_n(goals_action, request["goals"], goals)
+        goals_action.plan_goals(goals)
+        results = []
+        for goal, (goal_type, goal_data) in zip(request["goals"], goals):
+            start = time.time()
+            result = self.handle_goal(goals_action, goal, goal_type, goal_data)
+            result["time"] = time.time() - start
+            results.append(result)
+        return results
+
+    def handle_goal(self, goals_action: GoalsAction, goal: str, goal_type, goal_data):
+        if goal_type == MOMENT:
+            value, is_exact = goals_action.handle_moment_goal(goal_data)
+        elif goal_type == CUMULANT:
+            value, is_exact = goals_action.handle_cumulant_goal(goal_data)
+        elif goal_type == CENTRAL:
+            value, is_exact = goals_action.handle_central_moment_goal(goal_data)
+        elif goal_type == TAIL_BOUND_UPPER:
+            value, is_exact = goals_action.compute_tail_bound_upper(goal_data)
+        elif goal_type == TAIL_BOUND_LOWER:
+            value, is_exact = goals_action.compute_tail_bound_lower(goal_data)
+        else:
+            raise RuntimeError(f"Goal type {goal_type} does not exist.")
+
+        result = {"goal": goal, "type": goal_type, "is_exact": is_exact}
+        at_n = goals_action.cli_args.at_n
+        if isinstance(value, list):
+            result["value"] = [str(v) for v in value]
+            values_at_n = {
+                n: [eval_re(n, v).expand() for v in value] for n in get_iterations(at_n)
+            }
+        else:
+            result["value"] = str(value)
+            values_at_n = {n: eval_re(n, value).expand() for n in get_iterations(at_n)}
+        if values_at_n:
+            result["at_n"] = self.format_at_n(at_n, values_at_n)
+        return result
+
+    def handle_goals_at_n(self, goals_action: GoalsAction, goal_strings, goals):
+        """
+        Answers the goals only at the given iterations without computing closed forms.
+        For numeric engines, the results contain the bounds on the errors of the values in "errors".
+        """
+        values_at_n = [{} for _ in goals]
+        errors_at_n = [{} for _ in goals]
+        is_exact = True
+        for n, values, errors in goals_action.evaluate_goals_at_n(goals):
+            is_exact = errors is None
+            if errors is None:
+                errors = [None] * len(goals)
+            for i, (value, error) in enumerate(zip(values, errors)):
+                values_at_n[i][n] = value
+                errors_at_n[i][n] = error
+        at_n = goals_action.cli_args.at_n
+        results = []
+        for i, (goal, (goal_type, _)) in enumerate(zip(goal_strings, goals)):
+            result = {
+                "goal": goal,
+                "type": goal_type,
+                "is_exact": is_exact,
+                "at_n": self.format_at_n(at_n, values_at_n[i]),
+            }
+            if not is_exact:
+                result["errors"] = self.format_at_n(at_n, errors_at_n[i])
+            results.append(result)
+        return results
+
+    @staticmethod
+    def format_at_n(at_n, values_at_n):
+        """
+        Formats the values of a goal at the iterations, which are keyed by the iteration for ranges.
+        """
+
+        def format_value(value):
+            if isinstance(value, list):
+                return [str(v) for v in value]
+            return str(value)
+
+        if isinstance(at_n, range):
+            return {str(n): format_value(v) for n, v in values_at_n.items()}
+        return format_value(values_at_n[at_n])
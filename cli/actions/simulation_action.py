@@ -2,10 +2,15 @@ from argparse import Namespace
 from .action import Action
 from inputparser import Parser, GoalParser, MOMENT, TAIL_BOUND_LOWER, TAIL_BOUND_UPPER
 from symengine.lib.symengine_wrapper import Piecewise
-from simulation import Simulator
+from simulation import VectorizedSimulator
+from cli.common import get_iterations
 from termcolor import colored
 
 
+# The quantiles of the goals printed in streaming mode
+QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+
 class SimulationAction(Action):
     cli_args: Namespace
 
@@ -32,14 +37,31 @@ class SimulationAction(Action):
             if goal_type == TAIL_BOUND_LOWER:
                 goals.append(Piecewise((1, goal_data[0] > goal_data[1]), (0, True)))
 
-        simulator = Simulator(self.cli_args.simulation_iter)
-        result = simulator.simulate(program, goals, self.cli_args.number_samples)
+        simulator = VectorizedSimulator(
+            self.cli_args.simulation_iter,
+            self.cli_args.simulation_workers,
+            self.cli_args.simulation_seed,
+        )
+        if self.cli_args.simulation_streaming:
+            result = simulator.simulate_streaming(
+                program,
+                goals,
+                self.cli_args.number_samples,
+                self.cli_args.simulation_order,
+                get_iterations(self.cli_args.simulation_at_n) or [-1],
+            )
+        else:
+            result = simulator.simulate(program, goals, self.cli_args.number_samples)
 
         print(colored("---------------------", "cyan"))
         print(colored("- Simulation Result -", "cyan"))
         print(colored("---------------------", "cyan"))
         print()
 
+        if self.cli_args.simulation_streaming:
+            self.print_streaming_result(program, result)
+            return
+
         for goal, mean in result.get_average_goals().items():
             if isinstance(goal, Piecewise):
                 print(f"P({goal.args[1]}) = {mean}")
@@ -47,3 +69,31 @@ class SimulationAction(Action):
                 id = f"E({goal})" if program.is_probabilistic else str(goal)
                 print(f"{id} = {mean}")
         print()
+
+    def print_streaming_result(self, program, result):
+        """
+        Prints for every goal and tracked iteration the mean and, for goals which are not probabilities,
+        the central moments up to the tracked order and some quantiles.
+        """
+        for goal in result.goals:
+            for n in result.tracked:
+                mean = result.get_average_goals(n)[goal]
+                if isinstance(goal, Piecewise):
+                    print(f"P({goal.args[1]} | n={n}) = {mean}")
+                    continue
+                id = (
+                    f"E({goal} | n={n})"
+                    if program.is_probabilistic
+                    else f"{goal} | n={n}"
+                )
+                print(f"{id} = {mean}")
+                for k in range(2, self.cli_args.simulation_order + 1):
+                    print(
+                        f"c{k}({goal} | n={n}) = {result.get_central_moment(goal, k, n)}"
+                    )
+                quantiles = [
+                    f"{int(q * 100)}%: {result.get_quantile(goal, q, n)}"
+                    for q in QUANTILES
+                ]
+                print(f"Quantiles({goal} | n={n}): {', '.join(quantiles)}")
+            print()
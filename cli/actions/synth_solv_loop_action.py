@@ -1,8 +1,7 @@
 from argparse import Namespace
 from symengine.lib.symengine_wrapper import sympify
+from cli.common import load_normalized_program
 from .action import Action
-from program import normalize_program
-from inputparser import parse_program
 from termcolor import colored
 from unsolvable_analysis import SolvLoopSynthesizer
 
@@ -16,8 +15,7 @@ class SynthSolvLoopAction(Action):
     def __call__(self, *args, **kwargs):
         benchmark = args[0]
         inv_deg = self.cli_args.inv_deg
-        program = parse_program(benchmark)
-        program = normalize_program(program)
+        program = load_normalized_program(benchmark, self.cli_args)
 
         candidate_vars = []
         if len(self.cli_args.synth_solv_loop) == 0:
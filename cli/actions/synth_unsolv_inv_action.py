@@ -1,11 +1,10 @@
 from argparse import Namespace
+from cli.common import load_normalized_program
 from .action import Action
 from symengine.lib.symengine_wrapper import sympify
 import sympy
 from termcolor import colored
 from unsolvable_analysis import UnsolvInvSynthesizer
-from program import normalize_program
-from inputparser import parse_program
 
 
 class SynthUnsolvInvAction(Action):
@@ -17,8 +16,7 @@ class SynthUnsolvInvAction(Action):
     def __call__(self, *args, **kwargs):
         benchmark = args[0]
         inv_deg = self.cli_args.inv_deg
-        program = parse_program(benchmark)
-        program = normalize_program(program)
+        program = load_normalized_program(benchmark, self.cli_args)
 
         if len(program.defective_variables) == 0:
             print(
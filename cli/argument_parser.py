@@ -2,6 +2,7 @@ from argparse import ArgumentParser as ArgParser
 import glob
 
 import settings
+from recurrences.numeric_evaluator import parse_numeric_engine
 
 
 def _set_settings(args):
@@ -14,6 +15,28 @@ def _set_settings(args):
     settings.numeric_eps = args.numeric_eps
     settings.trivial_guard = args.trivial_guard
     settings.exact_func_moments = args.exact_func_moments
+    settings.solver_workers = args.solver_workers
+    settings.charpoly_backend = args.charpoly_backend
+
+
+def parse_iterations(value: str):
+    """
+    Parses a single iteration "n" or a range of iterations "a:b:c" from a to b (inclusive) with step size c.
+    """
+    if ":" not in value:
+        return int(value)
+    bounds = [int(v) for v in value.split(":")]
+    if len(bounds) == 2:
+        bounds.append(1)
+    start, stop, step = bounds
+    if start < 0 or step <= 0:
+        raise ValueError(f"Invalid range of iterations {value}")
+    return range(start, stop + 1, step)
+
+
+def _numeric_engine(value: str) -> str:
+    parse_numeric_engine(value)
+    return value
 
 
 class ArgumentParser:
@@ -25,15 +48,75 @@ class ArgumentParser:
             "benchmarks",
             metavar="benchmarks",
             type=str,
-            nargs="+",
+            nargs="*",
             help="A list of benchmarks to run Polar on",
         )
         self.argument_parser.add_argument(
             "--at_n",
             dest="at_n",
             default=-1,
+            type=parse_iterations,
+            help="Iteration number to evaluate the expressions at or a range of iteration numbers a:b:c from a to b with step size c",
+        )
+        self.argument_parser.add_argument(
+            "--at_n_only",
+            action="store_true",
+            default=False,
+            help="If set the goals are only evaluated at the iterations given by --at_n by powering the recurrence matrix, without computing closed forms",
+        )
+        self.argument_parser.add_argument(
+            "--numeric_engine",
+            dest="numeric_engine",
+            default=None,
+            type=_numeric_engine,
+            help="Evaluates the goals at the iterations given by --at_n numerically with 'float64' or 'mpmath:<digits>' together with error bounds, instead of exactly",
+        )
+        self.argument_parser.add_argument(
+            "--param_values",
+            dest="param_values",
+            type=str,
+            default=[],
+            nargs="+",
+            help="Values of symbolic parameters as name=value, used when evaluating the goals at iterations",
+        )
+        self.argument_parser.add_argument(
+            "--serve",
+            action="store_true",
+            default=False,
+            help="If set Polar answers goal queries given as JSON lines on stdin. The benchmarks are preloaded.",
+        )
+        self.argument_parser.add_argument(
+            "--serve_socket",
+            dest="serve_socket",
+            default=None,
+            type=str,
+            help="Path of a Unix socket on which Polar answers goal queries in serve mode instead of stdin.",
+        )
+        self.argument_parser.add_argument(
+            "--cache_dir",
+            dest="cache_dir",
+            default="~/.cache/polar",
+            type=str,
+            help="Directory of the persistent cache for normalized programs and closed forms of moments.",
+        )
+        self.argument_parser.add_argument(
+            "--cache_size",
+            dest="cache_size",
+            default=100,
             type=int,
-            help="Iteration number to evaluate the expressions at",
+            help="Maximum size of the closed form and program caches in MB each. Least recently used entries are evicted.",
+        )
+        self.argument_parser.add_argument(
+            "--no_cache",
+            action="store_true",
+            default=False,
+            help="If set Polar neither reads nor writes the caches for normalized programs and closed forms.",
+        )
+        self.argument_parser.add_argument(
+            "--profile_passes",
+            action="store_true",
+            default=False,
+            help="If set Polar prints the time and memory allocated by every normalization pass to stderr.",
         )
         self.argument_parser.add_argument(
             "--simulate",
@@ -61,6 +144,41 @@ class ArgumentParser:
             type=int,
             help="The number of samples to simulate.",
         )
+        self.argument_parser.add_argument(
+            "--simulation_workers",
+            dest="simulation_workers",
+            default=1,
+            type=int,
+            help="The number of processes used to simulate the samples.",
+        )
+        self.argument_parser.add_argument(
+            "--simulation_streaming",
+            dest="simulation_streaming",
+            action="store_true",
+            default=False,
+            help="If true the simulation only keeps online statistics instead of all sampled trajectories.",
+        )
+        self.argument_parser.add_argument(
+            "--simulation_order",
+            dest="simulation_order",
+            default=2,
+            type=int,
+            help="With --simulation_streaming, the order up to which the central moments of the goals are tracked and printed.",
+        )
+        self.argument_parser.add_argument(
+            "--simulation_at_n",
+            dest="simulation_at_n",
+            default=-1,
+            type=parse_iterations,
+            help="With --simulation_streaming, the iteration or range of iterations a:b:c at which the goals are tracked and printed. Defaults to the last iteration.",
+        )
+        self.argument_parser.add_argument(
+            "--simulation_seed",
+            dest="simulation_seed",
+            default=None,
+            type=int,
+            help="Seed for the simulation. For a fixed seed the samples do not depend on the number of workers.",
+        )
         self.argument_parser.add_argument(
             "--goals",
             dest="goals",
@@ -187,6 +305,20 @@ class ArgumentParser:
             type=int,
             help="Number of iterations in the fixedpoint computation of the type inference",
         )
+        self.argument_parser.add_argument(
+            "--solver_workers",
+            dest="solver_workers",
+            default=settings.solver_workers,
+            type=int,
+            help="Number of processes used to compute the roots of independent blocks of recurrences",
+        )
+        self.argument_parser.add_argument(
+            "--charpoly_backend",
+            dest="charpoly_backend",
+            default=settings.charpoly_backend,
+            choices=["domain", "sympy"],
+            help="Backend for computing characteristic polynomials of recurrence matrices",
+        )
         self.argument_parser.add_argument(
             "--numeric_roots",
             action="store_true",
@@ -298,7 +430,7 @@ class ArgumentParser:
         args = self.argument_parser.parse_args()
         args.benchmarks = [b for bs in map(glob.glob, args.benchmarks) for b in bs]
 
-        if len(args.benchmarks) == 0:
+        if len(args.benchmarks) == 0 and not args.serve:
             raise Exception(
                 "No benchmark given. Run with '--help' for more information."
             )
@@ -1,4 +1,18 @@
-from recurrences import RecBuilder
+import atexit
+import os
+import sys
+from functools import lru_cache
+from typing import List
+from inputparser import Parser
+from program import (
+    Program,
+    NormalizedProgramCache,
+    PassManager,
+    normalize_program,
+    get_normalization_passes,
+    apply_program_settings,
+)
+from recurrences import RecBuilder, DiffRecBuilder, ClosedFormCache
 from recurrences.solver import RecurrenceSolver
 from symengine.lib.symengine_wrapper import sympify
 from sympy import limit_seq, Symbol
@@ -19,15 +33,148 @@ def get_moment(monom, solvers, rec_builder, cli_args, program):
     if cli_args.solvability_check and not is_solvable(monom, program):
         raise Exception(f"{monom} is not effective/solvable.")
 
-    if monom not in solvers:
-        recurrences = rec_builder.get_recurrences(monom)
-        s = RecurrenceSolver(recurrences)
-        solvers.update({sympify(m): s for m in recurrences.monomials})
+    cache = get_closed_form_cache(cli_args)
+    parameter = get_differentiation_parameter(rec_builder)
+    if cache is not None:
+        cached = cache.get(program, monom, parameter)
+        if cached is not None:
+            return cached
+
+    solver_key = rec_builder.get_solver_key(monom)
+    if solver_key not in solvers:
+        add_solver([monom], solvers, rec_builder)
 
     moment, is_exact = rec_builder.get_solution(monom, solvers)
+    if cache is not None:
+        recurrences = solvers[solver_key].recurrences
+        key = sympy_sympify(solver_key)
+        cache.put(
+            program,
+            monom,
+            moment,
+            is_exact,
+            recurrences.recurrence_dict[key],
+            recurrences.init_values_dict[key],
+            parameter,
+        )
     return moment, is_exact
 
 
+def get_differentiation_parameter(rec_builder):
+    """
+    Returns the parameter by which the rec_builder differentiates the monomials or None if it does not.
+    """
+    if isinstance(rec_builder, DiffRecBuilder):
+        return rec_builder.param
+    return None
+
+
+def solve_moments(monoms, solvers, rec_builder, cli_args, program):
+    """
+    Solves the moments of all given monomials together. The recurrences of all monomials without a solver
+    form a single system which is solved once, such that monomials shared between them are only handled once.
+    Afterwards, get_moment reads the moments from the solvers. Monomials which are cached or not solvable
+    are skipped, as get_moment handles them on its own.
+    """
+    cache = get_closed_form_cache(cli_args)
+    parameter = get_differentiation_parameter(rec_builder)
+    missing = []
+    for monom in monoms:
+        monom = sympify(monom)
+        if rec_builder.get_solver_key(monom) in solvers or monom in missing:
+            continue
+        if cli_args.solvability_check and not is_solvable(monom, program):
+            continue
+        if cache is not None and cache.get(program, monom, parameter) is not None:
+            continue
+        missing.append(monom)
+    if not missing:
+        return
+
+    add_solver(missing, solvers, rec_builder)
+
+
+def add_solver(monoms, solvers, rec_builder):
+    """
+    Adds a solver for the given monomials to the solvers. The largest system already solved is extended by the
+    recurrences of the monomials, such that only the monomials not in it are solved and known closed forms
+    and roots are reused.
+    """
+    if not isinstance(rec_builder, RecBuilder):
+        # Recurrences of differentiated monomials are only constructed per monomial
+        (monom,) = monoms
+        recurrences = rec_builder.get_recurrences(monom)
+        s = RecurrenceSolver(recurrences)
+    elif solvers:
+        base = max(solvers.values(), key=lambda b: len(b.recurrences.monomials))
+        recurrences = rec_builder.get_recurrences_batch(monoms, base.recurrences)
+        s = RecurrenceSolver(recurrences, base=base)
+    else:
+        recurrences = rec_builder.get_recurrences_batch(monoms)
+        s = RecurrenceSolver(recurrences)
+    solvers.update({sympify(m): s for m in recurrences.monomials})
+
+
+def get_closed_form_cache(cli_args):
+    if cli_args.no_cache or not cli_args.cache_dir:
+        return None
+    return _open_closed_form_cache(cli_args.cache_dir, cli_args.cache_size)
+
+
+def flush_closed_form_cache(cli_args):
+    """
+    Writes the closed forms computed since the last flush to the closed form cache, if it is enabled.
+    """
+    cache = get_closed_form_cache(cli_args)
+    if cache is not None:
+        cache.flush()
+
+
+@lru_cache(maxsize=None)
+def _open_closed_form_cache(directory, max_size_mb):
+    cache = ClosedFormCache(os.path.expanduser(directory), max_size_mb * 1024 * 1024)
+    # Closed forms which have not been written by an explicit flush are written at exit
+    atexit.register(cache.flush)
+    return cache
+
+
+def load_normalized_program(benchmark: str, cli_args) -> Program:
+    """
+    Parses and normalizes the program in the given file. Normalized programs are cached on disk keyed by
+    the source and the settings, such that repeated invocations skip the normalization.
+    If profiling of the passes is enabled, the cache is not read and the profile is printed to stderr.
+    """
+    with open(benchmark) as file:
+        source = file.read()
+    cache = get_program_cache(cli_args)
+    if cache is not None and not cli_args.profile_passes:
+        program = cache.get(source)
+        if program is not None:
+            apply_program_settings()
+            return program
+
+    pass_manager = PassManager(get_normalization_passes(), cli_args.profile_passes)
+    program = normalize_program(Parser().parse_string(source), pass_manager)
+    if cli_args.profile_passes:
+        print(f"Normalization passes of {benchmark}:", file=sys.stderr)
+        print(pass_manager.format_profile(), file=sys.stderr)
+    if cache is not None:
+        cache.put(source, program)
+    return program
+
+
+def get_program_cache(cli_args):
+    if cli_args.no_cache or not cli_args.cache_dir:
+        return None
+    return _open_program_cache(cli_args.cache_dir, cli_args.cache_size)
+
+
+@lru_cache(maxsize=None)
+def _open_program_cache(directory, max_size_mb):
+    directory = os.path.join(os.path.expanduser(directory), "programs")
+    return NormalizedProgramCache(directory, max_size_mb * 1024 * 1024)
+
+
 def get_moment_poly(poly, solvers, rec_builder, cli_args, program):
     expanded_poly = poly.expand()
     monoms = get_monoms(expanded_poly)
@@ -47,9 +194,7 @@ def get_all_cumulants(program, monom, max_cumulant, cli_args):
         monom, max_cumulant, solvers, rec_builder, cli_args, program
     )
     cumulants = raw_moments_to_cumulants(moments)
-    if cli_args.at_n >= 0:
-        cumulants = {i: eval_re(cli_args.at_n, c) for i, c in cumulants.items()}
-    return cumulants
+    return eval_at_single_iteration(cumulants, cli_args)
 
 
 def get_all_cumulants_after_loop(program, monom, max_cumulant, cli_args):
@@ -60,8 +205,39 @@ def get_all_cumulants_after_loop(program, monom, max_cumulant, cli_args):
     )
     cumulants_given_termination = raw_moments_to_cumulants(moments_given_termination)
     cumulants = transform_to_after_loop(cumulants_given_termination)
-    if cli_args.at_n >= 0:
-        cumulants = {i: eval_re(cli_args.at_n, c) for i, c in cumulants.items()}
+    return eval_at_single_iteration(cumulants, cli_args)
+
+
+def get_iterations(at_n) -> List[int]:
+    """
+    Returns the iterations given by --at_n, which is either a single iteration or a range of iterations.
+    """
+    if isinstance(at_n, range):
+        return list(at_n)
+    return [at_n] if at_n >= 0 else []
+
+
+def get_parameter_values(cli_args):
+    """
+    Returns the values of symbolic parameters given by --param_values as "name=value" by their names.
+    """
+    parameter_values = {}
+    for assignment in cli_args.param_values:
+        name, separator, value = assignment.partition("=")
+        if not separator or not name.strip() or not value.strip():
+            raise Exception(
+                f"Parameter value {assignment} does not have the form name=value."
+            )
+        parameter_values[name.strip()] = sympy_sympify(value.strip(), rational=True)
+    return parameter_values
+
+
+def eval_at_single_iteration(cumulants, cli_args):
+    iterations = get_iterations(cli_args.at_n)
+    if len(iterations) > 1:
+        raise Exception("Cumulants can only be evaluated at a single iteration.")
+    if iterations:
+        cumulants = {i: eval_re(iterations[0], c) for i, c in cumulants.items()}
     return cumulants
 
 
@@ -105,6 +281,16 @@ def get_moment_given_termination(monom, solvers, rec_builder, cli_args, program)
     return conditional_moment, (is_exact_guard and is_exact_monom_guard)
 
 
+def get_monomials_given_termination(monom, program):
+    """
+    Returns the monomials whose moments are needed for the moment of a monomial given loop termination.
+    """
+    negated_loop_guard = Not(program.original_loop_guard).to_arithm(program)
+    monoms = get_monoms(negated_loop_guard.expand())
+    monoms += get_monoms((monom * negated_loop_guard).expand())
+    return [m for _, m in monoms]
+
+
 def transform_to_after_loop(element):
     def trans_single(e):
         return limit_seq(unpack_piecewise(e), Symbol("n"))
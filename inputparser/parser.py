@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from lark import Lark
 
 from program import Program
@@ -8,6 +9,21 @@ from .arithmetic_transformer import ArithmeticToStringTransformer
 GRAMMAR_FILE_PATH = os.path.dirname(__file__) + "/syntax.lark"
 
 
+@lru_cache(maxsize=None)
+def get_lark_parser() -> Lark:
+    """
+    Builds the LALR parser for the grammar once per process. The analyzed grammar is additionally
+    cached on disk by Lark, which speeds up the construction in new processes.
+    """
+    with open(GRAMMAR_FILE_PATH) as grammar_file:
+        return Lark(
+            grammar_file,
+            transformer=ArithmeticToStringTransformer,
+            parser="lalr",
+            cache=True,
+        )
+
+
 class Parser:
     """
     Parsers which takes a .prob source file and returns the program in a form such that it can be used further.
@@ -19,13 +35,8 @@ class Parser:
         return program
 
     def parse_string(self, code: str) -> Program:
-        with open(GRAMMAR_FILE_PATH) as grammar_file:
-            parser = Lark(
-                grammar_file, transformer=ArithmeticToStringTransformer, parser="lalr"
-            )
-            tree = parser.parse(code)
-            program = StructureTransformer().transform(tree)
-        return program
+        tree = get_lark_parser().parse(code)
+        return StructureTransformer().transform(tree)
 
 
 def parse_program(benchmark: str) -> Program:
@@ -0,0 +1,85 @@
+"""
+Compares the backends for characteristic polynomials of recurrence matrices arising from the benchmarks.
+Run with: python -m performance.charpoly [--pattern "benchmarks/**/*.prob"] [--degree 2]
+"""
+
+import os
+import signal
+from argparse import ArgumentParser
+from inputparser import parse_program
+from program import normalize_program
+from recurrences import RecBuilder
+from utils import charpoly
+from .common import ROOT_PATH, get_benchmark_files, measure
+
+
+class Timeout(BaseException):
+    pass
+
+
+def raise_timeout(signum, frame):
+    raise Timeout()
+
+
+def get_matrices(benchmark: str, degree: int):
+    program = normalize_program(parse_program(benchmark))
+    rec_builder = RecBuilder(program)
+    matrices = {}
+    for variable in sorted(program.original_variables, key=str):
+        recurrences = rec_builder.get_recurrences(variable**degree)
+        if not recurrences.is_acyclic:
+            matrices[frozenset(recurrences.monomials)] = recurrences.recurrence_matrix
+    return list(matrices.values())
+
+
+def time_backend(matrices, backend: str, timeout: int):
+    signal.alarm(timeout)
+    try:
+        return measure(lambda: [charpoly(m, backend) for m in matrices])
+    except Timeout:
+        return None
+    finally:
+        signal.alarm(0)
+
+
+def main():
+    argument_parser = ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--pattern", default="benchmarks/**/*.prob")
+    argument_parser.add_argument("--degree", type=int, default=2)
+    argument_parser.add_argument("--timeout", type=int, default=60)
+    args = argument_parser.parse_args()
+    signal.signal(signal.SIGALRM, raise_timeout)
+
+    totals = {"sympy": 0.0, "domain": 0.0}
+    print(f"{'benchmark':50} {'size':>6} {'sympy':>10} {'domain':>10}")
+    for benchmark in get_benchmark_files(args.pattern):
+        signal.alarm(args.timeout)
+        try:
+            matrices = get_matrices(benchmark, args.degree)
+        except (Exception, Timeout):
+            continue
+        finally:
+            signal.alarm(0)
+        if not matrices:
+            continue
+
+        times = {b: time_backend(matrices, b, args.timeout) for b in totals}
+        if any(t is None for t in times.values()):
+            formatted = {
+                b: "timeout" if t is None else f"{t:.3f}" for b, t in times.items()
+            }
+        else:
+            formatted = {b: f"{t:.3f}" for b, t in times.items()}
+            for b, t in times.items():
+                totals[b] += t
+        size = max(m.rows for m in matrices)
+        name = os.path.relpath(benchmark, ROOT_PATH)
+        print(f"{name:50} {size:>6} {formatted['sympy']:>10} {formatted['domain']:>10}")
+
+    print(
+        f"{'total (without timeouts)':50} {'':>6} {totals['sympy']:>10.3f} {totals['domain']:>10.3f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import glob
+import os
+import time
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_benchmark_files(pattern: str = "benchmarks/**/*.prob"):
+    return sorted(glob.glob(os.path.join(ROOT_PATH, pattern), recursive=True))
+
+
+def measure(function, repetitions: int = 1):
+    """
+    Returns the best wall-clock time in seconds of calling the function the given number of times.
+    """
+    best = float("inf")
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -0,0 +1,77 @@
+"""
+Compares the cost of generating the moments E(X^k), k = 0, ..., max_k, of continuous distributions
+via their closed forms and via symbolic integration with sympy.stats.
+Run with: python -m performance.distribution_moments [--max_k 20] [--timeout 120]
+"""
+
+import signal
+from argparse import ArgumentParser
+from sympy.core.cache import clear_cache
+from program.distribution import Distribution, Normal, Laplace, Gamma, Beta
+from program.distribution import moments
+from .common import measure
+
+
+class Timeout(BaseException):
+    pass
+
+
+def raise_timeout(signum, frame):
+    raise Timeout()
+
+
+DISTRIBUTIONS = [
+    Normal([1, 2]),
+    Normal(["1/2", "1/3"]),
+    Laplace([1, "1/2"]),
+    Gamma([3, "1/2"]),
+    Beta([2, 3]),
+    Beta([2, 3, 5]),
+]
+
+
+def closed_form(distribution: Distribution, max_k: int):
+    for function in [
+        moments.normal_moment,
+        moments.laplace_moment,
+        moments.gamma_moment,
+        moments.beta_moment,
+    ]:
+        function.cache_clear()
+    return [distribution.get_moment(k) for k in range(max_k + 1)]
+
+
+def sympy_stats(distribution: Distribution, max_k: int):
+    clear_cache()
+    return [Distribution.get_moment(distribution, k) for k in range(max_k + 1)]
+
+
+def time_method(method, distribution: Distribution, max_k: int, timeout: int):
+    signal.alarm(timeout)
+    try:
+        return measure(lambda: method(distribution, max_k))
+    except Timeout:
+        return None
+    finally:
+        signal.alarm(0)
+
+
+def main():
+    argument_parser = ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--max_k", type=int, default=20)
+    argument_parser.add_argument("--timeout", type=int, default=120)
+    args = argument_parser.parse_args()
+    signal.signal(signal.SIGALRM, raise_timeout)
+
+    print(f"{'distribution':30} {'sympy.stats':>12} {'closed form':>12}")
+    for distribution in DISTRIBUTIONS:
+        times = [
+            time_method(method, distribution, args.max_k, args.timeout)
+            for method in [sympy_stats, closed_form]
+        ]
+        formatted = ["timeout" if t is None else f"{t:.4f}" for t in times]
+        print(f"{str(distribution):30} {formatted[0]:>12} {formatted[1]:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Reports the parse throughput in programs per second over the benchmark corpus.
+Run with: python -m performance.parse_throughput
+"""
+
+from argparse import ArgumentParser
+from lark import Lark
+from inputparser import Parser
+from inputparser.parser import GRAMMAR_FILE_PATH
+from inputparser.arithmetic_transformer import ArithmeticToStringTransformer
+from inputparser.structure_transformer import StructureTransformer
+from .common import get_benchmark_files, measure
+
+
+def parse_with_fresh_grammar(code: str):
+    with open(GRAMMAR_FILE_PATH) as grammar_file:
+        parser = Lark(
+            grammar_file, transformer=ArithmeticToStringTransformer, parser="lalr"
+        )
+    return StructureTransformer().transform(parser.parse(code))
+
+
+def main():
+    argument_parser = ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--repetitions", type=int, default=3)
+    args = argument_parser.parse_args()
+
+    sources = []
+    for path in get_benchmark_files():
+        with open(path) as file:
+            code = file.read()
+        try:
+            Parser().parse_string(code)
+            sources.append(code)
+        except Exception:
+            pass
+
+    def run(parse):
+        for code in sources:
+            parse(code)
+
+    fresh = measure(lambda: run(parse_with_fresh_grammar), args.repetitions)
+    cached = measure(lambda: run(Parser().parse_string), args.repetitions)
+    print(f"Programs: {len(sources)}")
+    print(f"Grammar built per parse: {len(sources) / fresh:.1f} programs/s")
+    print(f"Grammar built once:      {len(sources) / cached:.1f} programs/s")
+
+
+if __name__ == "__main__":
+    main()
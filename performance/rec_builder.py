@@ -0,0 +1,63 @@
+"""
+Reports the time of constructing the recurrences of the moments of all program variables of the benchmarks.
+Run with: python -m performance.rec_builder [--pattern "benchmarks/**/*.prob"] [--degree 2] [--timeout 20]
+"""
+
+import os
+import signal
+from argparse import ArgumentParser
+from inputparser import parse_program
+from program import normalize_program
+from recurrences import RecBuilder
+from .common import ROOT_PATH, get_benchmark_files, measure
+
+
+class Timeout(BaseException):
+    pass
+
+
+def raise_timeout(signum, frame):
+    raise Timeout()
+
+
+def build_recurrences(program, degree: int):
+    rec_builder = RecBuilder(program)
+    size = 0
+    for variable in sorted(program.original_variables, key=str):
+        for d in range(1, degree + 1):
+            size += len(rec_builder.get_recurrences(variable**d).monomials)
+    return size
+
+
+def main():
+    argument_parser = ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--pattern", default="benchmarks/**/*.prob")
+    argument_parser.add_argument("--degree", type=int, default=2)
+    argument_parser.add_argument("--timeout", type=int, default=20)
+    args = argument_parser.parse_args()
+    signal.signal(signal.SIGALRM, raise_timeout)
+
+    total = 0.0
+    print(f"{'benchmark':60} {'monomials':>10} {'time (s)':>10}")
+    for benchmark in get_benchmark_files(args.pattern):
+        name = os.path.relpath(benchmark, ROOT_PATH)
+        signal.alarm(args.timeout)
+        try:
+            program = normalize_program(parse_program(benchmark))
+            size = build_recurrences(program, args.degree)
+            seconds = measure(lambda: build_recurrences(program, args.degree))
+        except Timeout:
+            print(f"{name:60} {'timeout':>10}")
+            continue
+        except Exception:
+            continue
+        finally:
+            signal.alarm(0)
+        total += seconds
+        print(f"{name:60} {size:>10} {seconds:>10.3f}")
+
+    print(f"{'total (without timeouts)':60} {'':>10} {total:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Reports the time of the finite type inference and of the whole normalization for programs generated from
+Bayesian networks.
+Run with: python -m performance.type_inference [--pattern "bayesnet/repo/medium/*.bif"] [--timeout 300]
+"""
+
+import os
+import signal
+import time
+from argparse import ArgumentParser
+from bayesnet.parser import BifParser
+from bayesnet.code_generator import CodeGenerator
+from inputparser import Parser
+from program import get_normalization_passes
+from .common import ROOT_PATH, get_benchmark_files
+
+
+class Timeout(BaseException):
+    pass
+
+
+def raise_timeout(signum, frame):
+    raise Timeout()
+
+
+def profile_normalization(network_file: str):
+    network = BifParser().parse_file(network_file)
+    program = Parser().parse_string(CodeGenerator(network).generate_code())
+    type_inference, total = 0.0, 0.0
+    # The passes are timed directly, as tracing the allocations would distort the times
+    for name, create_transformer in get_normalization_passes():
+        start = time.perf_counter()
+        program = create_transformer().execute(program)
+        seconds = time.perf_counter() - start
+        total += seconds
+        if name == "TypeInferer":
+            type_inference = seconds
+    return len(program.loop_body), type_inference, total
+
+
+def main():
+    argument_parser = ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--pattern", default="bayesnet/repo/medium/*.bif")
+    argument_parser.add_argument("--timeout", type=int, default=300)
+    args = argument_parser.parse_args()
+    signal.signal(signal.SIGALRM, raise_timeout)
+
+    print(f"{'network':40} {'assigns':>8} {'types (s)':>10} {'total (s)':>10}")
+    for network_file in get_benchmark_files(args.pattern):
+        name = os.path.relpath(network_file, ROOT_PATH)
+        signal.alarm(args.timeout)
+        try:
+            assignments, type_inference, total = profile_normalization(network_file)
+        except Timeout:
+            print(f"{name:40} {'timeout':>8}")
+            continue
+        except RecursionError:
+            print(f"{name:40} {'error':>8}")
+            continue
+        finally:
+            signal.alarm(0)
+        print(f"{name:40} {assignments:>8} {type_inference:>10.3f} {total:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,12 +12,18 @@ from termcolor import colored
 
 
 def main():
+    args = ArgumentParser().parse_args()
+    if args.serve:
+        # In serve mode stdout is reserved for the responses
+        action = ActionFactory.create_action(args)
+        action(*args.benchmarks)
+        return
+
     print(colored(logo, "green"))
     print()
     print()
 
     start = time.time()
-    args = ArgumentParser().parse_args()
 
     try:
         action = ActionFactory.create_action(args)
@@ -1,2 +1,9 @@
 from .program import Program
 from .transformer import normalize_program
+from .transformer import (
+    PassManager,
+    PassProfile,
+    get_normalization_passes,
+    apply_program_settings,
+)
+from .program_cache import NormalizedProgramCache
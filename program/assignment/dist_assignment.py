@@ -1,5 +1,5 @@
 from symengine.lib.symengine_wrapper import Expr, Symbol
-from typing import Set, TYPE_CHECKING
+from typing import Dict, Set, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from recurrences import RecBuilderContext
@@ -12,10 +12,13 @@ from utils import get_terms_with_vars
 
 class DistAssignment(Assignment):
     distribution: Distribution
+    # the moments of the distribution computed so far
+    _moment_table: Dict[int, Expr]
 
     def __init__(self, var, dist):
         super().__init__(var)
         self.distribution = dist
+        self._moment_table = {}
 
     def __str__(self):
         result = str(self.variable) + " = " + str(self.distribution)
@@ -35,6 +38,7 @@ class DistAssignment(Assignment):
         self.default = self.default.subs(substitutions)
         self.condition.subs(substitutions)
         self.distribution.subs(substitutions)
+        self._moment_table = {}
 
     def evaluate_right_side(self, state):
         return self.distribution.sample(state)
@@ -67,11 +71,20 @@ class DistAssignment(Assignment):
         # Otherwise, we can just compute the moment of the distribution and put it in the result
         # (the parameters of the distribution are always constant, hence self is independent of everything else)
         else:
-            dist_moment = self.distribution.get_moment(k)
+            dist_moment = self.get_distribution_moment(k)
         if_cond = arithm_cond * dist_moment * rest
         if_not_cond = (1 - arithm_cond) * (self.default**k) * rest
         return if_cond + if_not_cond
 
+    def get_distribution_moment(self, k: int) -> Expr:
+        """
+        Returns the k-th moment of the distribution, which is computed only once per assignment.
+        """
+        k = int(k)
+        if k not in self._moment_table:
+            self._moment_table[k] = self.distribution.get_moment(k)
+        return self._moment_table[k]
+
     def _get_mixed_func_moment(
         self,
         k: int,
@@ -1,8 +1,8 @@
 from typing import List
 import random
-from symengine.lib.symengine_wrapper import Expr, sympify
+from symengine.lib.symengine_wrapper import Expr, sympify, One
 
-from utils import float_to_rational, get_monoms
+from utils import float_to_rational, get_monoms, compile_expression
 from .assignment import Assignment
 from program.condition import TrueCond
 from .exceptions import EvaluationException
@@ -11,6 +11,10 @@ from .exceptions import EvaluationException
 class PolyAssignment(Assignment):
     polynomials: List[Expr]
     probabilities: List[Expr]
+    # the expanded moments sum_i probabilities[i] * polynomials[i]^k for k = 0, 1, ...
+    _moment_table: List[Expr]
+    # the expanded highest powers of the polynomials computed so far
+    _power_table: List[Expr]
 
     def __init__(self, variable, polynomials, probabilities):
         super().__init__(variable)
@@ -34,6 +38,7 @@ class PolyAssignment(Assignment):
             if p.is_Float:
                 p = float_to_rational(p)
             self.probabilities.append(p)
+        self._reset_moment_table()
 
     @classmethod
     def deterministic(cls, variable, polynomial):
@@ -80,31 +85,59 @@ class PolyAssignment(Assignment):
     def evaluate_right_side(self, state):
         probabilities = []
         for prob in self.probabilities:
-            p = prob.subs(state)
-            if not p.is_Number:
+            try:
+                probabilities.append(float(compile_expression(prob)(state)))
+            except KeyError:
                 raise EvaluationException(
                     f"Probability {prob} is not a number in state {state}"
                 )
-            probabilities.append(float(p))
 
         polynomials = []
         for pol in self.polynomials:
-            p = pol.subs(state)
-            if not p.is_Number:
+            try:
+                polynomials.append(float(compile_expression(pol)(state)))
+            except KeyError:
                 raise EvaluationException(
                     f"Polynomial {pol} is not a number in state {state}"
                 )
-            polynomials.append(float(p))
 
         return random.choices(polynomials, weights=probabilities, k=1)[0]
 
     def get_moment(
         self, k: int, rec_builder_context, arithm_cond: Expr = 1, rest: Expr = 1
     ):
-        if_cond = 0
-        for i in range(len(self.polynomials)):
-            if_cond += (
-                arithm_cond * self.probabilities[i] * (self.polynomials[i] ** k) * rest
-            )
+        if_cond = arithm_cond * self.get_polynomials_moment(k) * rest
         if_not_cond = (1 - arithm_cond) * (self.default**k) * rest
         return if_cond + if_not_cond
+
+    def get_polynomials_moment(self, k: int) -> Expr:
+        """
+        Returns the expanded k-th moment of the right side. The moments are stored in a table which is
+        extended incrementally by multiplying the highest powers computed so far with the polynomials.
+        """
+        if (
+            self._table_polynomials is not self.polynomials
+            or self._table_probabilities is not self.probabilities
+        ):
+            self._reset_moment_table()
+        k = int(k)
+        while len(self._moment_table) <= k:
+            self._power_table = [
+                (power * poly).expand()
+                for power, poly in zip(self._power_table, self.polynomials)
+            ]
+            moment = sum(
+                (
+                    prob * power
+                    for prob, power in zip(self.probabilities, self._power_table)
+                ),
+                sympify(0),
+            )
+            self._moment_table.append(moment.expand())
+        return self._moment_table[k]
+
+    def _reset_moment_table(self):
+        self._table_polynomials = self.polynomials
+        self._table_probabilities = self.probabilities
+        self._power_table = [One() for _ in self.polynomials]
+        self._moment_table = [sum(self.probabilities, sympify(0)).expand()]
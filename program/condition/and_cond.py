@@ -1,3 +1,4 @@
+import numpy as np
 from .condition import Condition
 from .true_cond import TrueCond
 
@@ -11,6 +12,7 @@ class And(Condition):
         self.cond2 = cond2
 
     def simplify(self):
+        self._reset_caches()
         self.cond1 = self.cond1.simplify()
         self.cond2 = self.cond2.simplify()
         if isinstance(self.cond1, TrueCond):
@@ -20,24 +22,31 @@ class And(Condition):
         return self
 
     def reduce(self, store):
+        self._reset_caches()
         return self.cond1.reduce(store) + self.cond2.reduce(store)
 
     def get_normalized(self, program):
+        self._reset_caches()
         self.cond1, failed_atoms1 = self.cond1.get_normalized(program)
         self.cond2, failed_atoms2 = self.cond2.get_normalized(program)
         return self, failed_atoms1 + failed_atoms2
 
     def subs(self, substitutions):
+        self._reset_caches()
         self.cond1.subs(substitutions)
         self.cond2.subs(substitutions)
 
-    def evaluate(self, state):
-        return self.cond1.evaluate(state) and self.cond2.evaluate(state)
+    def _compile(self, vectorized):
+        cond1 = self.cond1.compile(vectorized)
+        cond2 = self.cond2.compile(vectorized)
+        if vectorized:
+            return lambda state: np.logical_and(cond1(state), cond2(state))
+        return lambda state: cond1(state) and cond2(state)
 
     def get_conjuncts(self):
         return self.cond1.get_conjuncts() + self.cond2.get_conjuncts()
 
-    def to_arithm(self, p):
+    def _to_arithm(self, p):
         return self.cond1.to_arithm(p) * self.cond2.to_arithm(p)
 
     def get_free_symbols(self):
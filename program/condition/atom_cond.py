@@ -10,7 +10,7 @@ from .exceptions import (
     NormalizingException,
     EvaluationException,
 )
-from utils import get_unique_var, get_valid_values, evaluate_cop
+from utils import get_unique_var, get_valid_values, evaluate_cop, compile_expression
 from program.type import Finite
 
 
@@ -24,23 +24,30 @@ class Atom(Condition):
         return self
 
     def subs(self, substitutions):
+        self._reset_caches()
         self.poly1 = self.poly1.subs(substitutions)
         self.poly2 = self.poly2.subs(substitutions)
 
-    def evaluate(self, state):
-        poly1 = self.poly1.subs(state)
-        poly2 = self.poly2.subs(state)
-        if not poly1.is_Number or not poly2.is_Number:
-            raise EvaluationException(
-                f"Atom {self} cannot be fully evaluated with state {state}"
-            )
-        result = evaluate_cop(float(poly1), self.cop, float(poly2))
-        return result
+    def _compile(self, vectorized):
+        poly1 = compile_expression(self.poly1, vectorized)
+        poly2 = compile_expression(self.poly2, vectorized)
+        cop = self.cop
+
+        def evaluate(state):
+            try:
+                return evaluate_cop(poly1(state), cop, poly2(state))
+            except KeyError:
+                raise EvaluationException(
+                    f"Atom {self} cannot be fully evaluated with state {state}"
+                )
+
+        return evaluate
 
     def is_reduced(self):
         return self.poly1.is_Symbol and self.poly2.is_Integer
 
     def reduce(self, store: Dict["Atom", Symbol]):
+        self._reset_caches()
         if self.is_reduced():
             return []
 
@@ -84,7 +91,7 @@ class Atom(Condition):
 
         return result, []
 
-    def to_arithm(self, program):
+    def _to_arithm(self, program):
         if not self.is_normalized():
             raise ArithmConversionException(f"Atom {self} is not normalized")
         var = self.poly1
@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Callable, Optional
 from symengine.lib.symengine_wrapper import Expr, Symbol
 
 
 class Condition(ABC):
     is_loop_guard: bool = False
+    # The program and the arithmetic form of the condition computed last, reset by subs
+    _arithm: Optional[Tuple[object, Expr]] = None
+    # The compiled callables of the condition keyed by vectorized, reset by subs
+    _compiled: Optional[Dict[bool, Callable]] = None
 
     @abstractmethod
     def is_implied_by_loop_guard(self):
@@ -38,18 +42,54 @@ class Condition(ABC):
     def subs(self, substitutions):
         pass
 
-    @abstractmethod
     def evaluate(self, state: Dict[Symbol, float]):
-        pass
+        return self.compile()(state)
+
+    def compile(self, vectorized: bool = False) -> Callable:
+        """
+        Returns a fast callable evaluating the condition for a given state.
+        If vectorized is true, the state maps variables to numpy arrays and the callable returns a boolean array.
+        The callable is compiled once and kept until the condition is changed by subs.
+        """
+        if self._compiled is None:
+            self._compiled = {}
+        if vectorized not in self._compiled:
+            self._compiled[vectorized] = self._compile(vectorized)
+        return self._compiled[vectorized]
 
     @abstractmethod
+    def _compile(self, vectorized: bool) -> Callable:
+        pass
+
+    def _reset_caches(self):
+        self._arithm = None
+        self._compiled = None
+
     def to_arithm(self, program) -> Expr:
+        """
+        Returns the condition as an arithmetic expression which is 1 if the condition holds and 0 otherwise.
+        The result is cached for the given program until the condition is changed by subs.
+        """
+        if self._arithm is not None and self._arithm[0] is program:
+            return self._arithm[1]
+        arithm = self._to_arithm(program)
+        self._arithm = (program, arithm)
+        return arithm
+
+    @abstractmethod
+    def _to_arithm(self, program) -> Expr:
         pass
 
     @abstractmethod
     def _simple_copy(self) -> "Condition":
         pass
 
+    def __getstate__(self):
+        # Compiled callables cannot be pickled, they are compiled again when needed
+        state = self.__dict__.copy()
+        state.pop("_compiled", None)
+        return state
+
     def copy(self) -> "Condition":
         cond = self._simple_copy()
         cond.is_loop_guard = self.is_loop_guard
@@ -15,10 +15,10 @@ class FalseCond(Condition):
     def subs(self, substitutions):
         pass
 
-    def evaluate(self, state):
-        return False
+    def _compile(self, vectorized):
+        return lambda state: False
 
-    def to_arithm(self, _) -> Expr:
+    def _to_arithm(self, _) -> Expr:
         return sympify(0)
 
     def get_free_symbols(self):
@@ -1,3 +1,4 @@
+import numpy as np
 from .condition import Condition
 
 
@@ -8,23 +9,30 @@ class Not(Condition):
         self.cond = cond
 
     def simplify(self):
+        self._reset_caches()
         self.cond = self.cond.simplify()
         return self
 
     def reduce(self, store):
+        self._reset_caches()
         return self.cond.reduce(store)
 
     def get_normalized(self, program):
+        self._reset_caches()
         self.cond, failed_atoms = self.cond.get_normalized(program)
         return self, failed_atoms
 
     def subs(self, substitutions):
+        self._reset_caches()
         self.cond.subs(substitutions)
 
-    def evaluate(self, state):
-        return not self.cond.evaluate(state)
+    def _compile(self, vectorized):
+        cond = self.cond.compile(vectorized)
+        if vectorized:
+            return lambda state: np.logical_not(cond(state))
+        return lambda state: not cond(state)
 
-    def to_arithm(self, p):
+    def _to_arithm(self, p):
         return 1 - self.cond.to_arithm(p)
 
     def get_free_symbols(self):
@@ -1,3 +1,4 @@
+import numpy as np
 from .condition import Condition
 from .false_cond import FalseCond
 
@@ -11,6 +12,7 @@ class Or(Condition):
         self.cond2 = cond2
 
     def simplify(self):
+        self._reset_caches()
         self.cond1 = self.cond1.simplify()
         self.cond2 = self.cond2.simplify()
         if isinstance(self.cond1, FalseCond):
@@ -20,21 +22,28 @@ class Or(Condition):
         return self
 
     def reduce(self, store):
+        self._reset_caches()
         return self.cond1.reduce(store) + self.cond2.reduce(store)
 
     def get_normalized(self, program):
+        self._reset_caches()
         self.cond1, failed_atoms1 = self.cond1.get_normalized(program)
         self.cond2, failed_atoms2 = self.cond2.get_normalized(program)
         return self, failed_atoms1 + failed_atoms2
 
     def subs(self, substitutions):
+        self._reset_caches()
         self.cond1.subs(substitutions)
         self.cond2.subs(substitutions)
 
-    def evaluate(self, state):
-        return self.cond1.evaluate(state) or self.cond2.evaluate(state)
+    def _compile(self, vectorized):
+        cond1 = self.cond1.compile(vectorized)
+        cond2 = self.cond2.compile(vectorized)
+        if vectorized:
+            return lambda state: np.logical_or(cond1(state), cond2(state))
+        return lambda state: cond1(state) or cond2(state)
 
-    def to_arithm(self, p):
+    def _to_arithm(self, p):
         not_cond1 = 1 - self.cond1.to_arithm(p)
         not_cond2 = 1 - self.cond2.to_arithm(p)
         return 1 - (not_cond1 * not_cond2)
@@ -23,8 +23,8 @@ class TrueCond(Condition):
     def subs(self, substitutions):
         pass
 
-    def evaluate(self, state):
-        return True
+    def _compile(self, vectorized):
+        return lambda state: True
 
     def get_free_symbols(self):
         return set()
@@ -32,7 +32,7 @@ class TrueCond(Condition):
     def get_conjuncts(self):
         return [self]
 
-    def to_arithm(self, p):
+    def _to_arithm(self, p):
         return sympify(1)
 
     def __str__(self):
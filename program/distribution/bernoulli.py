@@ -1,6 +1,5 @@
 from symengine.lib.symengine_wrapper import Expr, Zero, One
 from .distribution import Distribution
-from .exceptions import EvaluationException
 from scipy.stats import bernoulli
 from sympy import I, E, sympify
 
@@ -23,12 +22,15 @@ class Bernoulli(Distribution):
         self.p = self.p.subs(substitutions)
 
     def sample(self, state):
-        p = self.p.subs(state)
-        if not p.is_Number:
-            raise EvaluationException(
-                f"Parameter {self.p} doesn't evaluate to number with state {state}"
-            )
-        return bernoulli.rvs(float(p))
+        p = self.evaluate_parameter(self.p, state)
+        return bernoulli.rvs(p)
+
+    def get_parameters(self):
+        return [self.p]
+
+    def sample_batch(self, parameters, size, rng):
+        p = parameters[0]
+        return (rng.random(size) < p).astype(float)
 
     def cf(self, t: Expr):
         p = sympify(self.p)
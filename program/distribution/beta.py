@@ -1,10 +1,8 @@
-from functools import lru_cache
-
-from symengine.lib.symengine_wrapper import Expr, sympy2symengine, One, Zero
+from symengine.lib.symengine_wrapper import Expr, One, Zero
 from .distribution import Distribution
-from .exceptions import EvaluationException
+from .moments import beta_moment
 from scipy.stats import beta
-from sympy import sympify, Rational, E, I
+from sympy import sympify, E, I
 from sympy.stats import Beta as BetaDist, E as EV
 
 
@@ -25,13 +23,12 @@ class Beta(Distribution):
         else:
             raise RuntimeError("Beta distribution requires 2 or 3 parameters")
 
-    @lru_cache()
     def get_moment(self, k: int):
-        a = sympify(self.a)
-        b = sympify(self.b)
-        scale = sympify(self.scale)
-        x = BetaDist("x", a, b)
-        return sympy2symengine(Rational((scale**k) * EV(x**k)))
+        k = int(k)
+        return (self.scale**k * beta_moment(self.a, self.b, k)).expand()
+
+    def get_random_variable(self):
+        return sympify(self.scale) * BetaDist("x", sympify(self.a), sympify(self.b))
 
     def is_discrete(self):
         return False
@@ -42,18 +39,17 @@ class Beta(Distribution):
         self.scale = self.scale.subs(substitutions)
 
     def sample(self, state):
-        a = self.a.subs(state)
-        b = self.b.subs(state)
-        scale = self.scale.subs(state)
-        if not a.is_Number or not b.is_Number:
-            raise EvaluationException(
-                f"Parameters {self.a}, {self.b} don't evaluate to numbers with state {state}"
-            )
-        if not scale.is_Number:
-            raise EvaluationException(
-                f"Parameter {self.scale}, does not evaluate to a number with state {state}"
-            )
-        return scale * beta.rvs(float(a), float(b))
+        a = self.evaluate_parameter(self.a, state)
+        b = self.evaluate_parameter(self.b, state)
+        scale = self.evaluate_parameter(self.scale, state)
+        return scale * beta.rvs(a, b)
+
+    def get_parameters(self):
+        return [self.a, self.b, self.scale]
+
+    def sample_batch(self, parameters, size, rng):
+        a, b, scale = parameters
+        return scale * rng.beta(a, b, size)
 
     def cf(self, t: Expr):
         a = sympify(self.a)
@@ -1,10 +1,10 @@
 from functools import lru_cache
 from typing import List
 import random
+import numpy as np
 
 from symengine.lib.symengine_wrapper import Expr, sympify
 from .distribution import Distribution
-from .exceptions import EvaluationException
 
 
 class Categorical(Distribution):
@@ -40,17 +40,27 @@ class Categorical(Distribution):
         return {sympify(v) for v in range(len(self.probabilities))}
 
     def sample(self, state):
-        probabilities = []
-        for prob in self.probabilities:
-            p = prob.subs(state)
-            if not p.is_Number:
-                raise EvaluationException(
-                    f"Probability {prob} is not a number in state {state}"
-                )
-            probabilities.append(float(p))
-
+        probabilities = [self.evaluate_parameter(p, state) for p in self.probabilities]
         return random.choices(range(len(probabilities)), weights=probabilities, k=1)[0]
 
+    def get_parameters(self):
+        return self.probabilities
+
+    def sample_batch(self, parameters, size, rng):
+        return self.choose(parameters, size, rng).astype(float)
+
+    @staticmethod
+    def choose(weights: List[np.ndarray], size: int, rng: np.random.Generator):
+        """
+        For every sample draws an index according to the (not necessarily normalized) weights.
+        The argument holds one row of weights per choice, each either a scalar or an array with one entry per sample.
+        """
+        weights = np.array([np.broadcast_to(w, (size,)) for w in weights])
+        cumulative = np.cumsum(weights, axis=0)
+        draws = rng.random(size) * cumulative[-1]
+        choices = (draws >= cumulative).sum(axis=0)
+        return np.minimum(choices, len(weights) - 1)
+
     def subs(self, substitutions):
         self.probabilities = [p.subs(substitutions) for p in self.probabilities]
 
@@ -44,6 +44,13 @@ class DiscreteUniform(Distribution):
     def sample(self, state):
         return random.choice(self.values)
 
+    def get_parameters(self):
+        return [self.values[0], self.values[-1]]
+
+    def sample_batch(self, parameters, size, rng):
+        low, high = int(self.values[0]), int(self.values[-1])
+        return rng.integers(low, high + 1, size).astype(float)
+
     def cf(self, t: Expr):
         a = ssympify(self.values[0])
         b = ssympify(self.values[-1])
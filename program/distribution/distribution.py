@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Union, Tuple, Set, Dict
+from typing import Union, Tuple, Set, Dict, List
+import numpy as np
 from symengine.lib.symengine_wrapper import Expr, Symbol, sympify
-from utils import float_to_rational
+from utils import float_to_rational, compile_expression
+from .exceptions import EvaluationException
+from .moments import sympy_stats_moment
 
 
 class Distribution(ABC):
@@ -19,9 +22,18 @@ class Distribution(ABC):
     def set_parameters(self, parameters):
         pass
 
-    @abstractmethod
     def get_moment(self, k: int):
-        pass
+        """
+        Returns E(X^k). Distributions should provide a closed form, by default the moment is computed by
+        symbolic integration of the sympy.stats random variable of the distribution.
+        """
+        return sympy_stats_moment(self.get_random_variable(), int(k))
+
+    def get_random_variable(self):
+        """
+        Returns a sympy.stats random variable with the same distribution.
+        """
+        raise NotImplementedError()
 
     @abstractmethod
     def is_discrete(self) -> bool:
@@ -31,6 +43,32 @@ class Distribution(ABC):
     def sample(self, state: Dict[Symbol, float]):
         pass
 
+    def get_parameters(self) -> List[Expr]:
+        """
+        Returns the parameters of the distribution in the order expected by sample_batch.
+        """
+        raise NotImplementedError()
+
+    def sample_batch(
+        self, parameters: List[np.ndarray], size: int, rng: np.random.Generator
+    ) -> np.ndarray:
+        """
+        Draws size samples at once using the given generator. The parameters contain the values of
+        get_parameters(), either as scalars or as arrays with one entry per sample.
+        """
+        raise NotImplementedError()
+
+    def evaluate_parameter(self, parameter: Expr, state: Dict[Symbol, float]):
+        """
+        Evaluates a parameter of the distribution in a given state using the compiled form of the parameter.
+        """
+        try:
+            return float(compile_expression(parameter)(state))
+        except KeyError:
+            raise EvaluationException(
+                f"Parameter {parameter} doesn't evaluate to number with state {state}"
+            )
+
     def cf(self, t: Expr):
         raise NotImplementedError()
 
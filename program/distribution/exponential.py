@@ -2,7 +2,6 @@ from functools import lru_cache
 from symengine.lib.symengine_wrapper import Expr, oo, Zero, factorial
 from sympy import sympify, I
 from .distribution import Distribution
-from .exceptions import EvaluationException
 from scipy.stats import expon
 
 
@@ -25,12 +24,15 @@ class Exponential(Distribution):
         self.lamb = self.lamb.subs(substitutions)
 
     def sample(self, state):
-        lamb = self.lamb.subs(state)
-        if not lamb.is_Number:
-            raise EvaluationException(
-                f"Parameter {self.lamb} doesn't evaluate to number with state {state}"
-            )
-        return expon.rvs(scale=1 / float(lamb))
+        lamb = self.evaluate_parameter(self.lamb, state)
+        return expon.rvs(scale=1 / lamb)
+
+    def get_parameters(self):
+        return [self.lamb]
+
+    def sample_batch(self, parameters, size, rng):
+        lamb = parameters[0]
+        return rng.exponential(1 / lamb, size)
 
     def get_free_symbols(self):
         return self.lamb.free_symbols
@@ -1,11 +1,9 @@
-from functools import lru_cache
-
-from symengine.lib.symengine_wrapper import Expr, sympy2symengine, oo
+from symengine.lib.symengine_wrapper import Expr, oo
 from .distribution import Distribution
-from .exceptions import EvaluationException
+from .moments import gamma_moment
 from scipy.stats import gamma
-from sympy import sympify, Rational, I
-from sympy.stats import Gamma as GammaDist, E as EV
+from sympy import sympify, I
+from sympy.stats import Gamma as GammaDist
 
 
 class Gamma(Distribution):
@@ -18,12 +16,11 @@ class Gamma(Distribution):
         self.k = parameters[0]
         self.theta = parameters[1]
 
-    @lru_cache()
     def get_moment(self, p: int):
-        k = sympify(self.k)
-        theta = sympify(self.theta)
-        x = GammaDist("x", k, theta)
-        return sympy2symengine(Rational(EV(x**p)))
+        return gamma_moment(self.k, self.theta, int(p))
+
+    def get_random_variable(self):
+        return GammaDist("x", sympify(self.k), sympify(self.theta))
 
     def is_discrete(self):
         return False
@@ -33,13 +30,16 @@ class Gamma(Distribution):
         self.theta = self.theta.subs(substitutions)
 
     def sample(self, state):
-        k = self.k.subs(state)
-        theta = self.theta.subs(state)
-        if not k.is_Number or not theta.is_Number:
-            raise EvaluationException(
-                f"Parameters {self.k}, {self.theta} don't evaluate to numbers with state {state}"
-            )
-        return gamma.rvs(float(k), scale=float(theta))
+        k = self.evaluate_parameter(self.k, state)
+        theta = self.evaluate_parameter(self.theta, state)
+        return gamma.rvs(k, scale=theta)
+
+    def get_parameters(self):
+        return [self.k, self.theta]
+
+    def sample_batch(self, parameters, size, rng):
+        k, theta = parameters
+        return rng.gamma(k, theta, size)
 
     def cf(self, t: Expr):
         theta = sympify(self.theta)
@@ -1,11 +1,9 @@
-from functools import lru_cache
-
-from symengine.lib.symengine_wrapper import Expr, oo, sympy2symengine
+from symengine.lib.symengine_wrapper import Expr, oo
 from .distribution import Distribution
-from .exceptions import EvaluationException
+from .moments import laplace_moment
 from scipy.stats import laplace
-from sympy import Rational, sympify, I, E, Abs
-from sympy.stats import E as EV, Laplace as LaplaceRV
+from sympy import sympify, I, E, Abs
+from sympy.stats import Laplace as LaplaceRV
 
 
 class Laplace(Distribution):
@@ -18,10 +16,11 @@ class Laplace(Distribution):
         self.mu = parameters[0]
         self.b = parameters[1]
 
-    @lru_cache()
     def get_moment(self, k: int):
-        x = LaplaceRV("x", self.mu, self.b)
-        return sympy2symengine(Rational(EV(x**k)))
+        return laplace_moment(self.mu, self.b, int(k))
+
+    def get_random_variable(self):
+        return LaplaceRV("x", sympify(self.mu), sympify(self.b))
 
     def is_discrete(self):
         return False
@@ -31,13 +30,16 @@ class Laplace(Distribution):
         self.b = self.b.subs(substitutions)
 
     def sample(self, state):
-        mu = self.mu.subs(state)
-        b = self.b.subs(state)
-        if not mu.is_Number or not b.is_Number:
-            raise EvaluationException(
-                f"Parameters {self.mu}, {self.b} don't evaluate to numbers with state {state}"
-            )
-        return laplace.rvs(scale=float(b), loc=float(mu))
+        mu = self.evaluate_parameter(self.mu, state)
+        b = self.evaluate_parameter(self.b, state)
+        return laplace.rvs(scale=b, loc=mu)
+
+    def get_parameters(self):
+        return [self.mu, self.b]
+
+    def sample_batch(self, parameters, size, rng):
+        mu, b = parameters
+        return rng.laplace(mu, b, size)
 
     def cf(self, t: Expr):
         mu = sympify(self.mu)
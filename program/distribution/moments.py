@@ -0,0 +1,109 @@
+"""
+Closed forms and recursions for the raw moments E(X^k) of continuous distributions.
+All functions are memoized on the parameters, hence moments are shared between distribution instances
+with equal parameters and computing E(X^k) reuses the moments of lower order.
+"""
+
+from functools import lru_cache
+
+from symengine.lib.symengine_wrapper import (
+    Expr,
+    sympify,
+    sympy2symengine,
+    binomial,
+    factorial,
+    exp,
+    erf,
+    sqrt,
+    pi,
+    one,
+    zero,
+)
+from sympy.stats import E as EV
+
+
+@lru_cache(maxsize=None)
+def normal_moment(mu: Expr, sigma2: Expr, k: int) -> Expr:
+    """
+    E(X^k) for X ~ Normal(mu, sigma2), given by the recursion m_k = mu * m_(k-1) + (k-1) * sigma2 * m_(k-2)
+    of the (probabilists') Hermite polynomials.
+    """
+    if k <= 0:
+        return one
+    if k == 1:
+        return mu
+    return (
+        mu * normal_moment(mu, sigma2, k - 1)
+        + (k - 1) * sigma2 * normal_moment(mu, sigma2, k - 2)
+    ).expand()
+
+
+@lru_cache(maxsize=None)
+def laplace_moment(mu: Expr, b: Expr, k: int) -> Expr:
+    """
+    E(X^k) for X ~ Laplace(mu, b). The central moments are E((X - mu)^j) = j! * b^j for even j and 0 otherwise.
+    """
+    result = zero
+    for j in range(0, k + 1, 2):
+        result += binomial(k, j) * mu ** (k - j) * factorial(j) * b**j
+    return result.expand()
+
+
+@lru_cache(maxsize=None)
+def gamma_moment(shape: Expr, scale: Expr, k: int) -> Expr:
+    """
+    E(X^k) for X ~ Gamma(shape, scale), which is scale^k * shape * (shape + 1) * ... * (shape + k - 1).
+    """
+    if k <= 0:
+        return one
+    return (gamma_moment(shape, scale, k - 1) * scale * (shape + k - 1)).expand()
+
+
+@lru_cache(maxsize=None)
+def beta_moment(a: Expr, b: Expr, k: int) -> Expr:
+    """
+    E(X^k) for X ~ Beta(a, b), which is the product of (a + i) / (a + b + i) for i = 0, ..., k - 1.
+    """
+    if k <= 0:
+        return one
+    return (beta_moment(a, b, k - 1) * (a + k - 1) / (a + b + k - 1)).expand()
+
+
+@lru_cache(maxsize=None)
+def truncated_normal_moment(mu: Expr, sigma2: Expr, a: Expr, b: Expr, k: int) -> Expr:
+    """
+    E(X^k) for X ~ Normal(mu, sigma2) truncated to [a, b], given by the recursion
+    m_k = (k-1) * sigma2 * m_(k-2) + mu * m_(k-1) - sigma * (b^(k-1) * pdf(beta) - a^(k-1) * pdf(alpha)) / Z
+    where alpha, beta are the standardized bounds and Z = cdf(beta) - cdf(alpha).
+    https://people.smp.uq.edu.au/YoniNazarathy/teaching_projects/studentWork/EricOrjebin_TruncatedNormalMoments.pdf
+    """
+    if k <= 0:
+        return one
+    sigma = sqrt(sigma2)
+    alpha = (a - mu) / sigma
+    beta = (b - mu) / sigma
+    normalization = (erf(beta / sqrt(2)) - erf(alpha / sqrt(2))) / 2
+    result = mu * truncated_normal_moment(mu, sigma2, a, b, k - 1)
+    if k >= 2:
+        result += (k - 1) * sigma2 * truncated_normal_moment(mu, sigma2, a, b, k - 2)
+    result -= (
+        sigma
+        * (
+            (b ** (k - 1)) * _std_normal_pdf(beta)
+            - (a ** (k - 1)) * _std_normal_pdf(alpha)
+        )
+        / normalization
+    )
+    return result
+
+
+def _std_normal_pdf(x: Expr) -> Expr:
+    return exp(-(x**2) / 2) / sqrt(2 * pi)
+
+
+def sympy_stats_moment(random_variable, k: int) -> Expr:
+    """
+    E(X^k) for a sympy.stats random variable X computed by symbolic integration.
+    This is slow and only used for distributions without closed-form moments.
+    """
+    return sympify(sympy2symengine(EV(random_variable**k))).expand()
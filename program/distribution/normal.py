@@ -1,12 +1,11 @@
-from functools import lru_cache
-
-from symengine.lib.symengine_wrapper import Expr, oo, sympy2symengine
+from symengine.lib.symengine_wrapper import Expr, oo
 from .distribution import Distribution
-from .exceptions import EvaluationException
+from .moments import normal_moment
 from scipy.stats import norm
-from sympy import sympify, Rational, E, I
-from sympy.stats import Normal as NormalDist, E as EV
+from sympy import sympify, E, I
+from sympy.stats import Normal as NormalDist
 import math
+import numpy as np
 
 
 class Normal(Distribution):
@@ -19,12 +18,13 @@ class Normal(Distribution):
         self.mu = parameters[0]
         self.sigma2 = parameters[1]
 
-    @lru_cache()
     def get_moment(self, k: int):
+        return normal_moment(self.mu, self.sigma2, int(k))
+
+    def get_random_variable(self):
         mu = sympify(self.mu)
         sigma = sympify(f"({self.sigma2}) ** (1/2)")
-        x = NormalDist("x", mu, sigma)
-        return sympy2symengine(Rational(EV(x**k)))
+        return NormalDist("x", mu, sigma)
 
     def is_discrete(self):
         return False
@@ -34,13 +34,16 @@ class Normal(Distribution):
         self.sigma2 = self.sigma2.subs(substitutions)
 
     def sample(self, state):
-        mu = sympify(self.mu.subs(state))
-        sigma2 = sympify(self.sigma2.subs(state))
-        if not mu.is_real or not sigma2.is_real:
-            raise EvaluationException(
-                f"Parameters {self.mu}, {self.sigma2} don't evaluate to numbers with state {state}"
-            )
-        return norm.rvs(loc=float(mu), scale=math.sqrt(float(sigma2)))
+        mu = self.evaluate_parameter(self.mu, state)
+        sigma2 = self.evaluate_parameter(self.sigma2, state)
+        return norm.rvs(loc=mu, scale=math.sqrt(sigma2))
+
+    def get_parameters(self):
+        return [self.mu, self.sigma2]
+
+    def sample_batch(self, parameters, size, rng):
+        mu, sigma2 = parameters
+        return rng.normal(mu, np.sqrt(sigma2), size)
 
     def cf(self, t: Expr):
         mu = sympify(self.mu)
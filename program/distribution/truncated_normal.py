@@ -1,12 +1,12 @@
-from functools import lru_cache
-
-from symengine.lib.symengine_wrapper import Expr, sqrt, sympy2symengine, one, zero
+from symengine.lib.symengine_wrapper import Expr, sqrt, sympy2symengine
 from program.distribution import Distribution
+from program.distribution.moments import truncated_normal_moment
 from program.distribution.exceptions import EvaluationException
 from scipy.stats import truncnorm
 from sympy import sympify, Rational, E, I
-from sympy.stats import Normal, density, cdf
+from sympy.stats import Normal, cdf
 import math
+import numpy as np
 
 
 class TruncNormal(Distribution):
@@ -29,37 +29,20 @@ class TruncNormal(Distribution):
         self.a = parameters[2]
         self.b = parameters[3]
 
-    @lru_cache()
     def get_moment(self, k: int):
-        """
-        Implements the recursive definition of the central moments in:
-        https://people.smp.uq.edu.au/YoniNazarathy/teaching_projects/studentWork/EricOrjebin_TruncatedNormalMoments.pdf
-        """
-        mu = self.mu
-        a = self.a
-        b = self.b
-        sigma = sqrt(self.sigma2)
-        if not all([mu.is_Number, a.is_Number, b.is_Number, sigma.is_Number]):
+        if not all(
+            [
+                self.mu.is_Number,
+                self.a.is_Number,
+                self.b.is_Number,
+                sqrt(self.sigma2).is_Number,
+            ]
+        ):
             raise EvaluationException(
                 "For the truncated normal distributions no symbolic constants are allowed"
             )
-
-        alpha = (a - mu) / sigma
-        beta = (b - mu) / sigma
-        z = Normal("z", 0, 1)
-        z_pdf = lambda x: sympy2symengine(density(z)(sympify(x)))
-        z_cdf = lambda x: sympy2symengine(cdf(z)(sympify(x)))
-        m = {-1: zero, 0: one}
-        for i in range(1, int(k) + 1):
-            m_i = (i - 1) * self.sigma2 * m[i - 2]
-            m_i += mu * m[i - 1]
-            m_i -= (
-                sigma
-                * ((b ** (i - 1)) * z_pdf(beta) - (a ** (i - 1)) * z_pdf(alpha))
-                / (z_cdf(beta) - z_cdf(alpha))
-            )
-            m[i] = m_i
-        return sympy2symengine(Rational(str(float(m[k].simplify()))))
+        moment = truncated_normal_moment(self.mu, self.sigma2, self.a, self.b, int(k))
+        return sympy2symengine(Rational(str(float(moment.n(128, real=True)))))
 
     def mgf(self, t: Expr):
         t = sympify(t)
@@ -94,21 +77,19 @@ class TruncNormal(Distribution):
         self.b = self.b.subs(substitutions)
 
     def sample(self, state):
-        mu = self.mu.subs(state).simplify()
-        sigma2 = self.sigma2.subs(state).simplify()
-        a = self.a.subs(state).simplify()
-        b = self.b.subs(state).simplify()
-        if (
-            not mu.is_Number
-            or not sigma2.is_Number
-            or not a.is_Number
-            or not b.is_Number
-        ):
-            raise EvaluationException(
-                f"Parameters {self.mu}, {self.sigma2}, {self.a}, {self.b} don't evaluate to numbers with state {state}"
-            )
+        mu = self.evaluate_parameter(self.mu, state)
+        sigma2 = self.evaluate_parameter(self.sigma2, state)
+        a = self.evaluate_parameter(self.a, state)
+        b = self.evaluate_parameter(self.b, state)
+        return truncnorm.rvs(a, b, loc=mu, scale=math.sqrt(sigma2))
+
+    def get_parameters(self):
+        return [self.mu, self.sigma2, self.a, self.b]
+
+    def sample_batch(self, parameters, size, rng):
+        mu, sigma2, a, b = parameters
         return truncnorm.rvs(
-            float(a), float(b), loc=float(mu), scale=math.sqrt(float(sigma2))
+            a, b, loc=mu, scale=np.sqrt(sigma2), size=size, random_state=rng
         )
 
     def get_free_symbols(self):
@@ -3,7 +3,6 @@ from functools import lru_cache
 from sympy import sympify, E, I, Piecewise
 from symengine.lib.symengine_wrapper import Expr
 from .distribution import Distribution
-from .exceptions import EvaluationException
 from scipy.stats import uniform
 
 
@@ -35,13 +34,16 @@ class Uniform(Distribution):
         return {(self.a, self.b)}
 
     def sample(self, state):
-        a = sympify(self.a.subs(state))
-        b = sympify(self.b.subs(state))
-        if not a.is_real or not b.is_real:
-            raise EvaluationException(
-                f"Parameters {self.a}, {self.b} don't evaluate to numbers with state {state}"
-            )
-        return uniform.rvs(loc=float(a), scale=float(b) - float(a))
+        a = self.evaluate_parameter(self.a, state)
+        b = self.evaluate_parameter(self.b, state)
+        return uniform.rvs(loc=a, scale=b - a)
+
+    def get_parameters(self):
+        return [self.a, self.b]
+
+    def sample_batch(self, parameters, size, rng):
+        a, b = parameters
+        return rng.uniform(a, b, size)
 
     def cf(self, t: Expr):
         if t == 0:
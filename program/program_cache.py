@@ -0,0 +1,78 @@
+import hashlib
+import os
+import pickle
+from typing import Optional
+
+from .program import Program
+from utils import (
+    get_unique_var_count,
+    reserve_unique_vars,
+    evict_least_recently_used,
+    get_source_fingerprint,
+)
+import settings
+
+# Bump whenever the format of the entries changes
+CACHE_VERSION = 1
+# Sources which the normalized programs depend on
+SOURCE_PACKAGES = ("program", "inputparser", "type_inference", "utils")
+
+
+class NormalizedProgramCache:
+    """
+    A persistent on-disk cache for normalized programs. The key of a program is a hash of its source code
+    together with all settings and a fingerprint of the sources of the parser and the normalization, such that
+    changes to the code invalidate the entries. Every entry is a pickle file containing the normalized program and the number of
+    unique identifiers generated until the program was normalized, such that identifiers introduced by the
+    normalization are not handed out again after the program is restored.
+    If the total size of the cache exceeds the maximum size, the least recently used files are evicted.
+    """
+
+    directory: str
+    max_size: int
+
+    def __init__(self, directory: str, max_size: int):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def source_key(source: str) -> str:
+        program_settings = {
+            k: v for k, v in sorted(vars(settings).items()) if not k.startswith("_")
+        }
+        fingerprint = get_source_fingerprint(*SOURCE_PACKAGES)
+        content = f"{CACHE_VERSION}\n{fingerprint}\n{source}\n{program_settings}"
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def get(self, source: str) -> Optional[Program]:
+        """
+        Returns the normalized program of the given source code or None if it is not cached.
+        """
+        path = self._path(self.source_key(source))
+        try:
+            with open(path, "rb") as file:
+                program, unique_var_count = pickle.load(file)
+        except Exception:
+            # Entries which cannot be read or unpickled are misses
+            return None
+        if not isinstance(program, Program) or not isinstance(unique_var_count, int):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        reserve_unique_vars(unique_var_count)
+        return program
+
+    def put(self, source: str, program: Program):
+        # Write to a temporary file first, such that concurrent readers never see a partial file
+        path = self._path(self.source_key(source))
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump((program, get_unique_var_count()), file)
+        os.replace(tmp_path, path)
+        evict_least_recently_used(self.directory, ".pickle", self.max_size)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".pickle")
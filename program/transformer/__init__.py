@@ -1,3 +1,6 @@
+from typing import Callable, List, Tuple
+
+from .transformer import Transformer
 from .dist_transformer import DistTransformer
 from .if_transformer import IfTransformer
 from .multi_assign_transformer import MultiAssignTransformer
@@ -8,37 +11,55 @@ from .conditions_reducer import ConditionsReducer
 from .conditions_normalizer import ConditionsNormalizer
 from .constants_transformer import ConstantsTransformer
 from .loop_guard_transformer import LoopGuardTransformer
+from .pass_manager import PassManager, PassProfile
 from ..program import Program
 from ..assignment import FunctionalAssignment
 import settings
 
 
-def normalize_program(program: Program) -> Program:
-    # Transform the loop-guard into an if-statement
-    program = LoopGuardTransformer().execute(program)
-    # Transform non-constant distributions parameters
-    program = DistTransformer().execute(program)
-    # Flatten if-statements
-    program = IfTransformer().execute(program)
-    # Make sure every variable has only 1 assignment
-    program = MultiAssignTransformer().execute(program)
-    # Create aliases for expressions in conditions.
-    program = ConditionsReducer().execute(program)
-    # Replace/Add constants in loop body
-    program = ConstantsTransformer().execute(program)
-    # Update program info like variables and symbols
-    program = UpdateInfoTransformer(ignore_unsolvability=True).execute(program)
+def get_normalization_passes() -> List[Tuple[str, Callable[[], Transformer]]]:
+    passes = [
+        # Transform the loop-guard into an if-statement
+        ("LoopGuardTransformer", LoopGuardTransformer),
+        # Transform non-constant distributions parameters
+        ("DistTransformer", DistTransformer),
+        # Flatten if-statements
+        ("IfTransformer", IfTransformer),
+        # Make sure every variable has only 1 assignment
+        ("MultiAssignTransformer", MultiAssignTransformer),
+        # Create aliases for expressions in conditions.
+        ("ConditionsReducer", ConditionsReducer),
+        # Replace/Add constants in loop body
+        ("ConstantsTransformer", ConstantsTransformer),
+        # Update program info like variables and symbols
+        (
+            "UpdateInfoTransformer",
+            lambda: UpdateInfoTransformer(ignore_unsolvability=True),
+        ),
+    ]
     # Infer types for variables
     if not settings.disable_type_inference:
-        program = TypeInferer().execute(program)
-    # Update dependency graph (because finite variables are now detected)
-    program = UpdateInfoTransformer().execute(program)
-    # Turn all conditions into normalized form
-    program = ConditionsNormalizer().execute(program)
+        passes.append(("TypeInferer", TypeInferer))
+    passes += [
+        # Update dependency graph (because finite variables are now detected)
+        ("UpdateInfoTransformer", UpdateInfoTransformer),
+        # Turn all conditions into normalized form
+        ("ConditionsNormalizer", ConditionsNormalizer),
+    ]
     # Convert all conditions to arithmetic
     if settings.cond2arithm:
-        program = ConditionsToArithm().execute(program)
-    # Pass the "exact functional moments" parameter to the FunctionalAssignment class
-    FunctionalAssignment.exact_func_moments = settings.exact_func_moments
+        passes.append(("ConditionsToArithm", ConditionsToArithm))
+    return passes
+
 
+def normalize_program(program: Program, pass_manager: PassManager = None) -> Program:
+    if pass_manager is None:
+        pass_manager = PassManager(get_normalization_passes())
+    program = pass_manager.execute(program)
+    apply_program_settings()
     return program
+
+
+def apply_program_settings():
+    # Pass the "exact functional moments" parameter to the FunctionalAssignment class
+    FunctionalAssignment.exact_func_moments = settings.exact_func_moments
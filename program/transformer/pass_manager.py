@@ -0,0 +1,69 @@
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+from program import Program
+from .transformer import Transformer
+
+
+@dataclass
+class PassProfile:
+    name: str
+    # Wall-clock time of the pass in seconds
+    seconds: float
+    # Peak memory in bytes allocated while the pass ran
+    allocated: int
+
+
+class PassManager:
+    """
+    Runs a sequence of named transformer passes on a program. Every pass is given as a factory such that
+    transformers are created fresh for every program. If profiling is enabled, the wall time and the peak
+    allocation of every pass are recorded in the profiles.
+    """
+
+    passes: List[Tuple[str, Callable[[], Transformer]]]
+    profile: bool
+    profiles: List[PassProfile]
+
+    def __init__(
+        self, passes: List[Tuple[str, Callable[[], Transformer]]], profile=False
+    ):
+        self.passes = passes
+        self.profile = profile
+        self.profiles = []
+
+    def execute(self, program: Program) -> Program:
+        self.profiles = []
+        for name, create_transformer in self.passes:
+            if self.profile:
+                program = self._execute_profiled(name, create_transformer, program)
+            else:
+                program = create_transformer().execute(program)
+        return program
+
+    def _execute_profiled(
+        self, name: str, create_transformer: Callable[[], Transformer], program
+    ):
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        start_memory = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        program = create_transformer().execute(program)
+        seconds = time.perf_counter() - start
+        allocated = tracemalloc.get_traced_memory()[1] - start_memory
+        if not was_tracing:
+            tracemalloc.stop()
+        self.profiles.append(PassProfile(name, seconds, allocated))
+        return program
+
+    def format_profile(self) -> str:
+        lines = [f"{'pass':30} {'time (s)':>10} {'alloc (KiB)':>12}"]
+        for p in self.profiles:
+            lines.append(f"{p.name:30} {p.seconds:10.4f} {p.allocated / 1024:12.1f}")
+        total = sum(p.seconds for p in self.profiles)
+        lines.append(f"{'total':30} {total:10.4f}")
+        return "\n".join(lines)
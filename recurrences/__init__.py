@@ -2,3 +2,6 @@ from .rec_builder import RecBuilder
 from .diff_rec_builder import DiffRecBuilder
 from .recurrences import Recurrences
 from .rec_builder_context import RecBuilderContext
+from .closed_form_cache import ClosedFormCache
+from .iteration_evaluator import IterationEvaluator
+from .numeric_evaluator import NumericIterationEvaluator
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+from typing import Dict, Optional, Tuple
+from sympy import Expr, srepr, sympify
+from program import Program
+from utils import evict_least_recently_used, get_source_fingerprint
+import settings
+
+# Bump whenever the format of the entries changes
+CACHE_VERSION = 1
+# Sources which the closed forms depend on
+SOURCE_PACKAGES = ("recurrences", "program", "sensitivity_analysis", "utils")
+# Settings which change the closed forms, others (like the number of workers) only change how they are computed
+RESULT_SETTINGS = (
+    "transform_categoricals",
+    "cond2arithm",
+    "disable_type_inference",
+    "type_fp_iterations",
+    "numeric_roots",
+    "numeric_croots",
+    "numeric_eps",
+    "trivial_guard",
+    "exact_func_moments",
+)
+
+
+class ClosedFormCache:
+    """
+    A persistent on-disk cache for closed forms of moments. Entries are content-addressed: the key of a program is
+    a hash of the canonical string representation of the normalized program together with the settings changing
+    the results and a
+    fingerprint of the sources computing the closed forms, such that changes to the code invalidate the entries.
+    All entries of a program are stored in a single JSON file containing for every monomial its recurrence,
+    its initial value and its closed form (serialized with srepr). Closed forms of monomials differentiated
+    by a parameter (for sensitivity analysis) are stored under a separate key.
+    New entries are kept in memory and only written by flush, which merges them into the files on disk and
+    evicts the least recently used files if the total size of the cache exceeds the maximum size.
+    """
+
+    directory: str
+    max_size: int
+    _entries: Dict[str, Dict]
+    # The entries added since the last flush by the key of their program
+    _new_entries: Dict[str, Dict]
+
+    def __init__(self, directory: str, max_size: int):
+        self.directory = directory
+        self.max_size = max_size
+        self._entries = {}
+        self._new_entries = {}
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def program_key(program: Program) -> str:
+        program_settings = {k: getattr(settings, k) for k in RESULT_SETTINGS}
+        fingerprint = get_source_fingerprint(*SOURCE_PACKAGES)
+        content = f"{CACHE_VERSION}\n{fingerprint}\n{program}\n{program_settings}"
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    @staticmethod
+    def monomial_key(monomial, parameter=None) -> str:
+        if parameter is None:
+            return str(sympify(monomial))
+        return f"d/d{parameter} {sympify(monomial)}"
+
+    def get(
+        self, program: Program, monomial, parameter=None
+    ) -> Optional[Tuple[Expr, bool]]:
+        """
+        Returns the closed form of the given monomial (differentiated by the parameter if given) and whether it is
+        exact, or None if it is not cached.
+        """
+        key = self.program_key(program)
+        entry = self._load(key).get(self.monomial_key(monomial, parameter))
+        if entry is None:
+            return None
+        self._touch(key)
+        return sympify(entry["closed_form"]), entry["is_exact"]
+
+    def put(
+        self,
+        program: Program,
+        monomial,
+        closed_form: Expr,
+        is_exact: bool,
+        recurrence: Expr,
+        initial_value: Expr,
+        parameter=None,
+    ):
+        key = self.program_key(program)
+        entry = {
+            "recurrence": srepr(sympify(recurrence)),
+            "initial_value": srepr(sympify(initial_value)),
+            "closed_form": srepr(sympify(closed_form)),
+            "is_exact": is_exact,
+        }
+        monomial_key = self.monomial_key(monomial, parameter)
+        self._load(key)[monomial_key] = entry
+        self._new_entries.setdefault(key, {})[monomial_key] = entry
+
+    def flush(self):
+        """
+        Writes all entries added since the last flush. The entries are merged with the current files, such that
+        entries written by other processes in the meantime are kept.
+        """
+        if not self._new_entries:
+            return
+        for key, new_entries in self._new_entries.items():
+            self._entries.pop(key, None)
+            entries = self._load(key)
+            entries.update(new_entries)
+            self._store(key, entries)
+        self._new_entries = {}
+        self._evict()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def _load(self, key: str) -> Dict:
+        if key not in self._entries:
+            try:
+                with open(self._path(key), "r") as file:
+                    self._entries[key] = json.load(file)
+            except (OSError, ValueError):
+                self._entries[key] = {}
+        return self._entries[key]
+
+    def _store(self, key: str, entries: Dict):
+        # Write to a temporary file first, such that concurrent readers never see a partial file
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(entries, file)
+        os.replace(tmp_path, path)
+
+    def _touch(self, key: str):
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        for path in evict_least_recently_used(self.directory, ".json", self.max_size):
+            key = os.path.basename(path)[: -len(".json")]
+            self._entries.pop(key, None)
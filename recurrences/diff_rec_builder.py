@@ -123,7 +123,14 @@ class DiffRecBuilder:
         original_init_val = self.rec_builder.get_initial_value(monomial)
         return original_init_val.diff(self.param)
 
+    def get_solver_key(self, monom: Expr) -> Expr:
+        """
+        Returns the monomial under which the solver of the given monomial is stored, i.e. its derivative.
+        """
+        return sympify(monom) * self.delta
+
     def get_solution(self, monom: Expr, solvers):
         # just lookup the solution
-        solver = solvers[monom * self.delta]
-        return solver.get(monom * self.delta), solver.is_exact
+        key = self.get_solver_key(monom)
+        solver = solvers[key]
+        return solver.get(key), solver.is_exact_for(key)
@@ -0,0 +1,122 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sympy import Expr, Matrix
+from sympy.polys.matrices import DomainMatrix
+
+from .recurrences import Recurrences
+
+
+class IterationEvaluator:
+    """
+    Evaluates the moments of a system of recurrences at concrete iterations without computing closed forms.
+    The moments at iteration n are M^n * v, where M is the recurrence matrix and v the initial values.
+    The powers of M are computed exactly by repeated squaring over the smallest domain containing the entries
+    (e.g. QQ or QQ[p] if the program has symbolic parameters). The squares are kept and shared between
+    all iterations, such that no roots of characteristic polynomials are needed.
+    """
+
+    recurrences: Recurrences
+    matrix: DomainMatrix
+    init_values: DomainMatrix
+    # Contains M^(2^i) at index i
+    squares: List[DomainMatrix]
+
+    def __init__(
+        self, recurrences: Recurrences, parameter_values: Dict[str, Expr] = None
+    ):
+        """
+        Symbolic parameters (and symbolic initial values) can be instantiated by values given by their names.
+        """
+        self.recurrences = recurrences
+        matrix, init_values = self._get_instantiated(parameter_values)
+        matrix = DomainMatrix.from_Matrix(matrix)
+        init_values = DomainMatrix.from_Matrix(Matrix(init_values))
+        self.matrix, self.init_values = matrix.unify(init_values)
+        self.squares = [self.matrix]
+
+    def _get_instantiated(self, parameter_values: Optional[Dict[str, Expr]]):
+        """
+        Returns the recurrence matrix and the initial values where the given parameters are replaced by their values.
+        """
+        matrix = self.recurrences.recurrence_matrix
+        init_values = self.recurrences.init_values_vector
+        if not parameter_values:
+            return matrix, init_values
+        symbols = matrix.free_symbols | init_values.free_symbols
+        replacements = {
+            s: parameter_values[s.name] for s in symbols if s.name in parameter_values
+        }
+        return matrix.xreplace(replacements), init_values.xreplace(replacements)
+
+    def evaluate(
+        self, iterations: Iterable[int]
+    ) -> Iterator[Tuple[int, Dict[Expr, Expr]]]:
+        """
+        Yields the moments of all monomials at the given iterations, which need to be ascending.
+        """
+        for n, values in self._iterate(iterations):
+            yield n, self._to_dict(values)
+
+    def _iterate(self, iterations: Iterable[int]):
+        """
+        Yields the vectors M^n * v for the given iterations. Every iteration is reached from the previous one.
+        If the distance between iterations repeats (e.g. for ranges), the power of M for the distance is
+        computed once from the squares.
+        """
+        current, values = 0, self.init_values
+        step, step_power = None, None
+        for n in iterations:
+            if n < current:
+                raise ValueError("The iterations need to be ascending")
+            distance = n - current
+            if distance == 0:
+                pass
+            elif distance == step:
+                if step_power is None:
+                    step_power = self._get_power(step)
+                values = step_power * values
+            else:
+                step, step_power = distance, None
+                values = self._apply_power(values, distance)
+            current = n
+            yield n, values
+
+    def _get_square(self, i: int) -> DomainMatrix:
+        while i >= len(self.squares):
+            self.squares.append(self.squares[-1] * self.squares[-1])
+        return self.squares[i]
+
+    def _apply_power(self, values: DomainMatrix, exponent: int) -> DomainMatrix:
+        """
+        Returns M^exponent * values by multiplying with the squares given by the binary representation
+        of the exponent.
+        """
+        i = 0
+        while exponent:
+            if exponent & 1:
+                values = self._get_square(i) * values
+            exponent >>= 1
+            i += 1
+        return values
+
+    def _get_power(self, exponent: int) -> DomainMatrix:
+        """
+        Returns M^exponent as the product of the squares given by the binary representation of the exponent.
+        """
+        power = None
+        i = 0
+        while exponent:
+            if exponent & 1:
+                square = self._get_square(i)
+                power = square if power is None else power * square
+            exponent >>= 1
+            i += 1
+        return power
+
+    def _to_dict(self, values: DomainMatrix) -> Dict[Expr, Expr]:
+        domain = values.domain
+        column = values.to_list()
+        return {
+            m: domain.to_sympy(column[i][0])
+            for i, m in enumerate(self.recurrences.monomials)
+        }
@@ -0,0 +1,125 @@
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import mpmath
+import numpy as np
+from sympy import Expr, Float, Matrix, Rational
+
+from .iteration_evaluator import IterationEvaluator
+from .recurrences import Recurrences
+
+
+def parse_numeric_engine(engine: str) -> Optional[int]:
+    """
+    Parses a numeric engine, either "float64" or "mpmath:<digits>".
+    Returns the number of decimal digits for mpmath and None for float64.
+    """
+    if engine == "float64":
+        return None
+    if engine.startswith("mpmath:"):
+        digits = int(engine[len("mpmath:") :])
+        if digits > 0:
+            return digits
+    raise ValueError(f"Unknown numeric engine {engine}")
+
+
+class NumericMatrix:
+    """
+    A dense matrix of floating-point numbers together with entrywise bounds on their absolute errors.
+    The entries are either numpy floats or mpmath numbers with the given number of digits. The errors are
+    always numpy floats and are propagated through products using the standard bound for inner products
+    |fl(AB) - AB| <= k * u / (1 - k * u) * |A||B|, where u is the unit roundoff and k the inner dimension.
+    """
+
+    values: np.ndarray
+    errors: np.ndarray
+    unit_roundoff: float
+    digits: Optional[int]
+
+    def __init__(self, values, errors, unit_roundoff: float, digits: Optional[int]):
+        self.values = values
+        self.errors = errors
+        self.unit_roundoff = unit_roundoff
+        self.digits = digits
+
+    def __mul__(self, other: "NumericMatrix") -> "NumericMatrix":
+        if self.digits is None:
+            values = self.values @ other.values
+        else:
+            with mpmath.workdps(self.digits):
+                values = self.values @ other.values
+        size = self.values.shape[1]
+        gamma = size * self.unit_roundoff / (1 - size * self.unit_roundoff)
+        abs_self = np.abs(self.values).astype(float)
+        abs_other = np.abs(other.values).astype(float)
+        errors = (
+            gamma * (abs_self @ abs_other)
+            + abs_self @ other.errors
+            + self.errors @ (abs_other + other.errors)
+        )
+        return NumericMatrix(values, errors, self.unit_roundoff, self.digits)
+
+
+class NumericIterationEvaluator(IterationEvaluator):
+    """
+    Evaluates the moments of a system of recurrences at concrete iterations with floating-point arithmetic,
+    either with float64 (numpy) or with arbitrary precision (mpmath). Like the exact evaluator, the powers
+    of the recurrence matrix are computed by repeated squaring. Together with the moments, bounds on their
+    rounding errors are computed. The recurrences must not contain symbolic parameters.
+    """
+
+    def __init__(
+        self,
+        recurrences: Recurrences,
+        engine: str,
+        parameter_values: Dict[str, Expr] = None,
+    ):
+        self.recurrences = recurrences
+        self.digits = parse_numeric_engine(engine)
+        if self.digits is None:
+            unit_roundoff = float(np.finfo(np.float64).eps) / 2
+        else:
+            with mpmath.workdps(self.digits):
+                unit_roundoff = float(mpmath.mpf(2) ** -mpmath.mp.prec)
+        matrix, init_values = self._get_instantiated(parameter_values)
+        self.matrix = self._to_numeric(matrix, unit_roundoff)
+        self.init_values = self._to_numeric(init_values, unit_roundoff)
+        self.squares = [self.matrix]
+
+    def _to_numeric(self, matrix, unit_roundoff: float) -> NumericMatrix:
+        entries = [self._to_number(e) for e in Matrix(matrix)]
+        dtype = float if self.digits is None else object
+        values = np.array(entries, dtype=dtype).reshape(matrix.rows, matrix.cols)
+        errors = np.abs(values).astype(float) * unit_roundoff
+        return NumericMatrix(values, errors, unit_roundoff, self.digits)
+
+    def _to_number(self, entry: Expr):
+        if entry.free_symbols:
+            raise ValueError(
+                f"The numeric engine requires values for all parameters, but {entry} contains symbols"
+            )
+        if self.digits is None:
+            return float(entry)
+        with mpmath.workdps(self.digits):
+            if isinstance(entry, Rational):
+                return mpmath.mpf(entry.p) / entry.q
+            return mpmath.mpf(str(entry.evalf(self.digits + 5)))
+
+    def evaluate_with_errors(
+        self, iterations: Iterable[int]
+    ) -> Iterator[Tuple[int, Dict[Expr, Float], Dict[Expr, float]]]:
+        """
+        Yields the moments of all monomials at the given iterations together with bounds on their errors.
+        """
+        for n, values in self._iterate(iterations):
+            errors = {
+                m: float(values.errors[i, 0])
+                for i, m in enumerate(self.recurrences.monomials)
+            }
+            yield n, self._to_dict(values), errors
+
+    def _to_dict(self, values: NumericMatrix) -> Dict[Expr, Float]:
+        digits = 15 if self.digits is None else self.digits
+        return {
+            m: Float(values.values[i, 0], digits)
+            for i, m in enumerate(self.recurrences.monomials)
+        }
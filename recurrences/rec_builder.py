@@ -1,26 +1,66 @@
 from functools import lru_cache
-from math import prod
-from typing import Set, List
-from symengine.lib.symengine_wrapper import Expr, Symbol, sympify, One, Zero
+from typing import Set, List, Dict, Iterable, Optional, Tuple
+from symengine.lib.symengine_wrapper import Expr, Symbol, sympify, One, Zero, Add, Mul
 from program import Program
 from program.assignment import Assignment
+from program.condition.exceptions import ArithmConversionException
 from program.type import Finite
 from .recurrences import Recurrences
 from .rec_builder_context import RecBuilderContext
-from utils import get_terms_with_var, get_terms_with_vars, get_monoms
+from utils import SparsePoly
 
 
 class RecBuilder:
     """
     This class provides the functionality to construct the recurrences (of expected values) of monomials and
     polynomials of program variables.
+    Intermediate results are sparse polynomials in the program variables, such that monomials can be split
+    by their exponent vectors.
     """
 
     program: Program
     context: RecBuilderContext
+    recurrence_cache: Dict[Expr, Expr]
+    recurrence_poly_cache: Dict[Expr, SparsePoly]
+    arithm_conditions: Dict[Assignment, Expr]
+    # The program variables and all finite-valued symbols
+    variables: List[Symbol]
+    var_to_index: Dict[Symbol, int]
+    symbol_indices: List[int]
+    # Maps the index of a finite variable and a power to the reduced power as pairs (power, coefficient)
+    reduced_powers: Dict[Tuple[int, int], Optional[List[Tuple[int, Expr]]]]
 
     def __init__(self, program: Program):
         self.program = program
+        self.recurrence_cache = {}
+        self.recurrence_poly_cache = {}
+        # Finite-valued symbols are treated like variables, such that their powers can be reduced
+        self.variables = sorted(
+            program.variables.union(program.finite_variables), key=str
+        )
+        self.var_to_index = {v: i for i, v in enumerate(self.variables)}
+        self.symbol_indices = [
+            i for i, v in enumerate(self.variables) if v in program.symbols
+        ]
+        self.reduced_powers = {}
+        self._init_arithm_conditions()
+
+    def _init_arithm_conditions(self):
+        """
+        Converts the conditions of all assignments in the loop body to arithmetic once.
+        Conditions which cannot be converted are skipped, such that the error is only raised if they are needed.
+        """
+        self.arithm_conditions = {}
+        for assign in self.program.loop_body:
+            try:
+                self.arithm_conditions[assign] = assign.condition.to_arithm(
+                    self.program
+                )
+            except ArithmConversionException:
+                pass
+
+    def _to_poly(self, expr: Expr) -> SparsePoly:
+        return SparsePoly.from_expr(expr, self.variables, self.var_to_index)
 
     @lru_cache(maxsize=None)
     def get_recurrences(self, monomial: Expr) -> Recurrences:
@@ -28,22 +68,35 @@ class RecBuilder:
         Constructs a complete system of linear recurrences (over expected values) completely describing
         the expected value of "monomial".
         """
-        monomial = sympify(monomial)
-        to_process = {monomial}
-        processed = set()
+        return self.get_recurrences_batch([monomial])
+
+    def get_recurrences_batch(
+        self, monomials: Iterable[Expr], known: Optional[Recurrences] = None
+    ) -> Recurrences:
+        """
+        Constructs a single system of linear recurrences completely describing the expected values of all
+        given monomials. The monomials are processed in frontiers, where all monomials newly occurring in the
+        recurrences of one frontier form the next frontier.
+        If a known system of recurrences is given, the result extends it. Only the recurrences of monomials
+        not in the known system are constructed.
+        """
+        known_dict = {} if known is None else known.recurrence_dict
+        known_monomials = {sympify(m) for m in known_dict}
+        frontier = {sympify(m) for m in monomials} - known_monomials
         recurrence_dict = {}
-        while to_process:
-            next_monom = to_process.pop()
-            recurrence_dict[next_monom] = self.get_recurrence(next_monom)
-            processed.add(next_monom)
-            monoms = get_monoms(
-                recurrence_dict[next_monom], constant_symbols=self.program.symbols
-            )
-            for _, monom in monoms:
-                if monom not in processed:
-                    to_process.add(monom)
+        while frontier:
+            recurrences = self.get_recurrence_batch(frontier)
+            recurrence_dict.update(recurrences)
+            frontier = set()
+            for monom in recurrences:
+                for m in self.recurrence_poly_cache[monom].get_monomials():
+                    if m not in recurrence_dict and m not in known_monomials:
+                        frontier.add(m)
 
-        init_values_dict = self.get_initial_values(processed)
+        init_values_dict = self.get_initial_values(set(recurrence_dict.keys()))
+        if known is not None:
+            recurrence_dict = {**known.recurrence_dict, **recurrence_dict}
+            init_values_dict = {**known.init_values_dict, **init_values_dict}
         return Recurrences(recurrence_dict, init_values_dict, self.program)
 
     def get_recurrence_poly(self, poly: Expr, variables: List[Symbol]):
@@ -52,46 +105,157 @@ class RecBuilder:
         moment recurrence for the polynomial is the sum of the moment recurrences of the individual moment
         recurrences of the monomials (by linearity of expectation).
         """
-        monoms = get_terms_with_vars(poly, variables)
-        monoms, constant = monoms[0], monoms[1]
-        index_to_vars = {i: var for i, var in enumerate(variables)}
-        poly_rec = constant
-        for monom, coeff in monoms:
-            term = One()
-            for i in range(len(monom)):
-                term *= index_to_vars[i] ** monom[i]
-            poly_rec += coeff * self.get_recurrence(term)
+        sparse_poly = SparsePoly.from_expr(poly, variables)
+        poly_rec = Zero()
+        for exponents, coeff in sparse_poly.items():
+            if any(exponents):
+                monomial = sparse_poly.get_monomial(exponents)
+                poly_rec += coeff * self.get_recurrence(monomial)
+            else:
+                poly_rec += coeff
         return poly_rec.expand()
 
-    @lru_cache(maxsize=None)
     def get_recurrence(self, monomial: Expr):
         """
-        Constructs a single recurrence (the moment recurrence) for a given monomial, by bottom up substitution,
-        and reducing the powers of finite-valued variables.
+        Constructs a single recurrence (the moment recurrence) for a given monomial.
         """
+        monomial = sympify(monomial)
+        return self.get_recurrence_batch([monomial])[monomial]
+
+    def get_recurrence_batch(self, monomials: Iterable[Expr]) -> Dict[Expr, Expr]:
+        """
+        Constructs the recurrences for multiple monomials at once, by bottom up substitution and reducing the
+        powers of finite-valued variables. All monomials are pushed through the loop body together, such that
+        the moments of sub-monomials they have in common are only computed once per assignment. To separate
+        the recurrences again, every monomial is multiplied by its own tag symbol, which acts as a constant.
+        """
+        result = {}
+        tags = {}
+        for monomial in monomials:
+            if monomial in self.recurrence_cache:
+                result[monomial] = self.recurrence_cache[monomial]
+            else:
+                self._check_symbols(monomial)
+                tags[Symbol(f"_tag{len(tags)}")] = monomial
+        if not tags:
+            return result
+
         self.context = RecBuilderContext()
-        right_side = monomial
-        last_assign_index = self._get_last_assign_index(monomial.free_symbols)
+        right_side = self._to_poly(Add(*[t * m for t, m in tags.items()]))
+        last_assign_index = self._get_last_assign_index(
+            right_side.get_support().difference(self.program.symbols)
+        )
         for i in reversed(range(last_assign_index + 1)):
             assignment = self.program.loop_body[i]
             if self._assign_replace_is_necessary(assignment, right_side):
-                right_side = right_side.expand()
-                right_side = self._replace_assign(right_side, assignment).expand()
+                right_side = self._replace_assign(right_side, assignment)
                 right_side = self._reduce_powers(right_side)
 
-        right_side = self._reduce_powers(right_side)
-        return right_side.simplify().expand()
+        right_side = self._symbols_to_coefficients(self._reduce_powers(right_side))
+        parts = self._split_by_tags(right_side, tags.keys())
+        for tag, monomial in tags.items():
+            part = parts.get(tag, right_side.new())
+            recurrence = part.as_expr()
+            if not self._is_polynomial(recurrence):
+                recurrence = recurrence.simplify().expand()
+                part = self._symbols_to_coefficients(self._to_poly(recurrence))
+            self.recurrence_cache[monomial] = recurrence
+            self.recurrence_poly_cache[monomial] = part
+            result[monomial] = recurrence
+        return result
 
-    def _assign_replace_is_necessary(self, assign: Assignment, poly: Expr):
+    def _check_symbols(self, monomial: Expr):
+        """
+        Raises an error if the monomial contains symbols which are neither variables nor symbolic constants of
+        the program, as they would otherwise be treated as constants.
+        """
+        unknown = {
+            s
+            for s in monomial.free_symbols
+            if s not in self.var_to_index and s not in self.program.symbols
+        }
+        if unknown:
+            names = ", ".join(sorted(str(s) for s in unknown))
+            raise ValueError(
+                f"{monomial} contains symbols which are not variables of the program: {names}"
+            )
+
+    def _symbols_to_coefficients(self, poly: SparsePoly) -> SparsePoly:
+        """
+        Moves the powers of finite-valued symbols to the coefficients, such that the exponent vectors only
+        contain powers of program variables.
+        """
+        if not poly.get_support().intersection(self.program.symbols):
+            return poly
+        result = poly.new()
+        for exponents, coeff in poly.items():
+            symbols_part = Mul(
+                *[self.variables[i] ** exponents[i] for i in self.symbol_indices]
+            )
+            exponents = list(exponents)
+            for i in self.symbol_indices:
+                exponents[i] = 0
+            terms = coeff.args if coeff.is_Add else [coeff]
+            result.add_term(tuple(exponents), Add(*[t * symbols_part for t in terms]))
+        return result
+
+    @staticmethod
+    def _split_by_tags(
+        poly: SparsePoly, tags: Iterable[Symbol]
+    ) -> Dict[Symbol, SparsePoly]:
+        """
+        For a polynomial with coefficients linear in the given tags returns a map from every tag to its coefficient.
+        """
+        tags = set(tags)
+        parts = {}
+        for exponents, coeff in poly.items():
+            for term in coeff.args if coeff.is_Add else [coeff]:
+                factors = term.args if term.is_Mul else [term]
+                tag = None
+                rest = One()
+                for factor in factors:
+                    if factor in tags:
+                        tag = factor
+                    else:
+                        rest *= factor
+                if tag not in parts:
+                    parts[tag] = poly.new()
+                parts[tag].add_term(exponents, rest)
+        return parts
+
+    @staticmethod
+    def _is_polynomial(poly: Expr):
+        """
+        Returns true iff the expanded expression is a polynomial with numeric coefficients.
+        Such expressions are already in normal form and do not need to be simplified.
+        """
+        terms = poly.args if poly.is_Add else [poly]
+        for term in terms:
+            factors = term.args if term.is_Mul else [term]
+            for factor in factors:
+                if factor.is_Number or factor.is_Symbol:
+                    continue
+                if (
+                    factor.is_Pow
+                    and factor.args[0].is_Symbol
+                    and factor.args[1].is_Integer
+                    and factor.args[1] > 0
+                ):
+                    continue
+                return False
+        return True
+
+    def _assign_replace_is_necessary(self, assign: Assignment, poly: SparsePoly):
         """
         Returns true iff assign needs to be considered when constructing a moment recurrence.
         The argument "poly" is the intermediate result of constructing a moment recurrence.
         """
-        if assign.variable in poly.free_symbols:
+        support = poly.get_support()
+        if assign.variable in support:
             return True
         if assign.variable not in self.context.triggers:
             return False
-        return bool(self.context.triggers[assign.variable] & poly.free_symbols)
+        return bool(self.context.triggers[assign.variable] & support)
 
     def _get_last_assign_index(self, variables: Set[Symbol]):
         """
@@ -103,52 +267,99 @@ class RecBuilder:
                 max_index = self.program.var_to_index[v]
         return max_index
 
-    def _replace_assign(self, poly: Expr, assign: Assignment):
+    def _replace_assign(self, poly: SparsePoly, assign: Assignment) -> SparsePoly:
         """
         Intuitively, the method returns the expected value of "poly" after executing assign.
         You can also think of the result as wp(assign, poly) (where wp is the weakest pre-expectation).
         The concrete operation very much depends on the type of the assignment.
         Hence, the method goes through all relevant monomials of poly and hands them to the assignment object.
         """
-        cond = assign.condition.to_arithm(self.program)
-        # if poly doesn't contain triggers of assign.variables, we only need to worry about assign.variable itself
-        if not self.context.var_has_triggers_in_expr(assign.variable, poly):
-            terms_with_var, rest_without_var = get_terms_with_var(poly, assign.variable)
-            result = rest_without_var
-            for var_power, rest in terms_with_var:
-                result += assign.get_moment(var_power, self.context, cond, rest)
-            return result
+        cond = self.arithm_conditions.get(assign)
+        if cond is None:
+            cond = assign.condition.to_arithm(self.program)
+        index = self.var_to_index[assign.variable]
+        triggers = self.context.triggers.get(assign.variable, set())
+        triggers = [self.var_to_index[t] for t in triggers & poly.get_support()]
+        result = poly.new()
+        moments = []
+        # if poly doesn't contain triggers of assign.variable, we only need to worry about assign.variable itself
+        if not triggers:
+            # the moments are linear in the rest, hence all terms with the same power of the variable are combined
+            rests = {}
+            for exponents, coeff in poly.items():
+                var_power = exponents[index]
+                if var_power == 0:
+                    result.add_term(exponents, coeff)
+                    continue
+                exponents = exponents[:index] + (0,) + exponents[index + 1 :]
+                rest = poly.get_monomial(exponents)
+                rests.setdefault(var_power, []).extend(
+                    c * rest for c in (coeff.args if coeff.is_Add else [coeff])
+                )
+            for var_power, rest in rests.items():
+                moments.append(
+                    assign.get_moment(var_power, self.context, cond, Add(*rest))
+                )
         # if poly contains triggers of assign.variable, we need to consider all monomials contain assign.variable
-        # or any trigger variables.
+        # or any trigger variables, as every monomial needs to be handled individually.
         else:
-            triggers = list(self.context.triggers[assign.variable])
-            variables = [assign.variable] + triggers
-            terms_with_vars, rest_without_vars = get_terms_with_vars(poly, variables)
-            result = rest_without_vars
-            for var_powers, rest in terms_with_vars:
-                var_power = var_powers[0]
-                trigger_monom = prod([v**p for v, p in zip(triggers, var_powers[1:])])
-                result += assign.get_moment(
-                    var_power, self.context, cond, trigger_monom * rest
+            for exponents, coeff in poly.items():
+                var_power = exponents[index]
+                if var_power == 0 and not any(exponents[t] for t in triggers):
+                    result.add_term(exponents, coeff)
+                    continue
+                exponents = exponents[:index] + (0,) + exponents[index + 1 :]
+                rest = poly.get_monomial(exponents)
+                rest = Add(
+                    *[c * rest for c in (coeff.args if coeff.is_Add else [coeff])]
                 )
-            return result
+                moments.append(assign.get_moment(var_power, self.context, cond, rest))
+        for moment in moments:
+            result.add_expr(moment.expand())
+        return result
 
-    def _reduce_powers(self, poly: Expr):
+    def _get_reduced_power(self, index: int, power: int):
         """
-        Reduces the power of finite-valued variables in a given expression.
+        Returns the reduced power of the finite variable with the given index as pairs (power, coefficient)
+        or None if the power cannot be reduced.
         """
-        terms_with_vars, rest_without_vars = get_terms_with_vars(
-            poly, self.program.finite_variables
-        )
-        finite_types: List[Finite] = [
-            self.program.get_type(v) for v in self.program.finite_variables
+        key = (index, power)
+        if key not in self.reduced_powers:
+            variable = self.variables[index]
+            finite_type: Finite = self.program.get_type(variable)
+            reduced = sympify(finite_type.reduce_power(power)).expand()
+            reduced = SparsePoly.from_expr(reduced, [variable])
+            if list(reduced.items()) == [((power,), 1)]:
+                self.reduced_powers[key] = None
+            else:
+                self.reduced_powers[key] = [(e[0], c) for e, c in reduced.items()]
+        return self.reduced_powers[key]
+
+    def _reduce_powers(self, poly: SparsePoly) -> SparsePoly:
+        """
+        Reduces the power of finite-valued variables in a given polynomial.
+        """
+        finite_indices = [
+            self.var_to_index[v]
+            for v in self.program.finite_variables
+            if v in self.var_to_index
         ]
-        result = rest_without_vars
-        for var_powers, rest in terms_with_vars:
-            term = rest
-            for i in range(len(var_powers)):
-                term *= finite_types[i].reduce_power(var_powers[i])
-            result += term.expand()
+        result = poly.new()
+        for exponents, coeff in poly.items():
+            terms = [(exponents, coeff)]
+            for index in finite_indices:
+                if exponents[index] == 0:
+                    continue
+                reduced = self._get_reduced_power(index, exponents[index])
+                if reduced is None:
+                    continue
+                terms = [
+                    (e[:index] + (power,) + e[index + 1 :], (c * rc).expand())
+                    for e, c in terms
+                    for power, rc in reduced
+                ]
+            for e, c in terms:
+                result.add_term(e, c)
         return result
 
     def get_initial_value(self, monom: Expr):
@@ -157,12 +368,12 @@ class RecBuilder:
         assignments block.
         """
         self.context = RecBuilderContext()
-        result = monom
+        result = self._to_poly(monom)
         for assign in reversed(self.program.initial):
             if self._assign_replace_is_necessary(assign, result):
                 result = self._replace_assign(result, assign)
-                result = result.expand()
 
+        result = result.as_expr()
         for sym in monom.free_symbols.difference(self.program.symbols):
             result = result.xreplace({sym: Symbol(f"{sym}0")})
 
@@ -172,15 +383,14 @@ class RecBuilder:
         """
         Constructs a single initial value for the moment recurrence of a given polynomial.
         """
-        monoms = get_terms_with_vars(poly, variables)
-        monoms, constant = monoms[0], monoms[1]
-        index_to_vars = {i: var for i, var in enumerate(variables)}
-        value = constant
-        for monom, coeff in monoms:
-            term = One()
-            for i in range(len(monom)):
-                term *= index_to_vars[i] ** monom[i]
-            value += coeff * self.get_initial_value(term)
+        sparse_poly = SparsePoly.from_expr(poly, variables)
+        value = Zero()
+        for exponents, coeff in sparse_poly.items():
+            if any(exponents):
+                monomial = sparse_poly.get_monomial(exponents)
+                value += coeff * self.get_initial_value(monomial)
+            else:
+                value += coeff
         return value.expand()
 
     def get_initial_values(self, monomials: Set[Expr]):
@@ -192,7 +402,13 @@ class RecBuilder:
             result[monom] = self.get_initial_value(monom)
         return result
 
+    def get_solver_key(self, monom: Expr) -> Expr:
+        """
+        Returns the monomial under which the solver of the given monomial is stored.
+        """
+        return sympify(monom)
+
     def get_solution(self, monom: Expr, solvers):
         # just lookup the solution
         solver = solvers[monom]
-        return solver.get(monom), solver.is_exact
+        return solver.get(monom), solver.is_exact_for(monom)
@@ -1,5 +1,5 @@
 from typing import Set, Dict, TYPE_CHECKING
-from symengine.lib.symengine_wrapper import Symbol, Expr
+from symengine.lib.symengine_wrapper import Symbol
 
 if TYPE_CHECKING:
     from program.assignment import FunctionalAssignment
@@ -40,8 +40,3 @@ class RecBuilderContext:
             self.dist_var_dependent_func_vars[fassign.argument].add(fassign.variable)
         else:
             self.dist_var_dependent_func_vars[fassign.argument] = {fassign.variable}
-
-    def var_has_triggers_in_expr(self, variable: Symbol, poly: Expr):
-        if variable not in self.triggers:
-            return False
-        return bool(self.triggers[variable] & poly.free_symbols)
@@ -1,25 +1,28 @@
 from typing import Dict, List, Set
 
-from sympy import sympify, Expr, Matrix, Symbol
+from sympy import sympify, Expr, Matrix, SparseMatrix, Symbol
 
 from program import Program
-from utils import get_monoms
-import copy
+from utils import SparsePoly, strongly_connected_components
 
 
 class Recurrences:
     """
-    Class for storing a system of recurrences. The class uses (and converts everything to) sympy
+    Class for storing a system of recurrences. The class uses (and converts everything to) sympy.
+    The recurrence matrix is a sparse sympy matrix, use Matrix(recurrence_matrix) if a dense one is needed.
     """
 
     program: Program
     recurrence_dict: Dict[Expr, Expr]
     init_values_dict: Dict[Expr, Expr]
-    recurrence_matrix: Matrix
+    recurrence_rows: List[Dict[int, Expr]]
+    recurrence_matrix: SparseMatrix
     init_values_vector: Matrix
     monomials: List[Expr]
     dependencies: Dict[Expr, Set[Expr]]
     is_acyclic: bool
+    blocks: List[List[Expr]]
+    topological_order: List[Expr]
     is_inhomogeneous = False
     constant_symbols: List[Symbol]
 
@@ -48,58 +51,101 @@ class Recurrences:
 
     def _init_data(self):
         """
-        Initializes the recurrence matrix as well as the initial value vector
+        Initializes the recurrence matrix as well as the initial value vector.
+        The recurrence matrix is sparse, as every recurrence only depends on few monomials.
+        It is stored row-wise in recurrence_rows mapping column indices to nonzero coefficients.
         """
-        coefficients = []
-        default = {w: sympify(0) for w in self.monomials}
+        constant_symbols = {sympify(s) for s in self.constant_symbols}
+        variables = sorted(
+            {s for m in self.monomials for s in m.free_symbols} - constant_symbols,
+            key=str,
+        )
+        var_to_index = {v: i for i, v in enumerate(variables)}
+        exponents_to_index = {}
+        for i, m in enumerate(self.monomials):
+            monom_poly = SparsePoly.from_expr(m, variables, var_to_index, sympify(1))
+            exponents_to_index[next(iter(monom_poly.terms))] = i
+        constant_index = len(self.monomials)
+        rows = []
         for v in self.monomials:
             # Every monomial is described by one recurrence relation depending on other monomial
             # So in every row we collect the dependency coefficients
-            current_coeffs = default.copy()
-            monoms = get_monoms(
-                self.recurrence_dict[v],
-                constant_symbols={sympify(s) for s in self.constant_symbols},
-                with_constant=True,
-                zero=sympify(0),
-                one=sympify(1),
+            poly = SparsePoly.from_expr(
+                self.recurrence_dict[v], variables, var_to_index, sympify(1)
             )
             self.dependencies[v] = set()
-            for coeff, monom in monoms:
-                # one monom might appear multiple times in monoms
-                if monom == 1:
-                    current_coeffs[monom] = coeff
+            row = {}
+            for exponents, coeff in poly.items():
+                if not any(exponents):
+                    index = constant_index
                     self.is_inhomogeneous = True
                 else:
-                    if monom != v:
-                        self.dependencies[v].add(monom)
-                    current_coeffs[monom] += coeff
-            coefficients.append([c.expand() for c in current_coeffs.values()])
+                    index = exponents_to_index[exponents]
+                    if self.monomials[index] != v:
+                        self.dependencies[v].add(self.monomials[index])
+                coeff = coeff.expand()
+                if coeff != 0:
+                    row[index] = coeff
+            rows.append(row)
 
         initial_values = [self.init_values_dict[v] for v in self.monomials]
 
-        # If the system is inhomogeneous (constant inhomogeneous part). Then we need to fill
-        # up those recurrence coefficients which are homogeneous with "0".
+        # If the system is inhomogeneous (constant inhomogeneous part), the constant 1 is added
+        # as an additional monomial satisfying the recurrence 1 = 1.
+        size = len(self.monomials)
         if self.is_inhomogeneous:
             initial_values.append(sympify(1))
-            for cs in coefficients:
-                if len(cs) == len(self.monomials):
-                    cs.append(sympify(0))
-            coefficients.append([sympify(0) for _ in self.monomials] + [sympify(1)])
+            rows.append({constant_index: sympify(1)})
+            size += 1
 
+        self.recurrence_rows = rows
         self.init_values_vector = Matrix(initial_values)
-        self.recurrence_matrix = Matrix(coefficients)
+        self.recurrence_matrix = SparseMatrix(
+            size,
+            size,
+            {(i, j): c for i, row in enumerate(rows) for j, c in row.items()},
+        )
 
     def _init_is_acyclic(self):
-        self.is_acyclic = True
-        dependencies = copy.deepcopy(self.dependencies)
-        while dependencies.keys():
-            for v, ds in dependencies.items():
-                if not ds:
-                    next_var = v
-                    break
-            else:
-                self.is_acyclic = False
-                break
-            dependencies.pop(next_var)
-            for _, ds in dependencies.items():
-                ds.discard(next_var)
+        """
+        Computes the strongly connected components of the dependency graph in topological order in linear time.
+        The system is acyclic if and only if every component consists of a single monomial.
+        """
+        self.blocks = strongly_connected_components(
+            self.monomials, lambda m: self.dependencies[m]
+        )
+        self.is_acyclic = all(len(block) == 1 for block in self.blocks)
+        self.topological_order = [m for block in self.blocks for m in block]
+
+    def get_blocks(self) -> List[List[Expr]]:
+        """
+        Returns the strongly connected components of the dependency graph of the monomials.
+        A block only depends on itself and on blocks occurring before it in the list.
+        """
+        return self.blocks
+
+    def get_closure(self, monomials) -> Set[Expr]:
+        """
+        Returns all monomials the given monomials (transitively) depend on, including themselves.
+        """
+        closure = set(monomials)
+        to_process = list(closure)
+        while to_process:
+            for d in self.dependencies[to_process.pop()]:
+                if d not in closure:
+                    closure.add(d)
+                    to_process.append(d)
+        return closure
+
+    def get_sub_recurrences(self, monomials) -> "Recurrences":
+        """
+        Returns the system of recurrences restricted to the given monomials, which need to be closed
+        under dependencies.
+        """
+        monomials = [m for m in self.monomials if m in set(monomials)]
+        return Recurrences(
+            {m: self.recurrence_dict[m] for m in monomials},
+            {m: self.init_values_dict[m] for m in monomials},
+            self.program,
+            self.constant_symbols,
+        )
@@ -1,6 +1,7 @@
 from functools import lru_cache
+from typing import Dict
 
-from sympy import sympify, symbols, summation, Piecewise
+from sympy import sympify, symbols, summation, Piecewise, Expr
 
 from .solver import Solver
 from recurrences import Recurrences
@@ -8,10 +9,21 @@ from utils import without_piecewise
 
 
 class AcyclicSolver(Solver):
+    """
+    Solves an acyclic system of recurrences by summation. The monomials are solved iteratively
+    in the topological order of the recurrences such that the solutions of all dependencies are known.
+    """
+
     recurrences: Recurrences
+    solutions: Dict[Expr, Expr]
 
-    def __init__(self, recurrences: Recurrences):
+    def __init__(self, recurrences: Recurrences, solutions: Dict[Expr, Expr] = None):
+        """
+        Solutions (for n >= 1) of monomials which are already known, for instance from a solver of a subsystem,
+        can be passed and are not computed again.
+        """
         self.recurrences = recurrences
+        self.solutions = {} if solutions is None else dict(solutions)
         self.monom_to_index = {
             m: i
             for m, i in zip(recurrences.monomials, range(len(recurrences.monomials)))
@@ -33,31 +45,38 @@ class AcyclicSolver(Solver):
         )
         return solution
 
-    @lru_cache(maxsize=None)
     def _get_without_zero(self, monomial):
+        """
+        Returns the solution for n >= 1 after solving all monomials the given one depends on.
+        """
         monomial = sympify(monomial)
+        if monomial not in self.solutions:
+            closure = self.recurrences.get_closure([monomial])
+            for m in self.recurrences.topological_order:
+                if m in closure and m not in self.solutions:
+                    self.solutions[m] = self._solve(m)
+        return self.solutions[monomial]
+
+    def _solve(self, monomial):
         monom_index = self.monom_to_index[monomial]
         rec_coeff = sympify(0)
         inhom_part = sympify(0)
-        for i in range(len(self.recurrences.monomials)):
-            coeff = self.recurrences.recurrence_matrix[monom_index, i]
-            if coeff == 0:
-                continue
+        row = self.recurrences.recurrence_rows[monom_index]
+        for i, coeff in row.items():
             if i == monom_index:
                 rec_coeff = coeff
-                continue
-            sol = self._get_without_zero(self.recurrences.monomials[i])
-            inhom_part += coeff * sol
-        if self.recurrences.is_inhomogeneous:
-            inhom_part += self.recurrences.recurrence_matrix[monom_index, -1]
+            elif i == len(self.recurrences.monomials):
+                inhom_part += coeff
+            else:
+                sol = self.solutions[self.recurrences.monomials[i]]
+                inhom_part += coeff * sol
 
         inhom_part = inhom_part.expand()
         if rec_coeff == 0:
             return inhom_part.xreplace({self.n: self.n - 1}).simplify()
 
-        first_value = (
-            self.recurrences.recurrence_matrix * self.recurrences.init_values_vector
-        )[monom_index]
+        init_values = self.recurrences.init_values_vector
+        first_value = sum(coeff * init_values[i] for i, coeff in row.items())
         return self._solve_rec_by_summing(rec_coeff, first_value, inhom_part)
 
     @lru_cache(maxsize=None)
@@ -0,0 +1,176 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sympy import Expr, Matrix, sympify
+
+from .solver import Solver
+from .acyclic_solver import AcyclicSolver
+from .cyclic_solver import CyclicSolver
+from recurrences import Recurrences
+from recurrences.exceptions import SolverException
+from utils import get_all_roots, charpoly
+import settings
+
+Roots = List[Tuple[Expr, int]]
+
+
+def compute_block_roots(
+    matrix: Matrix,
+    numeric_roots: bool,
+    numeric_croots: bool,
+    numeric_eps: float,
+    charpoly_backend: str,
+) -> Tuple[Roots, bool]:
+    """
+    Computes the roots of the characteristic polynomial of the recurrence matrix of a single block.
+    """
+    if matrix.rows == 1:
+        return [(matrix[0, 0], 1)], True
+    poly = charpoly(matrix, charpoly_backend)
+    return get_all_roots(poly, numeric_roots, numeric_croots, numeric_eps)
+
+
+class BlockSolver(Solver):
+    """
+    Solves a system of recurrences by decomposing it into the strongly connected components of its dependency graph.
+    As the recurrence matrix is block-triangular with respect to the components, the characteristic polynomial
+    of the whole system is the product of the characteristic polynomials of the blocks. Hence, the roots are computed
+    per block, possibly in parallel, and a monomial is solved in the subsystem of the monomials it depends on.
+    Acyclic subsystems are solved by summation, cyclic ones using the roots of their blocks.
+    If the recurrences extend the ones of a base solver, the monomials of the base are solved by it and
+    only the roots of new blocks are computed.
+    """
+
+    recurrences: Recurrences
+    blocks: List[List[Expr]]
+    block_of: Dict[Expr, int]
+    block_roots: List[Tuple[Roots, bool]]
+    base: Optional[Solver]
+    # Maps the monomials of the base to the solver which solved them, to avoid chains of extended solvers
+    base_solvers: Dict[Expr, Solver]
+
+    def __init__(
+        self,
+        recurrences: Recurrences,
+        numeric_roots: bool = None,
+        numeric_croots: bool = None,
+        numeric_eps: float = None,
+        base: Solver = None,
+    ):
+        self.recurrences = recurrences
+        self.base = base
+        self.base_solvers = {}
+        if isinstance(base, BlockSolver):
+            self.base_solvers.update(base.base_solvers)
+        if base is not None:
+            for m in base.recurrences.monomials:
+                self.base_solvers.setdefault(m, base)
+        self.numeric_roots = (
+            settings.numeric_roots if numeric_roots is None else numeric_roots
+        )
+        self.numeric_croots = (
+            settings.numeric_croots if numeric_croots is None else numeric_croots
+        )
+        self.numeric_eps = settings.numeric_eps if numeric_eps is None else numeric_eps
+        self.blocks = recurrences.get_blocks()
+        self.block_of = {m: i for i, block in enumerate(self.blocks) for m in block}
+        self._compute_block_roots()
+
+    def _compute_block_roots(self):
+        monom_to_index = {m: i for i, m in enumerate(self.recurrences.monomials)}
+        known_roots = {}
+        matrices = []
+        for i, block in enumerate(self.blocks):
+            # Blocks of the base are blocks of the extended system as well
+            if isinstance(self.base, BlockSolver) and block[0] in self.base.block_of:
+                known_roots[i] = self.base.block_roots[self.base.block_of[block[0]]]
+                continue
+            indices = [monom_to_index[m] for m in block]
+            matrices.append(
+                self.recurrences.recurrence_matrix.extract(indices, indices)
+            )
+
+        arguments = (
+            matrices,
+            [self.numeric_roots] * len(matrices),
+            [self.numeric_croots] * len(matrices),
+            [self.numeric_eps] * len(matrices),
+            [settings.charpoly_backend] * len(matrices),
+        )
+        number_cyclic = sum(1 for m in matrices if m.rows > 1)
+        if settings.solver_workers > 1 and number_cyclic > 1:
+            with ProcessPoolExecutor(max_workers=settings.solver_workers) as executor:
+                new_roots = iter(executor.map(compute_block_roots, *arguments))
+        else:
+            new_roots = map(compute_block_roots, *arguments)
+        self.block_roots = [
+            known_roots[i] if i in known_roots else next(new_roots)
+            for i in range(len(self.blocks))
+        ]
+
+    @property
+    def is_exact(self) -> bool:
+        return all(is_exact for _, is_exact in self.block_roots)
+
+    def is_exact_for(self, monomial) -> bool:
+        """
+        The solution of a monomial only depends on the roots of the blocks in its closure.
+        """
+        monomial = sympify(monomial)
+        if monomial in self.base_solvers:
+            return self.base_solvers[monomial].is_exact_for(monomial)
+        return self._get_solver_of(monomial).is_exact
+
+    def get(self, monomial):
+        monomial = sympify(monomial)
+        if monomial in self.base_solvers:
+            return self.base_solvers[monomial].get(monomial)
+        return self._get_solver_of(monomial).get(monomial)
+
+    def _get_solver_of(self, monomial) -> Solver:
+        monomial = sympify(monomial)
+        if monomial not in self.block_of:
+            raise SolverException(
+                f"Monomial {monomial} not in current system of recurrences"
+            )
+        return self._get_block_solver(self.block_of[monomial])
+
+    @lru_cache(maxsize=None)
+    def _get_block_solver(self, block_index: int) -> Solver:
+        """
+        Returns a solver for the subsystem consisting of the given block and all blocks it depends on.
+        """
+        closure = self.recurrences.get_closure(self.blocks[block_index])
+        sub_recurrences = self.recurrences.get_sub_recurrences(closure)
+        if sub_recurrences.is_acyclic:
+            return AcyclicSolver(sub_recurrences, self._get_base_solutions(closure))
+
+        roots = {}
+        closure_blocks = sorted({self.block_of[m] for m in closure})
+        for i in closure_blocks:
+            for root, multiplicity in self.block_roots[i][0]:
+                roots[root] = roots.get(root, 0) + multiplicity
+        if sub_recurrences.is_inhomogeneous:
+            roots[sympify(1)] = roots.get(sympify(1), 0) + 1
+        is_exact = all(self.block_roots[i][1] for i in closure_blocks)
+        return CyclicSolver(
+            sub_recurrences,
+            self.numeric_roots,
+            self.numeric_croots,
+            self.numeric_eps,
+            roots=(list(roots.items()), is_exact),
+        )
+
+    def _get_base_solutions(self, closure) -> Dict[Expr, Expr]:
+        """
+        Returns the solutions of monomials in an acyclic closure which have already been computed by the base.
+        """
+        solutions = {}
+        for m in closure:
+            solver = self.base_solvers.get(m)
+            if isinstance(solver, BlockSolver):
+                solver = solver._get_solver_of(m)
+            if isinstance(solver, AcyclicSolver) and m in solver.solutions:
+                solutions[m] = solver.solutions[m]
+        return solutions
@@ -1,10 +1,10 @@
 from functools import lru_cache
-from typing import List, Set
+from typing import List, Set, Tuple
 
-from sympy import symbols, Symbol, Expr, Poly, sympify, Piecewise
+from sympy import symbols, Symbol, Expr, Poly, sympify, Piecewise, Matrix
 
 from .solver import Solver
-from utils import get_all_roots, solve_linear
+from utils import get_all_roots, solve_linear, solve_linear_systems, charpoly
 from recurrences.exceptions import SolverException
 from recurrences import Recurrences
 import settings
@@ -16,13 +16,16 @@ class CyclicSolver(Solver):
     monomials: Set[Expr]
     recurrences: Recurrences
     characteristic_poly: Poly
+    degree: int
     general_solution: Expr
     gen_sol_unknowns: List[Symbol]
     gen_sol_unknowns_set: Set[Symbol]
+    gen_sol_basis: List[Expr]
     numeric_roots: bool
     numeric_croots: bool
     numeric_eps: float
     _is_exact: bool
+    _orbit: List[Matrix]
 
     def __init__(
         self,
@@ -30,7 +33,12 @@ class CyclicSolver(Solver):
         numeric_roots: bool = None,
         numeric_croots: bool = None,
         numeric_eps: float = None,
+        roots: Tuple[List[Tuple[Expr, int]], bool] = None,
     ):
+        """
+        The roots of the characteristic polynomial together with whether they are exact can be passed
+        if they are already known. Otherwise, they are computed from the recurrence matrix.
+        """
         self.n = symbols("n", integer=True)
         self.recurrences = recurrences
         self.numeric_roots = (
@@ -45,17 +53,24 @@ class CyclicSolver(Solver):
             m: i
             for m, i in zip(recurrences.monomials, range(len(recurrences.monomials)))
         }
-        self.characteristic_poly = self.recurrences.recurrence_matrix.charpoly()
-        self._compute_general_solution()
+        self.degree = self.recurrences.recurrence_matrix.rows
+        self._orbit = [self.recurrences.init_values_vector]
+        if roots is None:
+            self.characteristic_poly = charpoly(
+                self.recurrences.recurrence_matrix, settings.charpoly_backend
+            )
+            roots = get_all_roots(
+                self.characteristic_poly,
+                self.numeric_roots,
+                self.numeric_croots,
+                self.numeric_eps,
+            )
+        self._compute_general_solution(*roots)
 
-    def _compute_general_solution(self):
+    def _compute_general_solution(self, roots, is_exact):
         unknowns = []
-        roots, self._is_exact = get_all_roots(
-            self.characteristic_poly,
-            self.numeric_roots,
-            self.numeric_croots,
-            self.numeric_eps,
-        )
+        basis = []
+        self._is_exact = is_exact
         solution = sympify(0)
         count = 0
         for root, multiplicity in roots:
@@ -63,13 +78,15 @@ class CyclicSolver(Solver):
                 if root != 0:
                     new_unknown = symbols(f"C{count}")
                     unknowns.append(new_unknown)
-                    term = new_unknown * (self.n**i)
+                    basis_term = self.n**i
                     if root != 1:
-                        term = term * (root**self.n)
-                    solution += term
+                        basis_term = basis_term * (root**self.n)
+                    basis.append(basis_term)
+                    solution += new_unknown * basis_term
                     count += 1
         self.gen_sol_unknowns = unknowns
         self.gen_sol_unknowns_set = set(unknowns)
+        self.gen_sol_basis = basis
         self.general_solution = solution
 
     @property
@@ -86,7 +103,11 @@ class CyclicSolver(Solver):
 
         solution = self.general_solution
         if self.gen_sol_unknowns:
-            concrete_unknowns = self._solve_for_unknowns(monomial)
+            all_unknowns = self._solve_all_unknowns()
+            if all_unknowns is None:
+                concrete_unknowns = self._solve_for_unknowns(monomial)
+            else:
+                concrete_unknowns = all_unknowns.col(self.monom_to_index[monomial])
             unknown_subs = {
                 u: s for u, s in zip(self.gen_sol_unknowns, concrete_unknowns)
             }
@@ -96,15 +117,40 @@ class CyclicSolver(Solver):
 
         return solution.expand()
 
+    def _get_orbit(self, length: int) -> List[Matrix]:
+        """
+        Returns the vectors M^n * v for n < length where M is the recurrence matrix and v the initial values.
+        The vectors are computed only once per solver and shared among all monomials.
+        """
+        while len(self._orbit) < length:
+            self._orbit.append(self.recurrences.recurrence_matrix * self._orbit[-1])
+        return self._orbit
+
+    @lru_cache(maxsize=None)
+    def _solve_all_unknowns(self):
+        """
+        Solves for the unknowns of the general solution of all monomials at once. The equations for n = 1, ..., k
+        share the same coefficient matrix (the general solution basis evaluated at n) and only differ in the
+        right-hand sides (the orbit of the initial values). Returns a matrix whose i-th column contains the
+        unknowns of the i-th monomial or None if the first k equations do not determine the unknowns uniquely.
+        """
+        number_equations = len(self.gen_sol_unknowns)
+        orbit = self._get_orbit(number_equations + 1)
+        coefficients = Matrix(
+            [
+                [b.xreplace({self.n: n}) for b in self.gen_sol_basis]
+                for n in range(1, number_equations + 1)
+            ]
+        )
+        right_sides = Matrix.hstack(*orbit[1 : number_equations + 1]).T
+        return solve_linear_systems(coefficients, right_sides)
+
     def _solve_for_unknowns(self, monomial: Expr):
         number_equations = len(self.gen_sol_unknowns)
         monom_index = self.monom_to_index[monomial]
-        concrete_values = [self.recurrences.init_values_vector]
+        concrete_values = self._get_orbit(number_equations + 1)
         equations = []
         for n in range(1, number_equations + 1):
-            concrete_values.append(
-                self.recurrences.recurrence_matrix * concrete_values[-1]
-            )
             eq = (
                 self.general_solution.xreplace({self.n: n})
                 - concrete_values[n][monom_index]
@@ -115,12 +161,10 @@ class CyclicSolver(Solver):
         not_solved = self._any_is_still_unknown(concrete_unknowns)
         next_n = number_equations + 1
         while not_solved:
-            concrete_values.append(
-                self.recurrences.recurrence_matrix * concrete_values[-1]
-            )
+            concrete_values = self._get_orbit(next_n + 1)
             eq = (
                 self.general_solution.xreplace({self.n: next_n})
-                - concrete_values[-1][monom_index]
+                - concrete_values[next_n][monom_index]
             ).expand()
             equations.append(eq)
             next_n += 1
@@ -130,14 +174,10 @@ class CyclicSolver(Solver):
         return concrete_unknowns
 
     def _add_beginning_values(self, solution, monom_index):
-        beginning_values = [self.recurrences.init_values_vector]
-        for _ in range(self.characteristic_poly.degree() - 1):
-            beginning_values.append(
-                self.recurrences.recurrence_matrix * beginning_values[-1]
-            )
+        beginning_values = self._get_orbit(self.degree)
 
         pieces = []
-        for i, v in enumerate(beginning_values):
+        for i, v in enumerate(beginning_values[: self.degree]):
             pieces.append((v[monom_index], self.n <= i))
         pieces.append((solution, True))
         return Piecewise(*pieces)
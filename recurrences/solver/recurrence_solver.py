@@ -1,5 +1,6 @@
 from recurrences import Recurrences
 from .acyclic_solver import AcyclicSolver
+from .block_solver import BlockSolver
 from .cyclic_solver import CyclicSolver
 from .solver import Solver
 
@@ -14,17 +15,37 @@ class RecurrenceSolver(Solver):
         numeric_croots: bool = None,
         numeric_eps: float = None,
         force_cyclic_solver: bool = False,
+        base: "RecurrenceSolver" = None,
     ):
-        if recurrences.is_acyclic and not force_cyclic_solver:
-            self.solver = AcyclicSolver(recurrences)
-        else:
+        """
+        If the recurrences extend the recurrences of a base solver, the work already done by the base
+        (closed forms and roots of blocks) is reused, such that only the new monomials are solved.
+        """
+        base_solver = None if base is None else base.solver
+        if force_cyclic_solver:
             self.solver = CyclicSolver(
                 recurrences, numeric_roots, numeric_croots, numeric_eps
             )
+        elif recurrences.is_acyclic:
+            solutions = None
+            if isinstance(base_solver, AcyclicSolver):
+                solutions = base_solver.solutions
+            self.solver = AcyclicSolver(recurrences, solutions)
+        else:
+            self.solver = BlockSolver(
+                recurrences, numeric_roots, numeric_croots, numeric_eps, base_solver
+            )
 
     @property
     def is_exact(self) -> bool:
         return self.solver.is_exact
 
+    def is_exact_for(self, monomial) -> bool:
+        return self.solver.is_exact_for(monomial)
+
+    @property
+    def recurrences(self) -> Recurrences:
+        return self.solver.recurrences
+
     def get(self, monomial):
         return self.solver.get(monomial)
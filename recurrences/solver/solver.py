@@ -10,3 +10,9 @@ class Solver(ABC):
     @abstractmethod
     def get(self, monomial):
         pass
+
+    def is_exact_for(self, monomial) -> bool:
+        """
+        Returns true iff the solution of the given monomial is exact.
+        """
+        return self.is_exact
@@ -24,3 +24,9 @@ trivial_guard: bool = False
 
 # If true, moments of functions of distributions which would be transcendental won't be approximated by rationals
 exact_func_moments: bool = False
+
+# Number of processes used to compute the roots of independent blocks of a system of recurrences
+solver_workers: int = 1
+
+# Backend for characteristic polynomials: "domain" (block-triangular, Berkowitz over polynomial domains) or "sympy"
+charpoly_backend: str = "domain"
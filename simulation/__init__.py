@@ -1,2 +1,5 @@
 from .simulator import Simulator
+from .vectorized_simulator import VectorizedSimulator
 from .simulation_result import SimulationResult
+from .streaming_result import StreamingSimulationResult
+from .online_statistics import OnlineMoments, QuantileSketch
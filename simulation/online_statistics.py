@@ -0,0 +1,137 @@
+from math import comb
+from typing import List
+import numpy as np
+
+
+class OnlineMoments:
+    """
+    Accumulates the mean and the central moments up to a given order of a stream of values without storing them.
+    Values are added in batches and two accumulators can be merged, using the pairwise update formulas
+    for central moments (generalizing Welford's algorithm).
+    """
+
+    order: int
+    count: int
+    mean: float
+    sums: List[float]
+
+    def __init__(self, order: int = 2):
+        self.order = order
+        self.count = 0
+        self.mean = 0.0
+        # sums[p] is the sum of (x - mean)^p over all values seen so far
+        self.sums = [0.0] * (order + 1)
+
+    def add(self, values: np.ndarray):
+        batch = OnlineMoments(self.order)
+        batch.count = len(values)
+        if batch.count == 0:
+            return
+        batch.mean = float(np.mean(values))
+        deviations = values - batch.mean
+        for p in range(2, self.order + 1):
+            batch.sums[p] = float(np.sum(deviations**p))
+        self.merge(batch)
+
+    def merge(self, other: "OnlineMoments"):
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.sums = other.count, other.mean, other.sums[:]
+            return
+
+        na, nb = self.count, other.count
+        n = na + nb
+        delta = other.mean - self.mean
+        sums = [0.0] * (self.order + 1)
+        for p in range(2, self.order + 1):
+            s = self.sums[p] + other.sums[p]
+            for k in range(1, p - 1):
+                s += (
+                    comb(p, k)
+                    * delta**k
+                    * (
+                        (-nb / n) ** k * self.sums[p - k]
+                        + (na / n) ** k * other.sums[p - k]
+                    )
+                )
+            s += (na * nb * delta / n) ** p * (1 / nb ** (p - 1) - (-1 / na) ** (p - 1))
+            sums[p] = s
+
+        self.mean += delta * nb / n
+        self.count = n
+        self.sums = sums
+
+    def central_moment(self, k: int) -> float:
+        if k > self.order:
+            raise ValueError(
+                f"Only central moments up to order {self.order} are tracked"
+            )
+        if k == 0:
+            return 1.0
+        if k == 1:
+            return 0.0
+        return self.sums[k] / self.count
+
+    @property
+    def variance(self) -> float:
+        return self.central_moment(2)
+
+
+class QuantileSketch:
+    """
+    A mergeable sketch for approximate quantiles of a stream of values, based on a hierarchy of compactors.
+    Level l holds values each representing 2^l original values. If a level exceeds the capacity, it gets sorted
+    and every second value is promoted to the next level. Hence, the memory is logarithmic in the number of values.
+    nan values are ignored.
+    """
+
+    capacity: int
+    levels: List[np.ndarray]
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.levels = []
+        self._offsets = []
+
+    def add(self, values: np.ndarray):
+        values = values[~np.isnan(values)]
+        self._extend(0, values)
+        self._compact()
+
+    def merge(self, other: "QuantileSketch"):
+        for level, values in enumerate(other.levels):
+            self._extend(level, values)
+        self._compact()
+
+    def _extend(self, level: int, values: np.ndarray):
+        while len(self.levels) <= level:
+            self.levels.append(np.empty(0))
+            self._offsets.append(0)
+        self.levels[level] = np.concatenate((self.levels[level], values))
+
+    def _compact(self):
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if len(values) > self.capacity:
+                values = np.sort(values)
+                # Alternating the offset keeps the sketch unbiased and deterministic
+                offset = self._offsets[level]
+                self._offsets[level] = 1 - offset
+                keep = len(values) % 2
+                self.levels[level] = values[len(values) - keep :]
+                self._extend(level + 1, values[offset : len(values) - keep : 2])
+            level += 1
+
+    def quantile(self, q: float) -> float:
+        values = np.concatenate(self.levels) if self.levels else np.empty(0)
+        if len(values) == 0:
+            return float("nan")
+        weights = np.concatenate(
+            [np.full(len(v), 2.0**level) for level, v in enumerate(self.levels)]
+        )
+        order = np.argsort(values, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        index = np.searchsorted(cumulative, q * cumulative[-1])
+        return float(values[order][min(index, len(values) - 1)])
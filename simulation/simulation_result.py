@@ -1,56 +1,77 @@
 import numpy as np
 from typing import Dict, List
-from statistics import mean
 from symengine.lib.symengine_wrapper import sympify, Expr
+from utils import compile_expression
 
 State = Dict[Expr, float]
 Run = List[State]
+Columns = Dict[Expr, np.ndarray]
 
 
 class SimulationResult:
     """
     Provides the functionality to compute statistics for the result of simulating a program.
+    The result is stored column-wise: for every variable and every goal there is a single float array
+    of shape (samples, iterations + 1). Unset values are nan.
     """
 
-    samples: List[Run]
+    columns: Columns
+    variables: List[Expr]
     goals: List[Expr]
 
-    def __init__(self, samples: List[Run], goals: List):
-        self.samples = samples
+    def __init__(self, columns: Columns, goals: List):
+        self.columns = {sympify(k): v for k, v in columns.items()}
+        self.variables = list(self.columns.keys())
         self.goals = [sympify(g) for g in goals]
-        self._preprocess_samples()
-
-    def _preprocess_samples(self):
-        new_samples = []
-        for run in self.samples:
-            new_run = []
-            for state in run:
-                state = {sympify(k): v for k, v in state.items()}
-                goal_values = {g: self._goal_to_float(g, state) for g in self.goals}
-                state.update(goal_values)
-                new_run.append(state)
-            new_samples.append(new_run)
-        self.samples = new_samples
-
-    def _goal_to_float(self, goal, state):
-        result = sympify(goal).subs(state)
-        if not result.is_Number:
-            return float("nan")
-        return float(result)
+        self._compute_goals()
+
+    @classmethod
+    def from_runs(cls, samples: List[Run], goals: List):
+        """
+        Creates a simulation result from a list of runs, where every run is a list of states.
+        """
+        variables = {v for run in samples for state in run for v in state}
+        iterations = max(len(run) for run in samples)
+        columns = {}
+        for variable in variables:
+            column = np.full((len(samples), iterations), np.nan)
+            for i, run in enumerate(samples):
+                for n, state in enumerate(run):
+                    if variable in state:
+                        column[i, n] = state[variable]
+            columns[variable] = column
+        return cls(columns, goals)
+
+    @property
+    def shape(self):
+        """
+        The pair (number of samples, number of iterations + 1).
+        """
+        return next(iter(self.columns.values())).shape
+
+    def _compute_goals(self):
+        for goal in self.goals:
+            if goal not in self.columns:
+                self.columns[goal] = self._goal_to_column(goal)
+
+    def _goal_to_column(self, goal):
+        try:
+            result = compile_expression(goal, vectorized=True)(self.columns)
+        except KeyError:
+            return np.full(self.shape, np.nan)
+        return np.broadcast_to(np.asarray(result, dtype=float), self.shape)
 
     def get_average_goals(self, iteration=-1):
         result = {}
         for goal in self.goals:
-            result[goal] = mean([run[iteration][goal] for run in self.samples])
+            result[goal] = float(np.mean(self.columns[goal][:, iteration]))
         return result
 
     def get_prepared_data(self, goal):
+        """
+        Returns a view of shape (iterations + 1, samples) on the values of the given goal.
+        """
         goal = sympify(goal)
-        data = []
-        for run in self.samples:
-            run_data = []
-            for state in run:
-                run_data.append(state[goal])
-            data.append(run_data)
-
-        return np.array(data).T
+        if goal not in self.columns:
+            self.columns[goal] = self._goal_to_column(goal)
+        return self.columns[goal].T
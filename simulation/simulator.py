@@ -31,7 +31,7 @@ class Simulator:
             sample_bar.next()
             result.append(states)
         sample_bar.finish()
-        return SimulationResult(result, goals)
+        return SimulationResult.from_runs(result, goals)
 
     @singledispatchmethod
     def execute(self, program_element, state: Dict[Symbol, float]):
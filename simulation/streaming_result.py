@@ -0,0 +1,85 @@
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+from symengine.lib.symengine_wrapper import sympify, Expr
+from .online_statistics import OnlineMoments, QuantileSketch
+
+
+class StreamingSimulationResult:
+    """
+    The result of a simulation which does not keep the trajectories of the samples.
+    For every goal and every tracked iteration it only holds online accumulators for moments and quantiles.
+    Hence, the memory is independent of the number of samples. By default, all iterations are tracked.
+    """
+
+    goals: List[Expr]
+    iterations: int
+    tracked: List[int]
+    moments: Dict[Expr, Dict[int, OnlineMoments]]
+    quantiles: Dict[Expr, Dict[int, QuantileSketch]]
+
+    def __init__(
+        self,
+        goals: List,
+        iterations: int,
+        order: int = 2,
+        tracked: Optional[Iterable[int]] = None,
+    ):
+        self.goals = [sympify(g) for g in goals]
+        self.iterations = iterations
+        if tracked is None:
+            tracked = range(iterations + 1)
+        self.tracked = sorted({self._get_iteration(n) for n in tracked})
+        self.moments = {
+            g: {n: OnlineMoments(order) for n in self.tracked} for g in self.goals
+        }
+        self.quantiles = {
+            g: {n: QuantileSketch() for n in self.tracked} for g in self.goals
+        }
+
+    def _get_iteration(self, iteration: int) -> int:
+        """
+        Returns the iteration for the given index, where negative indices count from the last iteration.
+        """
+        n = iteration if iteration >= 0 else self.iterations + 1 + iteration
+        if not 0 <= n <= self.iterations:
+            raise ValueError(f"Iteration {iteration} is not simulated")
+        return n
+
+    def _get_tracked(self, iteration: int) -> int:
+        n = self._get_iteration(iteration)
+        if not self.is_tracked(n):
+            raise ValueError(f"Iteration {n} is not tracked")
+        return n
+
+    def is_tracked(self, iteration: int) -> bool:
+        return iteration in self.tracked
+
+    def add(self, goal: Expr, iteration: int, values: np.ndarray):
+        self.moments[goal][iteration].add(values)
+        self.quantiles[goal][iteration].add(values)
+
+    def merge(self, other: "StreamingSimulationResult"):
+        for goal in self.goals:
+            for n in self.tracked:
+                self.moments[goal][n].merge(other.moments[goal][n])
+                self.quantiles[goal][n].merge(other.quantiles[goal][n])
+
+    def get_average_goals(self, iteration=-1):
+        n = self._get_tracked(iteration)
+        return {g: self._get_mean(self.moments[g][n]) for g in self.goals}
+
+    @staticmethod
+    def _get_mean(moments: OnlineMoments) -> float:
+        return moments.mean if moments.count else float("nan")
+
+    def get_central_moment(self, goal, k: int, iteration=-1):
+        moments = self.moments[sympify(goal)][self._get_tracked(iteration)]
+        if not moments.count:
+            return float("nan")
+        return moments.central_moment(k)
+
+    def get_variance(self, goal, iteration=-1):
+        return self.get_central_moment(goal, 2, iteration)
+
+    def get_quantile(self, goal, q: float, iteration=-1):
+        return self.quantiles[sympify(goal)][self._get_tracked(iteration)].quantile(q)
@@ -0,0 +1,286 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, Iterable, Iterator, List, Optional
+import numpy as np
+from singledispatchmethod import singledispatchmethod
+from symengine.lib.symengine_wrapper import Expr, Symbol, sympify
+from program import Program
+from program.assignment import (
+    Assignment,
+    DistAssignment,
+    PolyAssignment,
+    FunctionalAssignment,
+)
+from program.assignment.exceptions import EvaluationException
+from program.condition import Condition
+from program.distribution import Distribution, Categorical
+from program.ifstatem import IfStatem
+from utils import compile_expression
+from .simulation_result import SimulationResult
+from .streaming_result import StreamingSimulationResult
+
+BatchState = Dict[Symbol, np.ndarray]
+
+
+class VectorizedSimulator:
+    """
+    Simulates all samples of a program at once. The state holds one numpy column per program variable and
+    every program element is executed on all samples simultaneously. Branches of if-statements and the loop guard
+    are handled by boolean masks: an assignment only changes the entries of samples for which the mask is true.
+    The results are the same as for Simulator, but the throughput is orders of magnitude higher.
+
+    The samples are split into chunks of fixed size, each with its own independent seed spawned from the
+    given seed. The chunks can be simulated by multiple worker processes. Because the chunks do not depend on the
+    number of workers, the result for a fixed seed is the same regardless of the number of workers.
+    """
+
+    iterations: int
+    workers: int
+    seed: Optional[int]
+    rng: np.random.Generator
+
+    # The number of samples simulated together in one chunk
+    chunk_size: int = 5000
+
+    def __init__(self, iterations: int, workers: int = 1, seed: int = None):
+        self.iterations = iterations
+        self.workers = workers
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+    def simulate(self, program: Program, goals: List, samples: int):
+        sizes = self._get_chunks(samples)
+        results = list(self._map_chunks(self._simulate_chunk, program, sizes))
+        columns = self._merge_chunks(results, sizes)
+        return SimulationResult(columns, goals)
+
+    def simulate_streaming(
+        self,
+        program: Program,
+        goals: List,
+        samples: int,
+        order: int = 2,
+        tracked: Optional[Iterable[int]] = None,
+    ):
+        """
+        Simulates the program without keeping the trajectories. The values of the goals are fed into
+        online accumulators for the tracked iterations (all by default), tracking the central moments up to the
+        given order and quantiles. The result of every chunk is merged as soon as it is available, such that
+        the memory does not depend on the number of samples.
+        """
+        goals = [sympify(g) for g in goals]
+        result = StreamingSimulationResult(goals, self.iterations, order, tracked)
+        chunks = self._get_chunks(samples)
+        for chunk_result in self._map_chunks(
+            self._stream_chunk, program, chunks, goals, order, result.tracked
+        ):
+            result.merge(chunk_result)
+        return result
+
+    def _get_chunks(self, samples: int) -> List[int]:
+        """
+        Returns the sizes of the chunks the samples are split into.
+        """
+        chunks = [self.chunk_size] * (samples // self.chunk_size)
+        if samples % self.chunk_size:
+            chunks.append(samples % self.chunk_size)
+        return chunks
+
+    def _map_chunks(
+        self, function, program: Program, chunks: List[int], *args
+    ) -> Iterator:
+        """
+        Applies the function to every chunk, possibly in parallel, and yields the results in the order of the
+        chunks. At most two chunks per worker are pending at any time, such that the results do not pile up.
+        """
+        seeds = np.random.SeedSequence(self.seed).spawn(len(chunks))
+        arguments = zip(repeat(program), chunks, seeds, *[repeat(a) for a in args])
+
+        if self.workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                pending = deque()
+                for chunk_arguments in arguments:
+                    pending.append(executor.submit(function, *chunk_arguments))
+                    if len(pending) >= 2 * self.workers:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+        else:
+            for chunk_arguments in arguments:
+                yield function(*chunk_arguments)
+
+    def _run_chunk(self, program: Program, samples: int, seed: np.random.SeedSequence):
+        """
+        Simulates the given number of samples and yields the state of all samples after every iteration.
+        """
+        self.rng = np.random.default_rng(seed)
+        with np.errstate(all="ignore"):
+            everything = np.ones(samples, dtype=bool)
+            state = self.execute(program.initial, {}, everything)
+            yield state
+            for _ in range(self.iterations):
+                active = self.evaluate_condition(program.loop_guard, state, samples)
+                if active.any():
+                    state = self.execute(program.loop_body, state.copy(), active)
+                yield state
+
+    def _simulate_chunk(
+        self, program: Program, samples: int, seed: np.random.SeedSequence
+    ) -> BatchState:
+        """
+        Returns for every variable an array of shape (samples, iterations + 1) holding the values of all iterations.
+        """
+        columns = {}
+        for n, state in enumerate(self._run_chunk(program, samples, seed)):
+            for variable, values in state.items():
+                if variable not in columns:
+                    columns[variable] = np.full((samples, self.iterations + 1), np.nan)
+                columns[variable][:, n] = values
+        return columns
+
+    def _stream_chunk(
+        self,
+        program: Program,
+        samples: int,
+        seed: np.random.SeedSequence,
+        goals: List[Expr],
+        order: int,
+        tracked: List[int],
+    ) -> StreamingSimulationResult:
+        result = StreamingSimulationResult(goals, self.iterations, order, tracked)
+        for n, state in enumerate(self._run_chunk(program, samples, seed)):
+            if not result.is_tracked(n):
+                continue
+            for goal in goals:
+                try:
+                    values = self.evaluate_expr(goal, state, samples)
+                except EvaluationException:
+                    values = np.full(samples, np.nan)
+                result.add(goal, n, values)
+        return result
+
+    def _merge_chunks(self, chunks: List[BatchState], sizes: List[int]):
+        """
+        Concatenates the columns of all chunks. Variables which have never been set in a chunk are nan.
+        """
+        if len(chunks) == 1:
+            return chunks[0]
+        variables = {v for c in chunks for v in c}
+        columns = {}
+        for variable in variables:
+            parts = []
+            for chunk, size in zip(chunks, sizes):
+                if variable in chunk:
+                    parts.append(chunk[variable])
+                else:
+                    parts.append(np.full((size, self.iterations + 1), np.nan))
+            columns[variable] = np.concatenate(parts)
+        return columns
+
+    @singledispatchmethod
+    def execute(self, program_element, state: BatchState, mask: np.ndarray):
+        raise RuntimeError(f"Unknown program element in simulation, {program_element}")
+
+    @execute.register
+    def _(self, program_element: list, state: BatchState, mask: np.ndarray):
+        for element in program_element:
+            state = self.execute(element, state, mask)
+        return state
+
+    @execute.register
+    def _(self, program_element: IfStatem, state: BatchState, mask: np.ndarray):
+        # All branch masks are computed on the state before any branch is executed,
+        # because for every sample only a single branch is taken.
+        size = len(mask)
+        remaining = mask.copy()
+        branch_masks = []
+        for condition in program_element.conditions:
+            branch_mask = remaining & self.evaluate_condition(condition, state, size)
+            remaining &= ~branch_mask
+            branch_masks.append(branch_mask)
+
+        for branch, branch_mask in zip(program_element.branches, branch_masks):
+            if branch_mask.any():
+                state = self.execute(branch, state, branch_mask)
+        if program_element.else_branch and remaining.any():
+            state = self.execute(program_element.else_branch, state, remaining)
+        return state
+
+    @execute.register
+    def _(self, program_element: Assignment, state: BatchState, mask: np.ndarray):
+        size = len(mask)
+        variable, default = program_element.variable, program_element.default
+        condition = self.evaluate_condition(program_element.condition, state, size)
+        # Samples outside the mask keep their value, possibly "unset" which is represented by nan.
+        result = state[variable] if variable in state else np.full(size, np.nan)
+
+        use_default = mask & ~condition
+        if use_default.any():
+            if default not in state:
+                raise EvaluationException(
+                    f"Tried to evaluate {default} which is not set in state"
+                )
+            result = np.where(use_default, state[default], result)
+
+        use_right_side = mask & condition
+        if use_right_side.any():
+            new_values = self.evaluate_right_side(program_element, state, size)
+            result = np.where(use_right_side, new_values, result)
+
+        state[variable] = result
+        return state
+
+    @singledispatchmethod
+    def evaluate_right_side(self, assign: Assignment, state: BatchState, size: int):
+        raise RuntimeError(f"Unknown assignment in simulation, {assign}")
+
+    @evaluate_right_side.register
+    def _(self, assign: PolyAssignment, state: BatchState, size: int):
+        values = [self.evaluate_expr(p, state, size) for p in assign.polynomials]
+        if len(values) == 1:
+            return values[0]
+        weights = [self.evaluate_expr(p, state, size) for p in assign.probabilities]
+        choices = Categorical.choose(weights, size, self.rng)
+        return np.choose(choices, values)
+
+    @evaluate_right_side.register
+    def _(self, assign: DistAssignment, state: BatchState, size: int):
+        return self.sample(assign.distribution, state, size)
+
+    @evaluate_right_side.register
+    def _(self, assign: FunctionalAssignment, state: BatchState, size: int):
+        argument = self.evaluate_expr(assign.argument, state, size)
+        if assign.func == "Sin":
+            return np.sin(argument)
+        if assign.func == "Cos":
+            return np.cos(argument)
+        if assign.func == "Exp":
+            return np.exp(argument)
+        raise EvaluationException(f"Function {assign.func} not supported.")
+
+    def sample(self, dist: Distribution, state: BatchState, size: int):
+        try:
+            parameters = [
+                self.evaluate_expr(p, state, size) for p in dist.get_parameters()
+            ]
+            return dist.sample_batch(parameters, size, self.rng)
+        except NotImplementedError:
+            raise RuntimeError(f"Distribution {dist} not supported in simulation")
+
+    def evaluate_condition(self, condition: Condition, state: BatchState, size: int):
+        """
+        Evaluates a condition for all samples at once. The result is a boolean array with one entry per sample.
+        """
+        result = condition.compile(vectorized=True)(state)
+        return np.broadcast_to(np.asarray(result, dtype=bool), (size,))
+
+    def evaluate_expr(self, expr: Expr, state: BatchState, size: int):
+        """
+        Evaluates an expression for all samples at once. The result is an array with one entry per sample.
+        """
+        try:
+            result = compile_expression(expr, vectorized=True)(state)
+        except KeyError:
+            raise EvaluationException(f"{expr} cannot be fully evaluated with state")
+        return np.broadcast_to(np.asarray(result, dtype=float), (size,))
@@ -0,0 +1,33 @@
+import unittest
+
+from recurrences import Recurrences
+from recurrences.solver.acyclic_solver import AcyclicSolver
+from sympy import Symbol, symbols
+
+
+class AcyclicSolverTest(unittest.TestCase):
+    def test_long_dependency_chain(self):
+        xs = symbols("x0:1100")
+        recurrences = {xs[0]: xs[0] + 1}
+        recurrences.update({xs[i]: xs[i - 1] for i in range(1, len(xs))})
+        initial_values = {x: 0 for x in xs}
+        recurrences = Recurrences(recurrences, initial_values, None, [])
+        self.assertTrue(recurrences.is_acyclic)
+        self.assertEqual(recurrences.topological_order, list(xs))
+
+        n = Symbol("n", integer=True)
+        solution = AcyclicSolver(recurrences).get(xs[-1])
+        self.assertEqual(solution.subs({n: 1099}), 0)
+        self.assertEqual(solution.subs({n: 1110}), 11)
+
+    def test_cycle_is_detected(self):
+        x, y, z = symbols("x y z")
+        recurrences = Recurrences(
+            {x: y + 1, y: 2 * x, z: z + x}, {x: 0, y: 0, z: 0}, None, []
+        )
+        self.assertFalse(recurrences.is_acyclic)
+        self.assertEqual(recurrences.topological_order[-1], z)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+from functools import lru_cache
+import unittest
+
+from inputparser import parse_program
+from program import normalize_program
+from recurrences import RecBuilder, Recurrences
+from recurrences.solver import RecurrenceSolver
+from recurrences.solver.block_solver import BlockSolver
+from recurrences.solver.cyclic_solver import CyclicSolver
+from sympy import Symbol, symbols, sympify
+
+import settings
+
+benchmarks = os.path.dirname(__file__) + "/benchmarks/"
+
+
+@lru_cache(maxsize=None)
+def get_rec_builder(benchmark):
+    program = normalize_program(parse_program(benchmarks + benchmark))
+    return RecBuilder(program)
+
+
+def get_recurrences(benchmark, monom):
+    return get_rec_builder(benchmark).get_recurrences(sympify(monom))
+
+
+class BlockSolverTest(unittest.TestCase):
+    def test_blocks_are_topologically_sorted(self):
+        recurrences = get_recurrences("hawk_dove.prob", "p1bal**2")
+        seen = set()
+        for block in recurrences.get_blocks():
+            for monom in block:
+                self.assertTrue(recurrences.dependencies[monom] <= seen | set(block))
+            seen |= set(block)
+        self.assertEqual(seen, set(recurrences.monomials))
+
+    def test_matches_cyclic_solver(self):
+        for benchmark, monom in [
+            ("hawk_dove.prob", "p1bal**2"),
+            ("2dwalk.prob", "x*y"),
+        ]:
+            recurrences = get_recurrences(benchmark, monom)
+            n = Symbol("n", integer=True)
+            expected = CyclicSolver(recurrences, False, False, 0).get(monom)
+            for workers in [1, 2]:
+                settings.solver_workers = workers
+                solution = BlockSolver(recurrences, False, False, 0).get(monom)
+                for i in range(8):
+                    difference = (expected - solution).subs({n: i}).simplify()
+                    self.assertEqual(difference, 0)
+        settings.solver_workers = 1
+
+    def test_cyclic_solver_matches_iteration(self):
+        recurrences = get_recurrences("hawk_dove.prob", "p1bal**2")
+        n = Symbol("n", integer=True)
+        solver = CyclicSolver(recurrences, False, False, 0)
+        values = recurrences.init_values_vector
+        for i in range(recurrences.recurrence_matrix.rows + 3):
+            for index, monom in enumerate(recurrences.monomials):
+                difference = (solver.get(monom).subs({n: i}) - values[index]).simplify()
+                self.assertEqual(difference, 0)
+            values = recurrences.recurrence_matrix * values
+
+    def test_recurrence_solver_uses_blocks_for_cyclic_systems(self):
+        recurrences = get_recurrences("hawk_dove.prob", "p1bal")
+        solver = RecurrenceSolver(recurrences, False, False, 0)
+        self.assertEqual(
+            recurrences.is_acyclic, not isinstance(solver.solver, BlockSolver)
+        )
+
+    def test_extension_reuses_base(self):
+        x, y, z = symbols("x y z")
+        base = RecurrenceSolver(
+            Recurrences({x: y + 1, y: 2 * x}, {x: 0, y: 1}, None, []), False, False, 0
+        )
+        recurrences = Recurrences(
+            {x: y + 1, y: 2 * x, z: 3 * z + x}, {x: 0, y: 1, z: 2}, None, []
+        )
+        extended = RecurrenceSolver(recurrences, False, False, 0, base=base)
+        fresh = RecurrenceSolver(recurrences, False, False, 0)
+        self.assertIs(extended.solver.block_roots[0], base.solver.block_roots[0])
+        self.assertIs(extended.get(x), base.get(x))
+
+        n = Symbol("n", integer=True)
+        for i in range(8):
+            difference = (extended.get(z) - fresh.get(z)).subs({n: i}).simplify()
+            self.assertEqual(difference, 0)
+        self.assertTrue(extended.is_exact_for(z))
+
+
+if __name__ == "__main__":
+    unittest.main()
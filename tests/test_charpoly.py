@@ -0,0 +1,23 @@
+import unittest
+
+from sympy import Matrix, Rational, exp, sqrt, symbols
+from utils import charpoly
+
+
+class CharpolyTest(unittest.TestCase):
+    def test_domain_backend_matches_sympy(self):
+        p = symbols("p")
+        matrices = [
+            Matrix([[p, 1, 0], [1, 2, 0], [0, 1, Rational(1, 3)]]),
+            Matrix([[sqrt(2), 1], [exp(Rational(1, 2)), p]]),
+            Matrix([[1, 2, 3], [0, 1, 0], [4, 0, 0]]),
+            Matrix([[0, 0], [0, 0]]),
+        ]
+        for matrix in matrices:
+            expected = charpoly(matrix, "sympy").as_expr()
+            result = charpoly(matrix, "domain").as_expr()
+            self.assertEqual((expected - result).expand(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+
+from cli import ArgumentParser
+from cli.common import get_moment, flush_closed_form_cache
+from inputparser import Parser
+from program import normalize_program
+from recurrences import RecBuilder, DiffRecBuilder, ClosedFormCache
+from symengine.lib.symengine_wrapper import sympify
+from sympy import Symbol
+from utils import unpack_piecewise, get_source_fingerprint
+import settings
+
+walk = """
+x, y = 0, 0
+while true:
+    x = x + 1 {1/2} x - 1
+    y = y + x {1/3} y
+end
+"""
+
+parametric = """
+x = 0
+while true:
+    x = x + p {1/2} x
+end
+"""
+
+
+def get_program(source=walk):
+    return normalize_program(Parser().parse_string(source))
+
+
+class ClosedFormCacheTest(unittest.TestCase):
+    def test_cached_moment_equals_solved(self):
+        with tempfile.TemporaryDirectory() as directory:
+            args = ArgumentParser().get_defaults()
+            args.cache_dir = directory
+            program = get_program()
+            monom = sympify("y**2")
+            solved, is_exact = get_moment(monom, {}, RecBuilder(program), args, program)
+            self.assertEqual(os.listdir(directory), [])
+            flush_closed_form_cache(args)
+
+            cache = ClosedFormCache(directory, 1024 * 1024)
+            cached, cached_is_exact = cache.get(get_program(), monom)
+            self.assertEqual(solved, cached)
+            self.assertEqual(is_exact, cached_is_exact)
+            self.assertIsNone(cache.get(get_program(), sympify("x**3")))
+
+            # Flushing merges with the entries written by others in the meantime
+            other = ClosedFormCache(directory, 1024 * 1024)
+            x = sympify("x")
+            other.put(program, x, x, True, x, x)
+            other.flush()
+            cache.put(program, x**3, x, True, x, x)
+            cache.flush()
+            entries = ClosedFormCache(directory, 1024 * 1024)
+            self.assertIsNotNone(entries.get(program, x))
+            self.assertIsNotNone(entries.get(program, x**3))
+
+            # Only settings changing the closed forms are part of the key
+            key = ClosedFormCache.program_key(program)
+            workers, numeric_roots = settings.solver_workers, settings.numeric_roots
+            try:
+                settings.solver_workers = workers + 1
+                self.assertEqual(ClosedFormCache.program_key(program), key)
+                settings.numeric_roots = not numeric_roots
+                self.assertNotEqual(ClosedFormCache.program_key(program), key)
+            finally:
+                settings.solver_workers = workers
+                settings.numeric_roots = numeric_roots
+
+    def test_sensitivities_are_cached_separately(self):
+        with tempfile.TemporaryDirectory() as directory:
+            args = ArgumentParser().get_defaults()
+            args.cache_dir = directory
+            program = get_program(parametric)
+            x, p = sympify("x"), sympify("p")
+            n = Symbol("n", integer=True)
+            for _ in range(2):
+                diff_rec_builder = DiffRecBuilder(program, p)
+                sensitivity, _ = get_moment(x, {}, diff_rec_builder, args, program)
+                self.assertEqual(unpack_piecewise(sensitivity), n / 2)
+                moment, _ = get_moment(x, {}, RecBuilder(program), args, program)
+                self.assertEqual(unpack_piecewise(moment), n * p / 2)
+                flush_closed_form_cache(args)
+
+    def test_eviction(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ClosedFormCache(directory, 1)
+            program = get_program()
+            cache.put(program, sympify("x"), sympify(0), True, sympify(0), sympify(0))
+            cache.flush()
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_fingerprint_changes_with_sources(self):
+        fingerprint = get_source_fingerprint.__wrapped__
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, "package"))
+            path = os.path.join(directory, "package", "module.py")
+            with open(path, "w") as file:
+                file.write("x = 1\n")
+            before = fingerprint("package", root=directory)
+            self.assertEqual(before, fingerprint("package", root=directory))
+            with open(path, "w") as file:
+                file.write("x = 2\n")
+            self.assertNotEqual(before, fingerprint("package", root=directory))
+
+
+if __name__ == "__main__":
+    unittest.main()
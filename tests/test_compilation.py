@@ -0,0 +1,76 @@
+import pickle
+import unittest
+
+import numpy as np
+from program.condition import And, Atom, Not, Or
+from program.condition.exceptions import EvaluationException
+from symengine import sympify
+from utils import compile_expression
+
+x, y, p = sympify("x"), sympify("y"), sympify("p")
+
+
+def get_condition():
+    # (x < y or not x == 2) and y > 1
+    return And(Or(Atom(x, "<", y), Not(Atom(x, "==", 2))), Atom(y, ">", 1))
+
+
+class CompiledExpressionTest(unittest.TestCase):
+    def test_scalar_and_vectorized(self):
+        expr = x**2 * y + p
+        compiled = compile_expression(expr)
+        self.assertEqual(compiled({x: 3, y: 2, p: 1}), 19)
+        vectorized = compile_expression(expr, vectorized=True)
+        xs, ys = np.array([1.0, 2.0, 3.0]), np.array([4.0, 5.0, 6.0])
+        values = vectorized({x: xs, y: ys, p: 1.0})
+        self.assertEqual(list(values), [5.0, 21.0, 55.0])
+
+    def test_compiled_once(self):
+        self.assertIs(compile_expression(x + y), compile_expression(x + y))
+        self.assertIsNot(
+            compile_expression(x + y), compile_expression(x + y, vectorized=True)
+        )
+
+    def test_missing_symbol(self):
+        with self.assertRaises(KeyError):
+            compile_expression(x + y)({x: 1})
+
+
+class CompiledConditionTest(unittest.TestCase):
+    def test_matches_semantics(self):
+        condition = get_condition()
+        states = [(1, 2), (2, 2), (2, 3), (3, 1), (3, 2), (2, 1)]
+        for a, b in states:
+            expected = (a < b or a != 2) and b > 1
+            self.assertEqual(condition.evaluate({x: a, y: b}), expected)
+
+        xs = np.array([a for a, _ in states], dtype=float)
+        ys = np.array([b for _, b in states], dtype=float)
+        vectorized = condition.compile(vectorized=True)({x: xs, y: ys})
+        scalar = [condition.evaluate({x: a, y: b}) for a, b in states]
+        self.assertEqual(list(vectorized), scalar)
+
+    def test_compiled_once_until_subs(self):
+        condition = get_condition()
+        compiled = condition.compile()
+        self.assertIs(condition.compile(), compiled)
+        self.assertIsNot(condition.compile(vectorized=True), compiled)
+        self.assertTrue(condition.evaluate({x: 3, y: 2}))
+
+        condition.subs({y: sympify(0)})
+        self.assertIsNot(condition.compile(), compiled)
+        self.assertFalse(condition.evaluate({x: 3}))
+
+    def test_pickled_without_callables(self):
+        condition = get_condition()
+        condition.compile()
+        restored = pickle.loads(pickle.dumps(condition))
+        self.assertTrue(restored.evaluate({x: 3, y: 2}))
+
+    def test_missing_variable(self):
+        with self.assertRaises(EvaluationException):
+            Atom(x, "<", y).evaluate({x: 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
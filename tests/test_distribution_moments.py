@@ -0,0 +1,29 @@
+import unittest
+
+from program.distribution import Distribution, Normal, Laplace, Gamma, Beta
+from symengine import sympify, Symbol
+
+
+class DistributionMomentsTest(unittest.TestCase):
+    def test_closed_forms_match_sympy_stats(self):
+        distributions = [
+            Normal([1, 2]),
+            Laplace(["1/2", 3]),
+            Gamma([3, "1/2"]),
+            Beta([2, 3, 5]),
+        ]
+        for distribution in distributions:
+            for k in range(5):
+                closed_form = distribution.get_moment(k)
+                sympy_stats = Distribution.get_moment(distribution, k)
+                self.assertEqual((closed_form - sympify(sympy_stats)).expand(), 0)
+
+    def test_symbolic_normal_moments(self):
+        mu, sigma2 = Symbol("mu"), Symbol("sigma2")
+        moment = Normal([mu, sigma2]).get_moment(4)
+        expected = mu**4 + 6 * mu**2 * sigma2 + 3 * sigma2**2
+        self.assertEqual((moment - expected).expand(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from cli import ArgumentParser
+from cli.actions.goals_action import GoalsAction
+from cli.common import get_moment
+from inputparser import GoalParser
+from recurrences import RecBuilder
+from symengine import sympify
+from tests.test_rec_builder import get_gambling
+
+
+def get_goals_action(goals):
+    args = ArgumentParser().get_defaults()
+    args.no_cache = True
+    args.goals = goals
+    program = get_gambling()
+    goals_action = GoalsAction(args)
+    goals_action.initialize_program(program, RecBuilder(program))
+    return goals_action
+
+
+class GoalPlannerTest(unittest.TestCase):
+    def test_goals_share_one_system(self):
+        goals_action = get_goals_action(["E(bet)", "k3(money)", "c2(number_bets)"])
+        goals_action.plan_goals(goals_action.parse_goals())
+        monomials = [sympify(m) for m in ["bet", "money**3", "number_bets**2"]]
+        solvers = {id(goals_action.solvers[m]) for m in monomials}
+        self.assertEqual(len(solvers), 1)
+
+        for monomial in monomials:
+            planned, planned_is_exact = get_moment(
+                monomial,
+                goals_action.solvers,
+                goals_action.rec_builder,
+                goals_action.cli_args,
+                goals_action.program,
+            )
+            single, single_is_exact = get_moment(
+                monomial,
+                {},
+                RecBuilder(goals_action.program),
+                goals_action.cli_args,
+                goals_action.program,
+            )
+            self.assertEqual((planned - single).simplify(), 0)
+            self.assertEqual(planned_is_exact, single_is_exact)
+
+    def test_at_n_only_prints_in_goal_order(self):
+        def get_lines_at_n(at_n_only):
+            goals_action = get_goals_action(["E(money)", "c2(bet)"])
+            goals_action.cli_args.at_n = range(3, 8, 2)
+            goals_action.cli_args.at_n_only = at_n_only
+            output = io.StringIO()
+            with redirect_stdout(output):
+                goals_action.handle_all_goals()
+            return [l for l in output.getvalue().splitlines() if "| n=" in l]
+
+        lines = get_lines_at_n(True)
+        self.assertEqual(len(lines), 6)
+        self.assertTrue(all(l.startswith("E(money") for l in lines[:3]))
+        self.assertEqual(lines, get_lines_at_n(False))
+
+    def test_goal_monomials(self):
+        goals_action = get_goals_action([])
+        goal_type, goal_data = GoalParser.parse("c3(money)")
+        monomials = goals_action.get_goal_monomials(goal_type, goal_data)
+        self.assertEqual(monomials, [sympify(f"money**{i}") for i in [3, 2, 1]])
+
+
+if __name__ == "__main__":
+    unittest.main()
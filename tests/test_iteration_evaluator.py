@@ -0,0 +1,43 @@
+import unittest
+
+from cli.argument_parser import parse_iterations
+from recurrences import Recurrences, IterationEvaluator
+from recurrences.solver import RecurrenceSolver
+from sympy import Symbol, symbols
+
+
+class IterationEvaluatorTest(unittest.TestCase):
+    def test_matches_closed_forms(self):
+        x, y, z, p = symbols("x y z p")
+        recurrences = Recurrences(
+            {x: y + 1, y: p * x, z: 3 * z + x},
+            {x: 0, y: 1, z: 2},
+            None,
+            [p],
+        )
+        solver = RecurrenceSolver(recurrences, False, False, 0)
+        n = Symbol("n", integer=True)
+        iterations = [0, 0, 1, 5, 9, 13, 17, 40]
+        evaluated = list(IterationEvaluator(recurrences).evaluate(iterations))
+        self.assertEqual([i for i, _ in evaluated], iterations)
+        for i, values in evaluated:
+            for monom in [x, y, z]:
+                difference = solver.get(monom).subs({n: i}) - values[monom]
+                self.assertEqual(difference.simplify(), 0)
+
+    def test_iterations_need_to_be_ascending(self):
+        x = Symbol("x")
+        recurrences = Recurrences({x: 2 * x}, {x: 1}, None, [])
+        with self.assertRaises(ValueError):
+            list(IterationEvaluator(recurrences).evaluate([3, 2]))
+
+    def test_parse_iterations(self):
+        self.assertEqual(parse_iterations("7"), 7)
+        self.assertEqual(list(parse_iterations("0:10:5")), [0, 5, 10])
+        self.assertEqual(list(parse_iterations("2:4")), [2, 3, 4])
+        with self.assertRaises(ValueError):
+            parse_iterations("0:10:0")
+
+
+if __name__ == "__main__":
+    unittest.main()
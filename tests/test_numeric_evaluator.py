@@ -0,0 +1,46 @@
+import unittest
+
+from recurrences import Recurrences, IterationEvaluator, NumericIterationEvaluator
+from recurrences.numeric_evaluator import parse_numeric_engine
+from sympy import Rational, symbols
+
+
+def get_recurrences():
+    x, y, z, p = symbols("x y z p")
+    return Recurrences(
+        {x: y + 1, y: p * x, z: Rational(1, 3) * z + x},
+        {x: 0, y: 1, z: 2},
+        None,
+        [p],
+    )
+
+
+class NumericEvaluatorTest(unittest.TestCase):
+    def test_values_within_errors(self):
+        recurrences = get_recurrences()
+        parameter_values = {"p": Rational(9, 10)}
+        iterations = [0, 1, 7, 20, 33, 46]
+        exact = dict(
+            IterationEvaluator(recurrences, parameter_values).evaluate(iterations)
+        )
+        for engine in ["float64", "mpmath:40"]:
+            evaluator = NumericIterationEvaluator(recurrences, engine, parameter_values)
+            for n, values, errors in evaluator.evaluate_with_errors(iterations):
+                for monom, value in values.items():
+                    difference = abs(exact[n][monom] - Rational(value))
+                    self.assertLessEqual(difference, errors[monom])
+                    self.assertLessEqual(errors[monom], abs(value) * 1e-10)
+
+    def test_requires_parameter_values(self):
+        with self.assertRaises(ValueError):
+            NumericIterationEvaluator(get_recurrences(), "float64")
+
+    def test_parse_numeric_engine(self):
+        self.assertIsNone(parse_numeric_engine("float64"))
+        self.assertEqual(parse_numeric_engine("mpmath:50"), 50)
+        with self.assertRaises(ValueError):
+            parse_numeric_engine("float32")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from cli import ArgumentParser
+from cli.common import load_normalized_program
+from inputparser import Parser
+from program import (
+    NormalizedProgramCache,
+    PassManager,
+    get_normalization_passes,
+    normalize_program,
+)
+
+walk = """
+x, y = 0, 0
+while true:
+    x = x + 1 {1/2} x - 1
+    y = y + x {1/3} y
+end
+"""
+
+
+class NormalizedProgramCacheTest(unittest.TestCase):
+    def test_cached_program_equals_normalized(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "walk.prob")
+            with open(path, "w") as file:
+                file.write(walk)
+            args = ArgumentParser().get_defaults()
+            args.cache_dir = directory
+            normalized = load_normalized_program(path, args)
+
+            cache = NormalizedProgramCache(
+                os.path.join(directory, "programs"), 1024 * 1024
+            )
+            cached = cache.get(walk)
+            self.assertEqual(str(normalized), str(cached))
+            self.assertEqual(normalized.variables, cached.variables)
+            self.assertEqual(str(load_normalized_program(path, args)), str(cached))
+            self.assertIsNone(cache.get(walk + "\n"))
+
+    def test_unreadable_entries_are_misses(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = NormalizedProgramCache(directory, 1024 * 1024)
+            path = cache._path(cache.source_key(walk))
+            for content in [b"not a pickle", pickle.dumps(("program", 0))]:
+                with open(path, "wb") as file:
+                    file.write(content)
+                self.assertIsNone(cache.get(walk))
+
+    def test_eviction(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = NormalizedProgramCache(directory, 1)
+            cache.put(walk, normalize_program(Parser().parse_string(walk)))
+            self.assertEqual(os.listdir(directory), [])
+
+
+class PassManagerTest(unittest.TestCase):
+    def test_profile_records_every_pass(self):
+        passes = get_normalization_passes()
+        pass_manager = PassManager(passes, profile=True)
+        program = normalize_program(Parser().parse_string(walk), pass_manager)
+        self.assertEqual(
+            [p.name for p in pass_manager.profiles], [name for name, _ in passes]
+        )
+        self.assertTrue(all(p.seconds >= 0 for p in pass_manager.profiles))
+        self.assertEqual(
+            str(program), str(normalize_program(Parser().parse_string(walk)))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import unittest
+from functools import lru_cache
+
+from inputparser import parse_program
+from program import normalize_program
+from program.condition import And
+from recurrences import RecBuilder
+from symengine import sympify
+
+benchmarks = os.path.dirname(__file__) + "/benchmarks/"
+
+
+@lru_cache(maxsize=None)
+def get_gambling():
+    return normalize_program(parse_program(benchmarks + "gambling.prob"))
+
+
+class RecBuilderTest(unittest.TestCase):
+    def test_batch_matches_single_recurrences(self):
+        program = get_gambling()
+        monomials = [sympify(m) for m in ["money**2", "money*bet", "bet**2", "bet"]]
+        batch = RecBuilder(program).get_recurrence_batch(monomials)
+        for monomial in monomials:
+            single = RecBuilder(program).get_recurrence(monomial)
+            self.assertEqual((batch[monomial] - single).expand(), 0)
+
+    def test_unknown_variables_are_rejected(self):
+        rec_builder = RecBuilder(get_gambling())
+        with self.assertRaises(ValueError):
+            rec_builder.get_recurrences(sympify("money*foo"))
+
+    def test_arithmetic_conditions_precomputed(self):
+        program = get_gambling()
+        rec_builder = RecBuilder(program)
+        for assign in program.loop_body:
+            self.assertIs(
+                rec_builder.arithm_conditions[assign],
+                assign.condition.to_arithm(program),
+            )
+
+    def test_arithmetic_condition_reset_by_subs(self):
+        program = get_gambling()
+        condition = next(
+            a.condition for a in program.loop_body if isinstance(a.condition, And)
+        ).copy()
+        arithm = condition.to_arithm(program)
+        self.assertIs(condition.to_arithm(program), arithm)
+        # Replace one variable of the condition by the other one
+        first, second = sorted(condition.get_free_symbols(), key=str)
+        condition.subs({second: first})
+        self.assertNotEqual(condition.to_arithm(program), arithm)
+        self.assertEqual(
+            condition.to_arithm(program), condition.copy().to_arithm(program)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
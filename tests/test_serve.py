@@ -0,0 +1,60 @@
+import io
+import json
+import os
+import unittest
+
+from cli import ArgumentParser
+from cli.actions.serve_action import ServeAction
+
+benchmark = os.path.dirname(__file__) + "/benchmarks/square.prob"
+
+
+class ServeTest(unittest.TestCase):
+    def serve(self, *requests):
+        args = ArgumentParser().get_defaults()
+        args.no_cache = True
+        action = ServeAction(args)
+        responses = io.StringIO()
+        lines = [json.dumps(r) if isinstance(r, dict) else r for r in requests]
+        action.serve_stream(io.StringIO("\n".join(lines)), responses)
+        return [json.loads(r) for r in responses.getvalue().splitlines()], action
+
+    def test_requests_reuse_program(self):
+        request = {"id": 7, "benchmark": benchmark, "goals": ["E(x)"], "at_n": 2}
+        (first, second), action = self.serve(request, request)
+        self.assertEqual(first["id"], 7)
+        result = first["results"][0]
+        self.assertEqual(result["type"], "MOMENT")
+        self.assertTrue(result["is_exact"])
+        self.assertEqual(result["at_n"], "2")
+        self.assertEqual(result["value"], second["results"][0]["value"])
+        self.assertEqual(len(action.benchmarks), 1)
+
+    def test_range_at_n_only(self):
+        request = {"benchmark": benchmark, "goals": ["E(y)"], "at_n": "1:3"}
+        (closed_form,), _ = self.serve(request)
+        request["at_n_only"] = True
+        (evaluated,), _ = self.serve(request)
+        expected = {"1": "2", "2": "6", "3": "12"}
+        self.assertEqual(closed_form["results"][0]["at_n"], expected)
+        self.assertEqual(evaluated["results"][0]["at_n"], expected)
+        self.assertNotIn("value", evaluated["results"][0])
+
+    def test_numeric_engine(self):
+        request = {"benchmark": benchmark, "goals": ["c2(y)"], "at_n": "1:3"}
+        (exact,), _ = self.serve(dict(request, at_n_only=True))
+        (numeric,), _ = self.serve(dict(request, numeric_engine="float64"))
+        result = numeric["results"][0]
+        self.assertFalse(result["is_exact"])
+        for n, value in exact["results"][0]["at_n"].items():
+            difference = abs(float(value) - float(result["at_n"][n]))
+            self.assertLessEqual(difference, float(result["errors"][n]))
+
+    def test_errors_are_reported(self):
+        (response,), _ = self.serve("not json")
+        self.assertIn("error", response)
+        self.assertIsNone(response["id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import unittest
+from functools import lru_cache
+
+import numpy as np
+
+from inputparser import Parser
+from program.distribution import Normal, Categorical, Uniform, Gamma, Beta
+from simulation import Simulator, VectorizedSimulator
+from symengine.lib.symengine_wrapper import sympify
+
+fibonacci = """
+a, b = 0, 1
+while true:
+    a, b = b, a + b
+end
+"""
+
+branches = """
+x, y, i = 0, 0, 0
+while i < 10:
+    i = i + 1
+    if i <= 3:
+        x = x + i
+    elif i == 4:
+        y = y + 1
+    else:
+        x = x - 1
+        y = y + x
+    end
+end
+"""
+
+coin = """
+c, count = 0, 0
+while true:
+    c = Bernoulli(1/4)
+    count = count + c
+end
+"""
+
+
+@lru_cache(maxsize=None)
+def get_coin():
+    return Parser().parse_string(coin)
+
+
+def simulate(simulator, code, goals, samples):
+    program = Parser().parse_string(code)
+    goals = [sympify(g) for g in goals]
+    return simulator.simulate(program, goals, samples)
+
+
+class VectorizedSimulationTest(unittest.TestCase):
+    def test_deterministic_matches_simulator(self):
+        for code, goals in [(fibonacci, ["a", "b"]), (branches, ["x", "y", "i"])]:
+            expected = simulate(Simulator(15), code, goals, 1)
+            result = simulate(VectorizedSimulator(15), code, goals, 3)
+            for n in range(16):
+                self.assertEqual(
+                    expected.get_average_goals(n), result.get_average_goals(n)
+                )
+
+    def test_loop_guard_stops_samples(self):
+        result = simulate(VectorizedSimulator(20), branches, ["i"], 5)
+        self.assertEqual(result.get_average_goals()[sympify("i")], 10)
+
+    def test_probabilistic_mean(self):
+        result = simulate(VectorizedSimulator(100), coin, ["count"], 2000)
+        self.assertAlmostEqual(
+            result.get_average_goals()[sympify("count")], 25, delta=2
+        )
+
+    def test_columnar_result(self):
+        result = simulate(VectorizedSimulator(10), fibonacci, ["a*b", "c"], 4)
+        self.assertEqual(result.shape, (4, 11))
+        data = result.get_prepared_data("a*b")
+        self.assertEqual(data.shape, (11, 4))
+        self.assertEqual(list(data[:5, 0]), [0, 1, 2, 6, 15])
+        self.assertTrue(np.isnan(result.get_average_goals()[sympify("c")]))
+
+    def test_seed_independent_of_workers(self):
+        results = []
+        for workers in [1, 2]:
+            simulator = VectorizedSimulator(30, workers=workers, seed=42)
+            simulator.chunk_size = 100
+            results.append(simulate(simulator, coin, ["count"], 250))
+        for n in range(31):
+            self.assertEqual(
+                results[0].get_average_goals(n), results[1].get_average_goals(n)
+            )
+
+    def test_streaming_matches_columnar(self):
+        simulator = VectorizedSimulator(40, seed=3)
+        simulator.chunk_size = 300
+        result = simulate(simulator, coin, ["count"], 1000)
+        program = get_coin()
+        streaming = simulator.simulate_streaming(program, [sympify("count")], 1000)
+        count = sympify("count")
+        for n in [0, 10, 40]:
+            data = result.get_prepared_data(count)[n]
+            self.assertAlmostEqual(
+                streaming.get_average_goals(n)[count], data.mean(), places=9
+            )
+            self.assertAlmostEqual(
+                streaming.get_variance(count, n), data.var(), places=9
+            )
+            self.assertEqual(streaming.get_quantile(count, 0.5, n), np.median(data))
+
+    def test_streaming_tracked_iterations(self):
+        program = get_coin()
+        count = sympify("count")
+        results = []
+        for workers, tracked in [(1, None), (2, [10, -1])]:
+            simulator = VectorizedSimulator(40, workers=workers, seed=5)
+            simulator.chunk_size = 100
+            results.append(
+                simulator.simulate_streaming(program, [count], 550, 3, tracked)
+            )
+        everything, selected = results
+        self.assertEqual(selected.tracked, [10, 40])
+        for n in [10, 40]:
+            self.assertEqual(
+                everything.get_average_goals(n), selected.get_average_goals(n)
+            )
+            self.assertEqual(
+                everything.get_central_moment(count, 3, n),
+                selected.get_central_moment(count, 3, n),
+            )
+        with self.assertRaises(ValueError):
+            selected.get_average_goals(20)
+
+    def test_streaming_without_samples(self):
+        program = get_coin()
+        result = VectorizedSimulator(10).simulate_streaming(program, ["count"], 0)
+        self.assertTrue(np.isnan(result.get_average_goals()[sympify("count")]))
+        self.assertTrue(np.isnan(result.get_variance("count")))
+
+
+class SampleBatchTest(unittest.TestCase):
+    def test_sample_batch_mean(self):
+        rng = np.random.default_rng(0)
+        for dist in [
+            Normal([1, 2]),
+            Categorical(["1/2", "1/4", "1/4"]),
+            Uniform([-1, 3]),
+            Gamma([2, "1/2"]),
+            Beta([2, 3, 5]),
+        ]:
+            parameters = [float(p) for p in dist.get_parameters()]
+            samples = dist.sample_batch(parameters, 20000, rng)
+            self.assertEqual(samples.shape, (20000,))
+            self.assertAlmostEqual(
+                samples.mean(), float(dist.get_moment(1)), delta=0.05
+            )
+
+    def test_sample_batch_array_parameters(self):
+        rng = np.random.default_rng(0)
+        mu = np.array([0.0, 100.0, -100.0])
+        samples = Normal(["mu", 1]).sample_batch([mu, 1e-6], 3, rng)
+        self.assertTrue(np.allclose(samples, mu, atol=0.01))
+
+
+if __name__ == "__main__":
+    unittest.main()
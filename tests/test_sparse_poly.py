@@ -0,0 +1,31 @@
+import unittest
+
+from symengine import sympify
+from utils import SparsePoly
+
+x, y, p = sympify("x"), sympify("y"), sympify("p")
+
+
+class SparsePolyTest(unittest.TestCase):
+    def test_terms_by_exponents(self):
+        poly = SparsePoly.from_expr(
+            sympify("2*p*x**2*y + 3*x + p*x + p").expand(), [x, y]
+        )
+        self.assertEqual(poly.terms, {(2, 1): 2 * p, (1, 0): p + 3, (0, 0): p})
+        self.assertEqual(poly.get_support(), {x, y})
+        self.assertEqual(set(poly.get_monomials()), {x**2 * y, x})
+        self.assertEqual(poly.as_expr(), sympify("2*p*x**2*y + 3*x + p*x + p"))
+
+    def test_cancelling_terms_are_removed(self):
+        poly = SparsePoly.from_expr(sympify("x*y + x"), [x, y])
+        poly.add_expr(sympify("-x*y"))
+        self.assertEqual(poly.terms, {(1, 0): 1})
+        self.assertEqual(poly.get_support(), {x})
+
+    def test_non_polynomial_raises(self):
+        with self.assertRaises(ValueError):
+            SparsePoly.from_expr(sympify("exp(x)*y"), [x, y])
+
+
+if __name__ == "__main__":
+    unittest.main()
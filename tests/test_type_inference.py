@@ -0,0 +1,45 @@
+import unittest
+
+from inputparser import Parser
+from program import normalize_program
+from program.type import Finite
+
+# The values of x reach z only after several iterations, as z is assigned before y and y before x.
+chain = """
+x = 0
+y = 0
+z = 0
+c = 0
+while true:
+    w = c + z
+    z = y
+    y = x
+    x = 1 - x
+    c = c + 1
+end
+"""
+
+
+def get_types(code):
+    program = normalize_program(Parser().parse_string(code))
+    return {
+        str(v): {str(value) for value in t.values}
+        for v, t in program.typedefs.items()
+        if isinstance(t, Finite)
+    }
+
+
+class TypeInferenceTest(unittest.TestCase):
+    def test_finite_types_propagate(self):
+        types = get_types(chain)
+        for variable in ["x", "y", "z"]:
+            self.assertEqual(types[variable], {"0", "1"})
+
+    def test_unbounded_variables_fail(self):
+        types = get_types(chain)
+        self.assertNotIn("c", types)
+        self.assertNotIn("w", types)
+
+
+if __name__ == "__main__":
+    unittest.main()
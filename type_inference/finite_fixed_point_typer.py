@@ -1,3 +1,4 @@
+import heapq
 from dataclasses import dataclass
 from typing import List, Set, Dict
 from symengine.lib.symengine_wrapper import Expr, Symbol
@@ -33,10 +34,21 @@ class FiniteFixedPointTyper(Typer):
     only take finitely many values throughout the computation.
     The typer requires that the passed program is flattened, meaning it does not contain any if-statements.
     Moreover, every variable is assumed to have only a single assignment.
+
+    Every iteration goes through the loop body in order, but only evaluates the assignments whose inputs changed
+    since their last evaluation. All other assignments could not change the values of their variables anyway.
     """
 
     state: Dict[Symbol, Status]
     program: Program
+    # The support of every assignment in the loop body
+    supports: List[Set]
+    # For every variable the positions of the assignments in the loop body using it
+    dependents: Dict[Symbol, List[int]]
+    # Positions of the assignments to evaluate in the next iteration
+    pending: Set[int]
+    # Variables which changed in the last iteration
+    changed: List[Symbol]
 
     # After this many iterations. Variables which change are considered to have failed.
     iterations: int
@@ -49,6 +61,7 @@ class FiniteFixedPointTyper(Typer):
         self.program = program
         self._check_applicability()
         self._initialize_state()
+        self._initialize_dependencies()
 
         # Evolve the state at most iteration number of times
         for i in range(self.iterations):
@@ -76,14 +89,34 @@ class FiniteFixedPointTyper(Typer):
 
     def _progress(self):
         """
-        Evolves the state for one loop iteration, by computing all possible new values for all variables
+        Evolves the state for one loop iteration, by computing all possible new values for the variables
+        of the pending assignments.
         """
-        for assign in self.program.loop_body:
-            if not self.state[assign.variable].is_locked:
-                new_values = self._get_values_for_assign(assign)
-                self._update_variable_status(assign.variable, new_values)
-            else:
-                self.state[assign.variable].has_changed = False
+        for variable in self.changed:
+            self.state[variable].has_changed = False
+        self.changed = []
+
+        worklist = list(self.pending)
+        heapq.heapify(worklist)
+        scheduled = set(self.pending)
+        self.pending = set()
+        while worklist:
+            position = heapq.heappop(worklist)
+            variable = self.program.loop_body[position].variable
+            if self.state[variable].is_locked:
+                continue
+            new_values = self._get_values_for_support(self.supports[position])
+            self._update_variable_status(variable, new_values)
+            if not self.state[variable].has_changed:
+                continue
+            self.changed.append(variable)
+            # Assignments after the current one see the change within this iteration, the others in the next one
+            for dependent in self.dependents.get(variable, []):
+                if dependent <= position:
+                    self.pending.add(dependent)
+                elif dependent not in scheduled:
+                    scheduled.add(dependent)
+                    heapq.heappush(worklist, dependent)
 
     def _update_variable_status(self, variable, new_values):
         """
@@ -135,10 +168,16 @@ class FiniteFixedPointTyper(Typer):
         # For a variable v with no type definition and no initial assignment, the initial value is given
         # by the symbol v0 or by the empty set if v0 isn't used anyway. That's the case if v isn't used
         # before its assignment in the loop body.
+        # The symbols are only collected when needed, because collecting the symbols of conditions is costly.
         running_symbols = set()
-        for assign in self.program.loop_body:
-            running_symbols |= assign.get_free_symbols(with_default=False)
+        scanned = 0
+        for position, assign in enumerate(self.program.loop_body):
             if assign.variable not in self.state:
+                for scanned_assign in self.program.loop_body[scanned : position + 1]:
+                    running_symbols |= scanned_assign.get_free_symbols(
+                        with_default=False
+                    )
+                scanned = position + 1
                 values = (
                     {Symbol(str(assign.variable) + "0")}
                     if assign.variable in running_symbols
@@ -148,12 +187,39 @@ class FiniteFixedPointTyper(Typer):
                     values, has_changed=True, is_locked=False, has_failed=False
                 )
 
+    def _initialize_dependencies(self):
+        """
+        Collects the supports of the assignments in the loop body and the assignments depending on every variable.
+        In the first iteration all assignments are evaluated.
+        """
+        self.supports = []
+        self.dependents = {}
+        for position, assign in enumerate(self.program.loop_body):
+            support = assign.get_support()
+            self.supports.append(support)
+            variables = set()
+            for expr in support:
+                if type(expr) is not tuple:
+                    variables |= expr.free_symbols.difference(self.program.symbols)
+            for variable in variables:
+                self.dependents.setdefault(variable, []).append(position)
+        self.pending = set(range(len(self.program.loop_body)))
+        self.changed = [
+            assign.variable
+            for assign in self.program.loop_body
+            if self.state[assign.variable].is_locked
+        ]
+
     def _get_values_for_assign(self, assign: Assignment):
         """
         Returns all possible values an assignment can assign with respect to the current state.
         """
-        support = assign.get_support()
+        return self._get_values_for_support(assign.get_support())
 
+    def _get_values_for_support(self, support: Set):
+        """
+        Returns all possible values of the given support with respect to the current state.
+        """
         values = set()
         for expr in support:
             if type(expr) is tuple:
@@ -189,6 +255,8 @@ class FiniteFixedPointTyper(Typer):
         for variable, status in self.state.items():
             if status.has_changed:
                 self._fail_variable(variable)
+                self.changed.append(variable)
+                self.pending.update(self.dependents.get(variable, []))
 
     def _fixedpoint_reached(self):
         return all([not s.has_changed for s in self.state.values()])
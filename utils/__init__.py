@@ -1,4 +1,4 @@
-from .identifiers import get_unique_var
+from .identifiers import get_unique_var, get_unique_var_count, reserve_unique_vars
 from .strings import indent_string
 from .expressions import (
     float_to_rational,
@@ -7,6 +7,7 @@ from .expressions import (
     get_monoms,
     get_all_roots,
     solve_linear,
+    solve_linear_systems,
     without_piecewise,
     eval_re,
     is_solvable,
@@ -17,13 +18,16 @@ from .expressions import (
 )
 from .conditions import get_valid_values, evaluate_cop
 from .finite_power_reduction import get_reduced_powers
-from .matrix import characteristic_poly
+from .matrix import characteristic_poly, charpoly
 from .statistics import raw_moments_to_cumulants, raw_moments_to_centrals, comb
 from .special_polys import ce_bell_poly, prob_hermite_poly
 from .solvers import solve_rec_by_summing
-from .graph import Graph
+from .graph import Graph, strongly_connected_components
 from .algebraic_numbers import (
     faccin_height,
     faccin_bound,
     algebraic_number_equals_const,
 )
+from .compilation import compile_expression, CompiledExpression
+from .files import evict_least_recently_used, get_source_fingerprint
+from .sparse_poly import SparsePoly
@@ -0,0 +1,38 @@
+from functools import lru_cache
+from typing import Dict, List
+from symengine.lib.symengine_wrapper import Expr, Symbol
+from sympy import lambdify, sympify as sympy_sympify
+
+
+class CompiledExpression:
+    """
+    A fast callable for an expression. Instead of substituting a state into the symbolic expression,
+    the expression is turned into generated python code once. The compiled function is called with a state
+    mapping the free symbols of the expression to numbers (or numpy arrays if vectorized).
+    Raises a KeyError if a free symbol of the expression is not set in the state.
+    """
+
+    expr: Expr
+    symbols: List[Symbol]
+    vectorized: bool
+
+    def __init__(self, expr: Expr, vectorized: bool = False):
+        self.expr = expr
+        self.symbols = sorted(expr.free_symbols, key=str)
+        self.vectorized = vectorized
+        module = "numpy" if vectorized else "math"
+        self.function = lambdify(
+            [sympy_sympify(s) for s in self.symbols], sympy_sympify(expr), module
+        )
+
+    def __call__(self, state: Dict[Symbol, float]):
+        return self.function(*[state[s] for s in self.symbols])
+
+
+@lru_cache(maxsize=None)
+def compile_expression(expr: Expr, vectorized: bool = False) -> CompiledExpression:
+    """
+    Returns the compiled version of the given expression. Expressions are immutable, hence the compiled
+    expression is cached and shared among all program elements containing the same expression.
+    """
+    return CompiledExpression(expr, vectorized)
@@ -13,7 +13,11 @@ from sympy import (
     Piecewise,
     LessThan,
     roots,
+    Matrix as SympyMatrix,
 )
+from sympy.polys.constructor import construct_domain
+from sympy.polys.matrices import DomainMatrix
+from sympy.polys.polyerrors import BasePolynomialError
 
 
 def float_to_rational(expr: Expr):
@@ -59,6 +63,27 @@ def solve_linear(equations, unknowns):
     return sol.args[0]
 
 
+def solve_linear_systems(coefficients: SympyMatrix, right_sides: SympyMatrix):
+    """
+    Solves coefficients * X = right_sides for all columns of right_sides at once using a single
+    elimination over the smallest field containing the entries.
+    Returns None if the solution is not unique or no suitable field can be constructed.
+    """
+    augmented = coefficients.row_join(right_sides)
+    try:
+        domain, elements = construct_domain(list(augmented), field=True, extension=True)
+    except BasePolynomialError:
+        return None
+    rows = [
+        elements[i * augmented.cols : (i + 1) * augmented.cols]
+        for i in range(augmented.rows)
+    ]
+    reduced, pivots = DomainMatrix(rows, augmented.shape, domain).rref()
+    if tuple(pivots) != tuple(range(coefficients.cols)):
+        return None
+    return reduced.to_Matrix()[: coefficients.cols, coefficients.cols :]
+
+
 def without_piecewise(expr):
     """
     Removes the Piecewise from an expression by assuming that all restricting assumptions are false.
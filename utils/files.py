@@ -0,0 +1,63 @@
+import hashlib
+import os
+import sys
+from functools import lru_cache
+from typing import List
+
+import symengine
+import sympy
+
+POLAR_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def evict_least_recently_used(directory: str, suffix: str, max_size: int) -> List[str]:
+    """
+    Removes the least recently modified files with the given suffix in the directory until their total size
+    is at most max_size bytes. Returns the paths of the removed files.
+    """
+    files = []
+    for name in os.listdir(directory):
+        if not name.endswith(suffix):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+
+    removed = []
+    total_size = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total_size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total_size -= size
+        removed.append(path)
+    return removed
+
+
+@lru_cache(maxsize=None)
+def get_source_fingerprint(*packages: str, root: str = POLAR_ROOT) -> str:
+    """
+    Returns a hash of the Python sources of the given top-level packages of Polar together with the versions of
+    Python, SymPy and SymEngine. Persistent caches include it in their keys, such that entries computed by
+    different code are never read.
+    """
+    digest = hashlib.sha256()
+    versions = f"{sys.version}\n{sympy.__version__}\n{symengine.__version__}\n"
+    digest.update(versions.encode())
+    for package in packages:
+        for directory, subdirectories, names in os.walk(os.path.join(root, package)):
+            subdirectories.sort()
+            for name in sorted(names):
+                if not name.endswith(".py"):
+                    continue
+                path = os.path.join(directory, name)
+                digest.update(os.path.relpath(path, root).encode())
+                with open(path, "rb") as file:
+                    digest.update(file.read())
+    return digest.hexdigest()
@@ -1,4 +1,4 @@
-from typing import Set, Tuple
+from typing import Callable, Hashable, Iterable, List, Set, Tuple
 from symengine.lib.symengine_wrapper import Symbol as SymengineSymbol
 
 SymbolSet = Set[SymengineSymbol]
@@ -124,3 +124,48 @@ class Graph:
                     if self.nodes[u] == i:
                         result.add(u)
         return result
+
+
+def strongly_connected_components(
+    nodes: Iterable[Hashable], successors: Callable[[Hashable], Iterable[Hashable]]
+) -> List[List[Hashable]]:
+    """
+    Computes the strongly connected components of a directed graph in linear time.
+    Every component is returned after all components reachable from it.
+    """
+    # Iterative version of Tarjan's algorithm, such that large graphs don't exceed the recursion limit
+    index, lowlink, on_stack = {}, {}, set()
+    stack, components = [], []
+    for root in nodes:
+        if root in index:
+            continue
+        work = [(root, iter(successors(root)))]
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            v, children = work[-1]
+            for w in children:
+                if w not in index:
+                    index[w] = lowlink[w] = len(index)
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, iter(successors(w))))
+                    break
+                if w in on_stack:
+                    lowlink[v] = min(lowlink[v], index[w])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[v])
+                if lowlink[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+    return components
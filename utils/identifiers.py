@@ -9,3 +9,19 @@ def get_unique_var(name="u"):
     var = "_" + name + str(_count_unique_var)
     _count_unique_var += 1
     return var
+
+
+def get_unique_var_count() -> int:
+    """
+    Returns the number of unique identifiers handed out so far
+    """
+    return _count_unique_var
+
+
+def reserve_unique_vars(count: int):
+    """
+    Makes sure that identifiers with a number below count are not handed out anymore.
+    This is needed for programs restored from disk which contain previously generated identifiers.
+    """
+    global _count_unique_var
+    _count_unique_var = max(_count_unique_var, count)
@@ -1,6 +1,42 @@
+from sympy import Matrix as SympyMatrix, PurePoly, Symbol as SympySymbol
+from sympy.polys.matrices import DomainMatrix
 from symengine.lib.symengine_wrapper import Matrix, eye, Symbol
+from .graph import strongly_connected_components
 
 
 def characteristic_poly(matrix: Matrix):
     t = Symbol("t")
     return ((eye(matrix.cols) * t) - matrix).det().simplify(), t
+
+
+def charpoly(matrix: SympyMatrix, backend: str = "domain") -> PurePoly:
+    """
+    Computes the characteristic polynomial of a sympy matrix. The "sympy" backend uses Matrix.charpoly.
+    The "domain" backend permutes the matrix into block-triangular form and multiplies the characteristic
+    polynomials of the diagonal blocks, each computed with the division-free Berkowitz algorithm over the
+    smallest polynomial domain containing the entries (e.g. QQ or QQ[p]).
+    """
+    if backend == "sympy":
+        return matrix.charpoly()
+    if backend != "domain":
+        raise ValueError(f"Unknown charpoly backend {backend}")
+
+    x = SympySymbol("lambda")
+    size = matrix.rows
+    successors = [[] for _ in range(size)]
+    for (i, j), entry in matrix.todok().items():
+        if entry != 0:
+            successors[i].append(j)
+    result = PurePoly(1, x)
+    for block in strongly_connected_components(range(size), successors.__getitem__):
+        result *= _block_charpoly(matrix.extract(block, block), x)
+    return result
+
+
+def _block_charpoly(block: SympyMatrix, x: SympySymbol) -> PurePoly:
+    if block.rows == 1:
+        return PurePoly(x - block[0, 0], x)
+    domain_matrix = DomainMatrix.from_Matrix(block)
+    domain = domain_matrix.domain
+    coefficients = [domain.to_sympy(c) for c in domain_matrix.charpoly()]
+    return PurePoly(coefficients, x)
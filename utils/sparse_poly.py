@@ -0,0 +1,141 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from symengine.lib.symengine_wrapper import Expr, Symbol, Add, Mul, One
+
+Exponents = Tuple[int, ...]
+
+
+class SparsePoly:
+    """
+    A sparse multivariate polynomial in a fixed list of variables. Every term is stored as a mapping from its
+    exponent vector (a tuple containing the power of every variable) to its coefficient. Coefficients are
+    expressions which do not contain the variables, for instance expressions over program parameters.
+    Hence, splitting a polynomial by the power of some variable is a lookup in the exponent vectors and
+    does not require traversing expression trees.
+    Coefficients are kept expanded, such that cancelling terms are removed.
+    """
+
+    variables: List[Symbol]
+    var_to_index: Dict[Symbol, int]
+    terms: Dict[Exponents, Expr]
+
+    def __init__(
+        self,
+        variables: List[Symbol],
+        var_to_index: Optional[Dict[Symbol, int]] = None,
+    ):
+        self.variables = variables
+        if var_to_index is None:
+            var_to_index = {v: i for i, v in enumerate(variables)}
+        self.var_to_index = var_to_index
+        self.terms = {}
+        self._support = None
+
+    @classmethod
+    def from_expr(
+        cls,
+        expr: Expr,
+        variables: List[Symbol],
+        var_to_index: Optional[Dict[Symbol, int]] = None,
+        one=One(),
+    ) -> "SparsePoly":
+        """
+        Converts an expanded expression to a polynomial in the given variables.
+        Works for sympy expressions as well, in which case "one" needs to be sympy's one.
+        """
+        poly = cls(variables, var_to_index)
+        poly.add_expr(expr, one)
+        return poly
+
+    def new(self) -> "SparsePoly":
+        """
+        Returns the zero polynomial over the same variables.
+        """
+        return SparsePoly(self.variables, self.var_to_index)
+
+    def add_term(self, exponents: Exponents, coeff: Expr):
+        """
+        Adds coeff times the monomial given by the exponents, where coeff needs to be expanded.
+        """
+        if exponents in self.terms:
+            coeff = self.terms[exponents] + coeff
+            if coeff == 0:
+                del self.terms[exponents]
+                self._support = None
+                return
+        elif coeff == 0:
+            return
+        else:
+            self._support = None
+        self.terms[exponents] = coeff
+
+    def add_expr(self, expr: Expr, one=One()):
+        """
+        Adds an expanded expression to the polynomial.
+        """
+        var_to_index = self.var_to_index
+        size = len(self.variables)
+        for term in expr.args if expr.is_Add else [expr]:
+            exponents = [0] * size
+            coeff = one
+            for factor in term.args if term.is_Mul else [term]:
+                if factor.is_Number:
+                    coeff *= factor
+                    continue
+                if factor.is_Symbol:
+                    index = var_to_index.get(factor)
+                    if index is not None:
+                        exponents[index] += 1
+                        continue
+                elif factor.is_Pow and factor.args[0] in var_to_index:
+                    power = factor.args[1]
+                    if not power.is_Integer or int(power) < 0:
+                        raise ValueError(
+                            f"{expr} is not a polynomial in {factor.args[0]}"
+                        )
+                    exponents[var_to_index[factor.args[0]]] += int(power)
+                    continue
+                elif not var_to_index.keys().isdisjoint(factor.free_symbols):
+                    raise ValueError(f"{expr} is not a polynomial in its variables")
+                coeff *= factor
+            self.add_term(tuple(exponents), coeff)
+
+    def get_support(self) -> Set[Symbol]:
+        """
+        Returns the variables occurring in the polynomial.
+        """
+        if self._support is None:
+            self._support = {
+                self.variables[i]
+                for i, column in enumerate(zip(*self.terms))
+                if any(column)
+            }
+        return self._support
+
+    def get_monomial(self, exponents: Exponents) -> Expr:
+        return Mul(*[v**e for v, e in zip(self.variables, exponents) if e])
+
+    def get_monomials(self) -> List[Expr]:
+        """
+        Returns all non-constant monomials of the polynomial.
+        """
+        return [self.get_monomial(e) for e in self.terms if any(e)]
+
+    def get_expr_terms(self, exponents: Exponents) -> List[Expr]:
+        """
+        Returns the expanded terms of the given monomial together with its coefficient.
+        """
+        coeff = self.terms[exponents]
+        monomial = self.get_monomial(exponents)
+        return [c * monomial for c in (coeff.args if coeff.is_Add else [coeff])]
+
+    def as_expr(self) -> Expr:
+        """
+        Returns the polynomial as an expanded expression.
+        """
+        return Add(*[t for e in self.terms for t in self.get_expr_terms(e)])
+
+    def items(self) -> Iterable[Tuple[Exponents, Expr]]:
+        return self.terms.items()
+
+    def __len__(self):
+        return len(self.terms)